@@ -1,21 +1,176 @@
-from fastapi import APIRouter, Query
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Literal, Optional
 
-from ..audit.audit_logger import read_audit_logs
+from ..audit.audit_logger import get_audit_analytics, query_audit_logs
+from ..audit.audit_sink import audit_sink
 from ..audit.audit_models import AuditLogEntry
+from ..core.analysis_pool import analysis_pool
+from ..core.decision_cache import decision_cache
+from ..core.hot_reload import reload_epoch, reload_watcher
+from ..core.json_codec import ModelJSONResponse
+from ..core.stages import stage_runner
+from ..ml.safety_classifier import safety_classifier
 from ..policy.policy_loader import load_policy_chunks
-from ..models.schemas import PolicyReference
+from ..policy.rag_store import policy_rag_store
+from ..models.schemas import DecisionAction, PolicyReference
 
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 @router.get("/logs", response_model=list[AuditLogEntry])
-def get_logs(limit: int = Query(50, ge=1, le=500)):
+def get_logs(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    user_id: Optional[str] = None,
+    action: Optional[DecisionAction] = None,
+    since: Optional[datetime] = Query(None, description="UTC, inclusive"),
+    until: Optional[datetime] = Query(None, description="UTC, inclusive"),
+):
     """
-    Return the last N audit log entries (newest first).
+    Return the last N audit log entries (newest first), optionally filtered
+    by user, decision action and time window.
+
+    When more entries match, the X-Next-Cursor response header holds the
+    cursor for the next (older) page. The entries were validated when read
+    from the store, so they are encoded as they are (json_codec).
+    """
+    try:
+        page = query_audit_logs(
+            limit=limit,
+            cursor=cursor,
+            user_id=user_id,
+            action=action.value if action else None,
+            since=since,
+            until=until,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+    return ModelJSONResponse(page.entries, headers=headers)
+
+
+@router.get("/audit-sink")
+def get_audit_sink_stats():
+    """
+    Audit writer health: queue depth, written / dropped counts, batch sizes.
+    """
+    return audit_sink.stats()
+
+
+def _analytics():
+    analytics = get_audit_analytics()
+    if analytics is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Audit analytics is disabled (AUDIT_ANALYTICS_ENABLED) or failed to open.",
+        )
+    return analytics
+
+
+_SINCE = Query(None, description="UTC; rounded down to the hour")
+_UNTIL = Query(None, description="UTC; rounded up to the end of its hour")
+
+
+@router.get("/stats")
+def get_stats(
+    since: Optional[datetime] = _SINCE,
+    until: Optional[datetime] = _UNTIL,
+    top: int = Query(10, ge=1, le=100),
+):
+    """
+    Dashboard summary: counts by action + block rate, top detection types
+    and the users with the most violations. Answered from the analytics
+    rollups (hourly; per-user counts are daily), never a scan of the log.
+    """
+    analytics = _analytics()
+    summary = analytics.counts_by_action(since, until)
+    summary["top_detections"] = analytics.counts_by_detection(since, until)[:top]
+    summary["top_users"] = analytics.counts_by_user(since, until, limit=top)
+    return summary
+
+
+@router.get("/stats/actions")
+def get_stats_by_action(since: Optional[datetime] = _SINCE, until: Optional[datetime] = _UNTIL):
+    return _analytics().counts_by_action(since, until)
+
+
+@router.get("/stats/detections")
+def get_stats_by_detection(since: Optional[datetime] = _SINCE, until: Optional[datetime] = _UNTIL):
+    return _analytics().counts_by_detection(since, until)
+
+
+@router.get("/stats/users")
+def get_stats_by_user(
+    since: Optional[datetime] = _SINCE,
+    until: Optional[datetime] = _UNTIL,
+    limit: int = Query(20, ge=1, le=1000),
+):
+    """Users ordered by violations (non-ALLOW decisions); window is rounded to whole days."""
+    return _analytics().counts_by_user(since, until, limit=limit)
+
+
+@router.get("/stats/hourly")
+def get_stats_by_hour(since: Optional[datetime] = _SINCE, until: Optional[datetime] = _UNTIL):
+    return _analytics().counts_by_hour(since, until)
+
+
+@router.get("/decision-cache")
+def get_decision_cache_stats():
+    """
+    Decision cache counters: hits / misses / evictions / expirations,
+    invalidations (policy index or model reloads) and current size.
+    """
+    return decision_cache.stats()
+
+
+@router.get("/analyze-stages")
+def get_analyze_stage_stats():
+    """
+    POST /analyze stage timings: calls, mean / max latency, failures,
+    timeouts and cascade skips / skip rate per stage (classifier, rag,
+    detectors), plus the analysis process pool counters when it is enabled.
+    """
+    stats = stage_runner.stats()
+    stats["process_pool"] = analysis_pool.stats()
+    return stats
+
+
+def _model_status():
+    return {
+        "policy_rag": policy_rag_store.status(),
+        "safety_classifier": safety_classifier.status(),
+        "reload_epoch": reload_epoch(),
+        "watcher_running": reload_watcher.running,
+    }
+
+
+@router.get("/models")
+def get_model_status():
+    """
+    Active policy index / safety model: version, when and how fast it was
+    loaded, load counts and the last reload error.
+    """
+    return _model_status()
+
+
+@router.post("/reload")
+def reload_models(component: Literal["all", "policies", "classifier"] = "all"):
+    """
+    Rebuild the policy index and/or the safety model from disk and swap
+    them in. In-flight requests finish on the old version; the decision
+    cache is cleared. If a new version fails to load, the old one stays
+    active and this returns 500 with the error.
     """
-    return read_audit_logs(limit=limit)
+    handles = {"policies": [policy_rag_store], "classifier": [safety_classifier]}.get(
+        component, [policy_rag_store, safety_classifier]
+    )
+    errors = [status["last_error"] for status in (h.reload() for h in handles) if status["last_error"]]
+    if errors:
+        raise HTTPException(status_code=500, detail=f"Reload failed, previous version kept: {'; '.join(errors)}")
+    return _model_status()
 
 
 @router.get("/policies", response_model=list[PolicyReference])
@@ -1,4 +1,13 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.policy.ingest import (
+    delete_policy_document,
+    ingest_policy_document,
+    policy_ingestor,
+    sync_policy_sources,
+)
 from app.policy.rag_store import policy_rag_store
 
 router = APIRouter(tags=["admin-policies"])
@@ -15,3 +24,73 @@ def search_policies(q: str = Query(..., description="Search phrase")):
         "alignment_score": res["alignment_score"],
         "matches": res["matches"],
     }
+
+
+def _checked(result):
+    # only this call's error: the index status may still carry an older one
+    if result["index_error"]:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Index update failed, previous version kept: {result['index_error']}",
+        )
+    return result
+
+
+@router.get("/admin/policies/documents")
+def list_policy_documents():
+    """
+    Ingested source documents (sha256, size, chunk count) and the state of
+    the live index (tombstoned chunks, chunks appended since the last fit).
+    """
+    return {"documents": policy_ingestor.documents(), "index": policy_rag_store.status()}
+
+
+@router.put("/admin/policies/documents/{name}")
+async def upload_policy_document(name: str, request: Request):
+    """
+    Add or replace one policy document. The request body is the raw .txt
+    or .pdf file, e.g.
+
+        curl -T handbook.pdf http://localhost:8000/api/admin/policies/documents/handbook.pdf
+
+    Only this document is re-chunked (nothing happens if its sha256 is
+    unchanged); its chunks are swapped into the live index without a
+    TF-IDF refit. A dense / hybrid deployment serves sparse TF-IDF from
+    then on until the dense index is rebuilt: index.backend_fallback says
+    so in the response.
+    """
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > settings.POLICY_UPLOAD_MAX_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Document larger than {settings.POLICY_UPLOAD_MAX_BYTES} bytes",
+            )
+    if not body:
+        raise HTTPException(status_code=400, detail="Empty document")
+
+    try:
+        result = await run_in_threadpool(ingest_policy_document, name, bytes(body))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _checked(result)
+
+
+@router.delete("/admin/policies/documents/{name}")
+def remove_policy_document(name: str):
+    """Remove one policy document and tombstone its chunks in the live index."""
+    try:
+        result = delete_policy_document(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown policy document '{name}'")
+    return _checked(result)
+
+
+@router.post("/admin/policies/sync")
+def sync_policy_documents(full: bool = Query(False, description="Re-chunk every document")):
+    """
+    Rescan the policy source directory: re-chunk documents whose content
+    changed and drop the ones that were deleted.
+    """
+    return _checked(sync_policy_sources(full=full))
@@ -1,91 +1,161 @@
 # backend/app/api/analyze.py
 
-from typing import List, Dict
-
-from fastapi import APIRouter
-
+import asyncio
+import codecs
+import time
+from typing import AsyncIterator, List, Dict, Optional, Any
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+from ..core.config import settings
+from ..core.decision_cache import decision_cache
+from ..core.analysis_pool import analysis_pool
+from ..core.hot_reload import reload_epoch
+from ..core.json_codec import dumps
+from ..core.metrics import DECISIONS, DETECTIONS, REQUEST_SECONDS, STAGE_SECONDS
+from ..core.stages import StageFailed, StageResult, stage_runner, stage_spec
 from ..models.schemas import (
     AnalyzeRequest,
     AnalyzeResponse,
-    Detection,
+    AnalyzeBatchRequest,
+    AnalyzeBatchResponse,
     DetectionSummary,
+    DetectionType,
     Decision,
     DecisionAction,
     RiskAssessment,
+    RiskLevel,
     ConfidenceAssessment,
-    TextSpan,
+    ConfidenceFactors,
 )
-from ..detectors.pii_detector import detect_pii
-from ..detectors.secret_detector import detect_secrets
-from ..detectors.financial_detector import detect_financial
+from ..detectors.engine import run_detectors
+from ..detectors.findings import Finding, count_types, to_detection, to_detections
+from ..detectors.stream_scanner import StreamScanner, StreamUpdate
+from ..detectors.intent_detector import detect_harmful_intent
 from ..risk.risk_engine import compute_risk
 from ..risk.confidence_engine import compute_confidence
 from ..policy.rule_engine import evaluate_rules
-from ..policy.rag_store import get_policy_matches
-from ..sanitize.redact import apply_redactions
-from ..audit.audit_logger import write_audit_log
+from ..policy.rag_store import (
+    get_policy_matches,
+    get_policy_matches_batch,
+    init_policy_rag,
+    policy_rag_store,
+)
+from ..sanitize.redact import StreamRedactor, apply_redactions
+from ..audit.audit_logger import write_audit_log, write_audit_logs
 from ..audit.audit_models import build_audit_entry
-from ..ml.safety_classifier import safety_classifier
+from ..ml.safety_classifier import init_safety_classifier, safety_classifier
 
 
 router = APIRouter(prefix="/analyze", tags=["analyze"])
 
+# Independent stages of POST /analyze (see core/stages.py)
+CLASSIFIER_STAGE = stage_spec(
+    "classifier", settings.ANALYZE_CLASSIFIER_TIMEOUT_MS, settings.ANALYZE_CLASSIFIER_ON_FAILURE
+)
+RAG_STAGE = stage_spec("rag", settings.ANALYZE_RAG_TIMEOUT_MS, settings.ANALYZE_RAG_ON_FAILURE)
+DETECTORS_STAGE = stage_spec(
+    "detectors", settings.ANALYZE_DETECTORS_TIMEOUT_MS, settings.ANALYZE_DETECTORS_ON_FAILURE
+)
 
-@router.post("", response_model=AnalyzeResponse)
-def analyze_prompt(payload: AnalyzeRequest) -> AnalyzeResponse:
+# POST /analyze/stream: per-chunk detector work; unscanned text must not
+# reach the client, so this one always fails closed
+STREAM_STAGE = stage_spec("stream", settings.ANALYZE_DETECTORS_TIMEOUT_MS, "closed")
+
+_STAGE_LABELS = {
+    "classifier": "Safety classifier",
+    "rag": "Policy lookup",
+    "detectors": "Sensitive-data detectors",
+    "analysis": "Analysis worker",
+    "stream": "Streaming detectors",
+}
+
+
+# A HARMFUL prediction at least this confident forces BLOCK
+HARMFUL_MODEL_MIN_PROB = 0.7
+
+_SECRET_TYPES = (DetectionType.SECRET_API_KEY, DetectionType.SECRET_GENERIC)
+
+
+def _observe(timings: Dict[str, float], name: str, seconds: float):
+    """Add a step to the request's Server-Timing breakdown and the stage histogram."""
+    timings[name] = timings.get(name, 0.0) + seconds * 1000.0
+    STAGE_SECONDS.observe(seconds, name)
+
+
+async def _timed_call(timings: Dict[str, float], name: str, fn, *args):
+    """stage_runner.call(), timed as step `name`."""
+    t0 = time.perf_counter()
+    try:
+        return await stage_runner.call(fn, *args)
+    finally:
+        _observe(timings, name, time.perf_counter() - t0)
+
+
+def _count_decision(endpoint: str, response: AnalyzeResponse):
+    DECISIONS.inc(endpoint, response.decision.action.value)
+    for dtype, count in response.detection_summary.detection_counts.items():
+        DETECTIONS.inc(getattr(dtype, "value", dtype), amount=count)
+
+
+def _server_timing(timings: Dict[str, float], total_s: float) -> str:
+    parts = [f"{name};dur={ms:.2f}" for name, ms in timings.items()]
+    parts.append(f"total;dur={total_s * 1000.0:.2f}")
+    return ", ".join(parts)
+
+
+def _cache_version():
+    """Cached decisions are only valid for the policy index + model they came from."""
+    return (policy_rag_store.version, safety_classifier.version)
+
+
+def build_analyze_response(
+    payload: AnalyzeRequest,
+    clf_label: Optional[str],
+    clf_prob: float,
+    policy_alignment_score: float,
+    rag_policy_refs: List[Dict[str, Any]],
+    detections: Optional[List[Finding]] = None,
+    harmful_intent_rule: Optional[bool] = None,
+    skipped: Optional[Dict[str, str]] = None,
+) -> AnalyzeResponse:
+    """
+    Everything after the model stages: risk, rules, redaction and
+    explanation. The classifier and RAG results (and optionally the
+    detector results) are passed in so the single and batch endpoints can
+    compute them per item, per batch or concurrently.
+
+    `skipped` maps the stages the cascade did not run to the reason; they
+    are listed in the explanation and the timeline.
+    """
     text = payload.prompt
+    skipped = skipped or {}
 
-    # --- Safety classifier (LogReg + TF-IDF) ---
-    clf_label, clf_prob = safety_classifier.classify(text)
     # clf_label ∈ {SAFE, SENSITIVE, POLICY_RISK, HARMFUL} or None
 
     # --- Simple harmful-intent keyword check (rule-based) ---
-    lower_text = text.lower()
-    harmful_keywords = [
-        # hacking / cybercrime
-        "hack ", " hacking", "hack into", "hack the system", "hack the server",
-        "how to hack", "crack wifi", "crack password", "bruteforce", "brute force",
-        "keylogger", "malware", "ransomware", "rootkit", "backdoor",
-        "sql injection", "xss attack", "csrf attack", "ddos", "dos attack",
-        "bypass login", "bypass authentication", "steal data", "steal credentials",
-        "phishing email", "phishing attack",
-
-        # physical harm / violence
-        "kill someone", "kill him", "kill her", "how to kill",
-        "murder someone", "commit murder", "stab someone",
-        "shoot someone", "school shooting", "mass shooting",
-        "plant a bomb", "make a bomb", "bomb attack",
-        "terrorist attack", "join terrorist", "assassinate",
-        "poison someone", "poison her", "poison him",
-    ]
-    harmful_intent_rule = any(k in lower_text for k in harmful_keywords)
-    harmful_intent_model = clf_label == "HARMFUL" and clf_prob >= 0.7
+    if harmful_intent_rule is None:
+        harmful_intent_rule = bool(detect_harmful_intent(text))
+    harmful_intent_model = clf_label == "HARMFUL" and clf_prob >= HARMFUL_MODEL_MIN_PROB
     harmful_intent = harmful_intent_rule or harmful_intent_model
 
-    # --- 1. Run detectors (PII, secrets, financial, etc.) ---
-    detections: List[Detection] = []
-    detections.extend(detect_pii(text))
-    detections.extend(detect_secrets(text))
-    detections.extend(detect_financial(text))
+    # --- 1. Run detectors (PII, secrets, financial, etc.) in one pass ---
+    if detections is None:
+        detections = run_detectors(text)
     # TODO: add more detectors later (legal, code, etc.)
 
-    # detection counts per type
-    counts: Dict[str, int] = {}
-    for d in detections:
-        counts[d.type] = counts.get(d.type, 0) + 1
-
+    # public Detection models: built once, here; everything below uses the findings
+    public_detections = to_detections(detections, text)
     detection_summary = DetectionSummary(
-        detections=detections,
-        detection_counts=counts,
+        detections=public_detections,
+        detection_counts=count_types(detections),
     )
 
     # collect highlight spans for UI
-    highlight_spans: List[TextSpan] = [
-        d.span for d in detections if d.span is not None
-    ]
+    highlight_spans = [d.span for d in public_detections]
 
-    # --- 2. Policy matches (RAG over handbook) ---
-    policy_alignment_score, rag_policy_refs = get_policy_matches(text)
+    # --- 2. Policy matches (RAG over handbook): passed in ---
 
     # --- 3. Compute base risk from detectors ---
     risk: RiskAssessment = compute_risk(detections)
@@ -178,13 +248,16 @@ def analyze_prompt(payload: AnalyzeRequest) -> AnalyzeResponse:
     risk_level_str = (
         risk.level.value if hasattr(risk.level, "value") else risk.level
     )
+    skipped_note = "".join(
+        f" {_STAGE_LABELS[name]} skipped: {reason}." for name, reason in skipped.items()
+    )
 
     decision_explanation = (
         f"Action: {action.value}. "
         f"Risk {risk.score} ({risk_level_str}). "
         f"Confidence {confidence.score}%. "
         f"Policy alignment {policy_alignment_score:.2f}."
-        f"{harmful_note}{clf_note}"
+        f"{harmful_note}{clf_note}{skipped_note}"
     )
 
     decision = Decision(
@@ -206,6 +279,8 @@ def analyze_prompt(payload: AnalyzeRequest) -> AnalyzeResponse:
         timeline_steps.append(
             f"🤖 Safety classifier prediction: {clf_label} ({clf_prob:.2f})."
         )
+    for name, reason in skipped.items():
+        timeline_steps.append(f"⏭️ {_STAGE_LABELS[name]} skipped: {reason}.")
     if harmful_intent:
         timeline_steps.append(
             "⚠️ Detected harmful or illegal intent (e.g., hacking or physical harm)."
@@ -218,7 +293,7 @@ def analyze_prompt(payload: AnalyzeRequest) -> AnalyzeResponse:
             f"🤖 Decision: {action.value}. Sanitized prompt prepared."
         )
 
-    response = AnalyzeResponse(
+    return AnalyzeResponse(
         sanitized_prompt=sanitized_prompt,
         original_prompt=text,
         decision=decision,
@@ -227,6 +302,44 @@ def analyze_prompt(payload: AnalyzeRequest) -> AnalyzeResponse:
         highlight_spans=highlight_spans,
     )
 
+
+def build_fail_closed_response(payload: AnalyzeRequest, failure: StageFailed) -> AnalyzeResponse:
+    """BLOCK decision for a request whose fail-closed stage timed out or raised."""
+    label = _STAGE_LABELS.get(failure.stage, failure.stage)
+    risk = RiskAssessment(
+        score=100,
+        level=RiskLevel.HIGH,
+        explanation=f"{label} unavailable ({failure.reason}); risk could not be assessed.",
+    )
+    confidence = ConfidenceAssessment(
+        score=0,
+        factors=ConfidenceFactors(model_confidence=0.0, detector_agreement=0.0, policy_alignment=0.0),
+    )
+    decision = Decision(
+        action=DecisionAction.BLOCK,
+        risk=risk,
+        confidence=confidence,
+        policy_refs=[],
+        explanation=(
+            f"Action: BLOCK. {label} unavailable ({failure.reason}); "
+            "blocked because this stage is configured to fail closed."
+        ),
+    )
+    return AnalyzeResponse(
+        sanitized_prompt="",
+        original_prompt=payload.prompt,
+        decision=decision,
+        detection_summary=DetectionSummary(detections=[], detection_counts={}),
+        safety_timeline=[
+            "🔍 Analyzed your request for sensitive info.",
+            f"⚠️ {label} did not complete ({failure.reason}).",
+            "🚫 Blocked the request without sending anything to downstream LLMs.",
+        ],
+        highlight_spans=[],
+    )
+
+
+def _audit(payload: AnalyzeRequest, response: AnalyzeResponse):
     # --- 9. Audit log (non-blocking) ---
     try:
         audit_entry = build_audit_entry(payload, response)
@@ -234,4 +347,531 @@ def analyze_prompt(payload: AnalyzeRequest) -> AnalyzeResponse:
     except Exception as e:
         print(f"[AUDIT] Failed to write log: {e}")
 
-    return response
+
+def _stages():
+    """
+    (spec, function, fail-open fallback) for each stage. The cascade runs
+    the detectors and classifier first (concurrently in-process, back to
+    back in a pool worker) and the policy lookup last.
+    """
+    return (
+        # --- Detectors (PII, secrets, financial, etc.) ---
+        (DETECTORS_STAGE, run_detectors, []),
+        # --- Safety classifier (LogReg + TF-IDF) ---
+        (CLASSIFIER_STAGE, safety_classifier.classify, (None, 0.0)),
+        # --- Policy matches (RAG over handbook) ---
+        (RAG_STAGE, get_policy_matches, (0.0, [])),
+    )
+
+
+def _cascade_enabled() -> bool:
+    return settings.ANALYZE_CASCADE_MODE != "full"
+
+
+def _rag_skip_reason(detections: List[Finding], clf_label: Optional[str], clf_prob: float) -> Optional[str]:
+    """
+    Why the policy lookup can be skipped once the detectors and classifier
+    have run, or None. RAG never changes the action (it only adds risk
+    score and policy refs), so it is kept where its refs explain a REDACT
+    or a risky ALLOW.
+    """
+    if any(d.type in _SECRET_TYPES for d in detections):
+        return "secret detected, decision is already BLOCK"
+    if clf_label == "HARMFUL" and clf_prob >= HARMFUL_MODEL_MIN_PROB:
+        return "classifier flagged harmful intent, decision is already BLOCK"
+    if not detections and clf_label == "SAFE" and clf_prob >= settings.ANALYZE_CASCADE_SAFE_PROB:
+        return f"SAFE ({clf_prob:.2f}) with no detections, decision is already ALLOW"
+    return None
+
+
+def _skip_reason(
+    name: str, results: Dict[str, StageResult], harmful_intent_rule: Optional[bool]
+) -> Optional[str]:
+    """
+    Cascade: why stage `name` need not run given the earlier results, or
+    None. The detectors always run (their spans are redacted). A matched
+    harmful-intent phrase settles BLOCK and the harmful-intent handling
+    whatever the classifier says; anything else that settles the action
+    only skips the policy lookup, so the classifier's harmful-intent
+    verdict always reaches the response. Nothing is skipped on top of a
+    stage that failed open.
+    """
+    if harmful_intent_rule is None or name == "detectors":
+        return None
+    if harmful_intent_rule:
+        return "harmful-intent phrase matched, decision is already BLOCK"
+    if name != "rag":
+        return None
+    det, clf = results.get("detectors"), results.get("classifier")
+    if det is None or det.error or clf is None or clf.error:
+        return None
+    return _rag_skip_reason(det.value, *clf.value)
+
+
+def _decide(
+    payload: AnalyzeRequest,
+    results: Dict[str, StageResult],
+    harmful_intent_rule: Optional[bool] = None,
+    skipped: Optional[Dict[str, str]] = None,
+) -> tuple[AnalyzeResponse, bool]:
+    """Decision logic over the stage results (by stage name); returns (response, degraded)."""
+    clf_label, clf_prob = results["classifier"].value
+    policy_alignment_score, rag_policy_refs = results["rag"].value
+    response = build_analyze_response(
+        payload, clf_label, clf_prob, policy_alignment_score, rag_policy_refs,
+        results["detectors"].value, harmful_intent_rule, skipped,
+    )
+
+    degraded = False
+    for spec, _, _ in _stages():
+        result = results[spec.name]
+        if result.error:
+            degraded = True
+            response.safety_timeline.append(
+                f"⚠️ {_STAGE_LABELS[spec.name]} did not complete ({result.error}); continued without it."
+            )
+    return response, degraded
+
+
+async def _run_pipeline(payload: AnalyzeRequest) -> tuple[AnalyzeResponse, bool, Dict[str, float]]:
+    """
+    Full mode: classifier, RAG and detectors run concurrently on the stage
+    pool. Cascade mode: after the harmful-intent phrase check, detectors
+    and classifier run concurrently, then RAG unless their results settle
+    the action (see _skip_reason); a latency of max(detectors, classifier)
+    + RAG at worst. The decision logic then runs on the pool as well, so
+    nothing CPU-bound touches the event loop. Returns (response, degraded,
+    timings in ms per step).
+    """
+    text = payload.prompt
+    stages = _stages()
+    results: Dict[str, StageResult] = {}
+    skipped: Dict[str, str] = {}
+    timings: Dict[str, float] = {}
+    harmful_intent_rule = None
+    try:
+        if not _cascade_enabled():
+            values = await asyncio.gather(
+                *(stage_runner.run(spec, fn, text, fallback=fallback) for spec, fn, fallback in stages)
+            )
+            results = {spec.name: value for (spec, _, _), value in zip(stages, values)}
+        else:
+            harmful_intent_rule = bool(await _timed_call(timings, "intent", detect_harmful_intent, text))
+            # detectors + classifier together, then RAG (which needs both)
+            for batch in (stages[:2], stages[2:]):
+                runs = []
+                for spec, fn, fallback in batch:
+                    reason = _skip_reason(spec.name, results, harmful_intent_rule)
+                    if reason:
+                        results[spec.name], skipped[spec.name] = StageResult(fallback), reason
+                        stage_runner.skip(spec.name)
+                    else:
+                        runs.append((spec, fn, fallback))
+                values = await asyncio.gather(
+                    *(stage_runner.run(spec, fn, text, fallback=fallback) for spec, fn, fallback in runs)
+                )
+                results.update((spec.name, value) for (spec, _, _), value in zip(runs, values))
+    except StageFailed as failure:
+        return build_fail_closed_response(payload, failure), True, timings
+    # stage histograms are observed by the runner itself
+    timings.update((name, result.elapsed_ms) for name, result in results.items() if name not in skipped)
+    response, degraded = await _timed_call(
+        timings, "decision", _decide, payload, results, harmful_intent_rule, skipped
+    )
+    return response, degraded, timings
+
+
+# Reloaded models reach cached decisions through _cache_version(); clearing
+# right away frees the stale entries
+policy_rag_store.add_swap_listener(decision_cache.clear)
+safety_classifier.add_swap_listener(decision_cache.clear)
+
+# In a pool worker: the parent's reload_epoch() its models match. Set in the
+# parent just before forking; None in spawned workers until the first call.
+_worker_epoch: Optional[int] = None
+
+
+def _init_analysis_worker():
+    """Analysis pool initializer: load models unless the worker inherited them via fork."""
+    if not safety_classifier.is_ready:
+        init_safety_classifier()
+    if not policy_rag_store.is_ready:
+        init_policy_rag()
+
+
+def _sync_worker_models(epoch: int):
+    """Reload this worker's models after the parent hot-reloaded its own."""
+    global _worker_epoch
+    if _worker_epoch is not None and _worker_epoch != epoch:
+        policy_rag_store.reload()
+        safety_classifier.reload()
+    # a spawned worker loaded the current files in _init_analysis_worker
+    _worker_epoch = epoch
+
+
+def analyze_in_worker(
+    prompt: str, role: Optional[str], epoch: int = 0
+) -> tuple[str, bool, List[str], Dict[str, float]]:
+    """
+    Runs inside an analysis pool process: the same stages, back to back
+    (the process is the unit of parallelism), with the same cascade
+    skips. Exceptions follow each stage's failure policy; the pool call as
+    a whole carries the timeout. Returns (AnalyzeResponse JSON, degraded,
+    skipped stage names, timings in ms per step); metrics live in the
+    parent process, which records the skips and timings. `epoch` is the
+    parent's reload_epoch(); models are reloaded first when it moved.
+    """
+    _sync_worker_models(epoch)
+    payload = AnalyzeRequest(user_id="", role=role, prompt=prompt)
+    timings: Dict[str, float] = {}
+    harmful_intent_rule = None
+    if _cascade_enabled():
+        t0 = time.perf_counter()
+        harmful_intent_rule = bool(detect_harmful_intent(prompt))
+        timings["intent"] = (time.perf_counter() - t0) * 1000.0
+    results: Dict[str, StageResult] = {}
+    skipped: Dict[str, str] = {}
+    for spec, fn, fallback in _stages():
+        reason = _skip_reason(spec.name, results, harmful_intent_rule)
+        if reason:
+            results[spec.name], skipped[spec.name] = StageResult(fallback), reason
+            continue
+        t0 = time.perf_counter()
+        try:
+            results[spec.name] = StageResult(fn(prompt))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if spec.on_failure == "closed":
+                failure = StageFailed(spec.name, error)
+                return build_fail_closed_response(payload, failure).model_dump_json(), True, [], timings
+            results[spec.name] = StageResult(fallback, error)
+        timings[spec.name] = (time.perf_counter() - t0) * 1000.0
+    t0 = time.perf_counter()
+    response, degraded = _decide(payload, results, harmful_intent_rule, skipped)
+    data = response.model_dump_json()
+    timings["decision"] = (time.perf_counter() - t0) * 1000.0
+    return data, degraded, list(skipped), timings
+
+
+async def _run_in_pool(payload: AnalyzeRequest) -> tuple[AnalyzeResponse, bool, Dict[str, float]]:
+    """
+    Dispatch the whole pipeline to a worker process: one round trip per
+    request. "analysis" in the timings is the whole round trip, the other
+    steps were measured in the worker.
+    """
+    stages = _stages()
+    timeout_ms = sum(spec.timeout_ms for spec, _, _ in stages)
+    timings: Dict[str, float] = {}
+    t0 = time.perf_counter()
+    try:
+        data, degraded, skipped, worker_timings = await analysis_pool.run(
+            analyze_in_worker, payload.prompt, payload.role, reload_epoch(), timeout_s=timeout_ms / 1000.0
+        )
+    except Exception as e:
+        reason = (
+            f"timed out after {timeout_ms} ms"
+            if isinstance(e, asyncio.TimeoutError)
+            else f"{type(e).__name__}: {e}"
+        )
+        print(f"[ANALYZE] analysis pool {reason}")
+        _observe(timings, "analysis", time.perf_counter() - t0)
+        if any(spec.on_failure == "closed" for spec, _, _ in stages):
+            return build_fail_closed_response(payload, StageFailed("analysis", reason)), True, timings
+        fallbacks = {spec.name: StageResult(fallback, reason) for spec, _, fallback in stages}
+        response, degraded = await _timed_call(timings, "decision", _decide, payload, fallbacks)
+        return response, degraded, timings
+    _observe(timings, "analysis", time.perf_counter() - t0)
+    for name in skipped:
+        stage_runner.skip(name)
+    for name, ms in worker_timings.items():
+        _observe(timings, name, ms / 1000.0)
+    return AnalyzeResponse.model_validate_json(data), degraded, timings
+
+
+# Detections kept per type for the final decision of a stream. compute_risk
+# saturates at 20 detections and the rules only look at types, so the
+# decision is the same as with every detection kept.
+_STREAM_SAMPLE_PER_TYPE = 32
+
+
+class _StreamAnalysis:
+    """State of one POST /analyze/stream request: scanner, redactor and totals."""
+
+    def __init__(self, payload: AnalyzeRequest):
+        self.payload = payload  # prompt: head of the stream, for the audit entry
+        self.scanner = StreamScanner()
+        self.redactor = StreamRedactor()
+        self.counts: Dict[DetectionType, int] = {}
+        self.sample: List[Finding] = []
+        self.redacted_head = ""
+
+    def feed(self, text: str) -> str:
+        return self._events(self.scanner.feed(text))
+
+    def finish(self, tail: str = "") -> str:
+        return self.feed(tail) + self._events(self.scanner.finish())
+
+    def _events(self, update: StreamUpdate) -> str:
+        """NDJSON lines for one scanner update: findings, then the redacted text."""
+        lines: List[str] = []
+        for d in update.detections:
+            n = self.counts.get(d.type, 0)
+            self.counts[d.type] = n + 1
+            if n < _STREAM_SAMPLE_PER_TYPE:
+                self.sample.append(d)
+            lines.append(f'{{"event":"detection","detection":{to_detection(d).model_dump_json()}}}\n')
+        self.redactor.add(update.detections)
+
+        head_room = settings.STREAM_AUDIT_PROMPT_CHARS - len(self.payload.prompt)
+        if head_room > 0:
+            self.payload.prompt += update.text[:head_room]
+        if update.text:
+            redacted = self.redactor.push(update.offset, update.text)
+            head_room = settings.STREAM_AUDIT_PROMPT_CHARS - len(self.redacted_head)
+            if head_room > 0:
+                self.redacted_head += redacted[:head_room]
+            lines.append(
+                dumps({"event": "redacted", "offset": update.offset, "text": redacted}).decode("utf-8") + "\n"
+            )
+        return "".join(lines)
+
+    def response(self) -> AnalyzeResponse:
+        """
+        Decision over the whole stream: detectors, harmful-intent phrases and
+        rules. The classifier and policy RAG need the whole prompt in
+        memory, so streaming mode does without them.
+        """
+        total = sum(self.counts.values())
+        harmful_groups = self.scanner.harmful_groups
+        risk = compute_risk(self.sample)
+        risk.explanation = f"Computed risk score {risk.score} based on {total} detections."
+        action, policy_refs = evaluate_rules(self.sample, risk)
+        if harmful_groups:
+            risk.score = 100
+            risk.level = RiskLevel.HIGH
+            action = DecisionAction.BLOCK
+        confidence = compute_confidence(self.sample, policy_match_strength=0.0, model_confidence_raw=0.85)
+
+        harmful_note = " Harmful or illegal intent detected and blocked." if harmful_groups else ""
+        decision = Decision(
+            action=action,
+            risk=risk,
+            confidence=confidence,
+            policy_refs=policy_refs,
+            explanation=(
+                f"Action: {action.value}. Risk {risk.score} ({risk.level.value}). "
+                f"Confidence {confidence.score}%. Streaming mode: detectors and rules only."
+                f"{harmful_note}"
+            ),
+        )
+        timeline = [
+            f"🔍 Scanned {self.scanner.chars} characters as a stream.",
+            f"✂️ Detected {total} potential sensitive items; all were redacted in the streamed text.",
+            f"⚖️ Risk score: {risk.score} ({risk.level.value}).",
+        ]
+        if harmful_groups:
+            timeline.append("⚠️ Detected harmful or illegal intent (e.g., hacking or physical harm).")
+        timeline.append(f"🤖 Decision: {action.value}.")
+
+        sample = to_detections(self.sample)
+        return AnalyzeResponse(
+            sanitized_prompt="" if harmful_groups else self.redacted_head,
+            original_prompt=self.payload.prompt,
+            decision=decision,
+            detection_summary=DetectionSummary(detections=sample, detection_counts=self.counts),
+            safety_timeline=timeline,
+            highlight_spans=[d.span for d in sample],
+        )
+
+
+class _UploadStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body generator reads the request body itself.
+    The stock one listens for http.disconnect on receive() while streaming
+    (ASGI spec < 2.4, e.g. uvicorn), which would swallow upload chunks; here
+    a client that goes away shows up as ClientDisconnect in request.stream().
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _decision_event(analysis: _StreamAnalysis, response: AnalyzeResponse) -> str:
+    return dumps({
+        "event": "decision",
+        "chars": analysis.scanner.chars,
+        "decision": response.decision.model_dump(mode="json"),
+        "detection_counts": {t.value: n for t, n in analysis.counts.items()},
+        "safety_timeline": response.safety_timeline,
+    }).decode("utf-8") + "\n"
+
+
+def init_analysis_pool():
+    """Called from app.main startup, after the models are loaded (workers fork with them)."""
+    global _worker_epoch
+    _worker_epoch = reload_epoch()  # inherited by forked workers
+    analysis_pool.start(_init_analysis_worker)
+
+
+@router.post("", response_model=AnalyzeResponse)
+async def analyze_prompt(payload: AnalyzeRequest, response: Response) -> AnalyzeResponse:
+    """
+    The Server-Timing response header carries this request's breakdown in
+    ms (cache, intent, detectors, classifier, rag, decision, audit, ...);
+    the same steps feed the stage histograms at /api/metrics.
+    """
+    started = time.perf_counter()
+    text = payload.prompt
+    timings: Dict[str, float] = {}
+
+    # --- Repeated prompt: reuse the decision (still audited below) ---
+    cache_key = decision_cache.key(text, payload.role)
+    version = _cache_version()
+    result = decision_cache.get(cache_key, version)
+    _observe(timings, "cache", time.perf_counter() - started)
+
+    if result is None:
+        if analysis_pool.running:
+            result, degraded, stage_timings = await _run_in_pool(payload)
+        else:
+            result, degraded, stage_timings = await _run_pipeline(payload)
+        timings.update(stage_timings)
+        if not degraded:  # never cache a fallback / fail-closed result
+            decision_cache.put(cache_key, version, result)
+
+    # building the entry dumps the whole response; keep it off the event loop
+    await _timed_call(timings, "audit", _audit, payload, result)
+
+    elapsed = time.perf_counter() - started
+    REQUEST_SECONDS.observe(elapsed, "analyze")
+    _count_decision("analyze", result)
+    if settings.ANALYZE_SERVER_TIMING:
+        response.headers["Server-Timing"] = _server_timing(timings, elapsed)
+    return result
+
+
+@router.post("/stream")
+async def analyze_stream(request: Request, user_id: str, role: Optional[str] = None) -> StreamingResponse:
+    """
+    Analyze a very large prompt or file upload as it arrives.
+
+    The request body is the raw UTF-8 text (chunked transfer encoding is
+    fine); user_id / role are query parameters. The response is NDJSON,
+    written while the upload is still being read:
+
+      {"event": "detection", "detection": {...}}       absolute span offsets
+      {"event": "redacted", "offset": n, "text": "..."} next piece of the
+                                                        redacted text
+      {"event": "decision", ...}                         last line
+
+    Every finding is redacted in the streamed text, since the action is only
+    known at the end; a BLOCK decision means the caller must discard what
+    it received. Memory per request stays around a few scan windows
+    whatever the upload size.
+    """
+    payload = AnalyzeRequest(user_id=user_id, role=role, prompt="")
+    started = time.perf_counter()
+
+    async def events() -> AsyncIterator[str]:
+        analysis = _StreamAnalysis(payload)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        try:
+            async for chunk in request.stream():
+                text = decoder.decode(chunk)
+                if text:
+                    lines = (await stage_runner.run(STREAM_STAGE, analysis.feed, text)).value
+                    if lines:
+                        yield lines
+            tail = decoder.decode(b"", final=True)
+            yield (await stage_runner.run(STREAM_STAGE, analysis.finish, tail)).value
+        except StageFailed as failure:
+            response = build_fail_closed_response(payload, failure)
+        else:
+            response = await stage_runner.call(analysis.response)
+        yield _decision_event(analysis, response)
+        await _timed_call({}, "audit", _audit, payload, response)
+        REQUEST_SECONDS.observe(time.perf_counter() - started, "stream")
+        _count_decision("stream", response)
+
+    return _UploadStreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.post("/batch", response_model=AnalyzeBatchResponse)
+def analyze_batch(payload: AnalyzeBatchRequest) -> AnalyzeBatchResponse:
+    """
+    Analyze N prompts in one call (offline pre-screening pipelines).
+
+    The classifier runs one predict_proba over the whole batch and RAG
+    scores all prompts with one sparse matrix product; the per-prompt
+    decision logic and cascade skips are the same as POST /analyze (only
+    the prompts still undecided go into each batch call). Prompts found in
+    the decision cache skip all of that. Audit entries are written in one go.
+    """
+    started = time.perf_counter()
+    items = payload.requests
+    if len(items) > settings.ANALYZE_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(items)} > {settings.ANALYZE_BATCH_MAX_ITEMS} items.",
+        )
+
+    version = _cache_version()
+    keys = [decision_cache.key(item.prompt, item.role) for item in items]
+    results: List[Optional[AnalyzeResponse]] = [decision_cache.get(k, version) for k in keys]
+
+    # first item per uncached key: duplicates inside the batch are computed once
+    pending: Dict[bytes, int] = {}
+    for i, res in enumerate(results):
+        if res is None:
+            pending.setdefault(keys[i], i)
+
+    if pending:
+        firsts = list(pending.values())
+        cascade = _cascade_enabled()
+        detections = {i: run_detectors(items[i].prompt) for i in firsts}
+        harmful = {i: bool(detect_harmful_intent(items[i].prompt)) if cascade else None for i in firsts}
+        skipped: Dict[int, Dict[str, str]] = {i: {} for i in firsts}
+        clf_results: Dict[int, tuple] = {}
+        policy_results: Dict[int, tuple] = {}
+
+        if cascade:
+            for i in firsts:
+                reason = _skip_reason("classifier", {}, harmful[i])
+                if reason:
+                    skipped[i] = {"classifier": reason, "rag": reason}
+        todo = [i for i in firsts if "classifier" not in skipped[i]]
+        clf_results.update(zip(todo, safety_classifier.classify_batch([items[i].prompt for i in todo])))
+
+        if cascade:
+            for i in todo:
+                reason = _rag_skip_reason(detections[i], *clf_results[i])
+                if reason:
+                    skipped[i]["rag"] = reason
+        todo = [i for i in firsts if "rag" not in skipped[i]]
+        policy_results.update(zip(todo, get_policy_matches_batch([items[i].prompt for i in todo])))
+
+        computed: Dict[bytes, AnalyzeResponse] = {}
+        for i in firsts:
+            clf_label, clf_prob = clf_results.get(i, (None, 0.0))
+            alignment, refs = policy_results.get(i, (0.0, []))
+            computed[keys[i]] = build_analyze_response(
+                items[i], clf_label, clf_prob, alignment, refs, detections[i], harmful[i], skipped[i]
+            )
+            decision_cache.put(keys[i], version, computed[keys[i]])
+            for name in skipped[i]:
+                stage_runner.skip(name)
+        results = [res if res is not None else computed[key] for res, key in zip(results, keys)]
+
+    try:
+        write_audit_logs(
+            [build_audit_entry(item, res) for item, res in zip(items, results)]
+        )
+    except Exception as e:
+        print(f"[AUDIT] Failed to write batch logs: {e}")
+
+    REQUEST_SECONDS.observe(time.perf_counter() - started, "batch")
+    for res in results:
+        _count_decision("batch", res)
+    return AnalyzeBatchResponse(results=results)
@@ -1,17 +1,137 @@
-from fastapi import APIRouter
-from ..models.schemas import CompleteRequest, CompleteResponse, Decision
-from ..llm.local_llm import generate_response
+import asyncio
+import time
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from ..core.json_codec import dumps
+from ..core.metrics import DECISIONS, REQUEST_SECONDS
+from ..models.schemas import CompleteRequest, CompleteResponse
+from ..llm.backend_client import LLMBackendBusy, LLMBackendError, llm_client
+from ..llm.local_llm import stream_response
+from ..llm.outbound import OutboundScan
 
 router = APIRouter(prefix="/complete", tags=["complete"])
 
 
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    return b"event: " + event.encode("ascii") + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def _backend_error(e: LLMBackendError) -> HTTPException:
+    return HTTPException(status_code=503 if isinstance(e, LLMBackendBusy) else 502, detail=str(e))
+
+
+async def _disconnected(request: Request):
+    # the body is read already: the next message is http.disconnect, once
+    # the client goes away (or the response is sent)
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _answer(prompt: str, scan: OutboundScan) -> str:
+    parts = []
+    async with aclosing(stream_response(prompt)) as tokens:
+        async for token in tokens:
+            parts.append(scan.feed(token))
+            if scan.cut:
+                break
+    parts.append(scan.finish())
+    return "".join(parts)
+
+
 @router.post("", response_model=CompleteResponse)
-def complete_chat(payload: CompleteRequest) -> CompleteResponse:
+async def complete_chat(payload: CompleteRequest, request: Request) -> CompleteResponse:
     """
     Phase 1:
     - Assume inbound prompt is already sanitized.
-    - Call local LLM stub.
-    - For now, we skip outbound scanning (can add later).
+    - Call the local LLM (or its stub).
+    - Outbound scanning: the answer is redacted (cut at a secret) the same
+      way as in POST /complete/stream, and outbound_decision says why.
+
+    503 when the model backend is busy (see llm/backend_client.py). A
+    client that disconnects cancels the backend request.
     """
-    answer = generate_response(payload.sanitized_prompt)
-    return CompleteResponse(answer=answer, outbound_decision=None)
+    started = time.perf_counter()
+    scan = OutboundScan()
+    work = asyncio.ensure_future(_answer(payload.sanitized_prompt, scan))
+    watcher = asyncio.ensure_future(_disconnected(request))
+    try:
+        await asyncio.wait((work, watcher), return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        work.cancel()
+        raise
+    finally:
+        watcher.cancel()
+    if not work.done():
+        # the client went away first: stop the backend request, nobody is listening
+        work.cancel()
+        await asyncio.gather(work, return_exceptions=True)
+        return Response(status_code=499)
+    try:
+        answer = work.result()
+    except LLMBackendError as e:
+        raise _backend_error(e)
+    decision = scan.decision()
+    REQUEST_SECONDS.observe(time.perf_counter() - started, "complete")
+    DECISIONS.inc("complete", decision.action.value)
+    return CompleteResponse(answer=answer, outbound_decision=decision)
+
+
+@router.post("/stream")
+async def complete_stream(payload: CompleteRequest) -> StreamingResponse:
+    """
+    Stream the answer as server-sent events while the model generates it.
+
+      event: token     data: {"text": "..."}   next piece of the redacted answer
+      event: cut       data: {"offset": n}     a secret starts at offset n of the
+                                               answer; nothing more is sent
+      event: error     data: {"detail": "..."} the model backend failed
+      event: done      data: {"outbound_decision": {...}, "detection_counts":
+                              {...}, "chars": n}   last event
+
+    Tokens are scanned as they arrive (a few words per scan, on the event
+    loop: a thread hop per token would cost more) and held back only
+    while a match could still start in them, about one word. A client
+    that disconnects cancels the backend request.
+
+    503 when the backend queue is full; a request that then waits too
+    long for a backend slot gets an error event.
+    """
+    started = time.perf_counter()
+    if llm_client.saturated:
+        raise _backend_error(LLMBackendBusy("LLM backend busy: queue full"))
+
+    async def events() -> AsyncIterator[bytes]:
+        scan = OutboundScan()
+        try:
+            async with aclosing(stream_response(payload.sanitized_prompt)) as tokens:
+                async for token in tokens:
+                    text = scan.feed(token)
+                    if text:
+                        yield _sse("token", {"text": text})
+                    if scan.cut:
+                        break
+        except LLMBackendError as e:
+            yield _sse("error", {"detail": str(e)})
+        text = scan.finish()
+        if text:
+            yield _sse("token", {"text": text})
+        if scan.cut:
+            yield _sse("cut", {"offset": scan.cut_at})
+
+        decision = scan.decision()
+        yield _sse("done", {
+            "outbound_decision": decision.model_dump(mode="json"),
+            "detection_counts": {t.value: n for t, n in scan.counts.items()},
+            "chars": scan.scanner.chars,
+        })
+        REQUEST_SECONDS.observe(time.perf_counter() - started, "complete_stream")
+        DECISIONS.inc("complete_stream", decision.action.value)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,111 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..audit.audit_sink import audit_sink
+from ..core.analysis_pool import analysis_pool
+from ..core.decision_cache import decision_cache
+from ..core.metrics import format_family, metrics
+from ..core.stages import stage_runner
+from ..llm.backend_client import llm_client
+
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _from_stats(prefix: str, stats: Dict[str, Any], counters: Dict[str, str], gauges: Dict[str, str]) -> List[str]:
+    """Families for the numeric fields of a component's stats() dict."""
+    families = [
+        format_family(f"{prefix}_{key}_total", "counter", help_text, [(f"{prefix}_{key}_total", {}, stats[key])])
+        for key, help_text in counters.items()
+        if key in stats
+    ]
+    families += [
+        format_family(f"{prefix}_{key}", "gauge", help_text, [(f"{prefix}_{key}", {}, float(stats[key]))])
+        for key, help_text in gauges.items()
+        if key in stats
+    ]
+    return families
+
+
+def _stage_families() -> List[str]:
+    stages = stage_runner.stats()["stages"]
+    families = []
+    for key, help_text in (
+        ("skipped", "Stages skipped by the analyze cascade."),
+        ("failures", "Stage calls that raised."),
+        ("timeouts", "Stage calls that timed out."),
+    ):
+        name = f"sentinelguard_analyze_stage_{key}_total"
+        families.append(
+            format_family(name, "counter", help_text, [(name, {"stage": stage}, s[key]) for stage, s in sorted(stages.items())])
+        )
+    return families
+
+
+def render_metrics() -> str:
+    families = [metrics.render()]
+    families += _stage_families()
+    families += _from_stats(
+        "sentinelguard_decision_cache",
+        decision_cache.stats(),
+        counters={
+            "hits": "Decision cache hits.",
+            "misses": "Decision cache misses (including expired entries).",
+            "evictions": "Entries evicted to stay within capacity.",
+            "expirations": "Entries dropped because their TTL passed.",
+            "invalidations": "Cache flushes after a policy index or model reload.",
+        },
+        gauges={"size": "Cached decisions.", "capacity": "Maximum cached decisions."},
+    )
+    families += _from_stats(
+        "sentinelguard_audit",
+        audit_sink.stats(),
+        counters={
+            "enqueued": "Audit entries queued for the writer.",
+            "written": "Audit entries written to the store.",
+            "dropped": "Audit entries dropped because the queue was full.",
+            "write_errors": "Failed audit batch writes.",
+            "batches": "Audit batches written.",
+        },
+        gauges={"queue_depth": "Audit entries waiting in the queue.", "queue_capacity": "Audit queue size limit."},
+    )
+    families += _from_stats(
+        "sentinelguard_analysis_pool",
+        analysis_pool.stats(),
+        counters={
+            "dispatched": "Requests sent to the analysis process pool.",
+            "completed": "Requests the analysis pool finished.",
+            "timeouts": "Analysis pool requests that timed out.",
+            "errors": "Analysis pool requests that raised.",
+            "restarts": "Analysis pool restarts after a broken worker.",
+        },
+        gauges={"workers": "Analysis pool worker processes (0 when disabled)."},
+    )
+    families += _from_stats(
+        "sentinelguard_llm",
+        llm_client.stats(),
+        counters={
+            "requests": "Completions sent to the model backend client.",
+            "completed": "Completions the model backend finished.",
+            "errors": "Completions that failed (connection, HTTP status, bad stream).",
+            "timeouts": "Completions that hit a connect, read or total timeout.",
+            "rejected": "Completions turned away: queue full or no slot in time.",
+            "cancelled": "Completions closed early (client disconnect, answer cut at a secret).",
+        },
+        gauges={
+            "in_flight": "Requests running on the model backend.",
+            "queued": "Completions waiting for a model backend slot.",
+            "max_in_flight": "Model backend concurrency limit.",
+        },
+    )
+    return "".join(families)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Prometheus text format: stage histograms, decision / detection counters, cache and queue gauges."""
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
@@ -0,0 +1,341 @@
+# backend/app/audit/audit_analytics.py
+
+"""
+Embedded SQLite analytics over the audit log (settings.AUDIT_ANALYTICS_DB_PATH).
+
+The segment store (audit_store.py) is good at "give me these entries"; this
+database answers "how many": counts by action, detection type, user and
+hour for the admin dashboard.
+
+    events                    one row per audit entry: timestamp, user,
+                              action, risk score, decision + detection_summary
+                              JSON; indexed on (ts), (user, ts), (action, ts)
+    rollup_action_hourly      (hour, action) -> entries
+    rollup_detection_hourly   (hour, detection type) -> entries, detections
+    rollup_user_daily         (day, user, action) -> entries
+
+Rollups are updated in the same transaction as the event insert (one
+transaction per sink batch), so stats queries sum a few rows per hour (or
+day) in the window instead of scanning events. Windows are hour-granular
+(day-granular for per-user counts, which would barely compress per hour):
+`since` rounds down and `until` rounds up to the containing hour / day.
+
+The database runs in WAL mode so dashboard reads never block the writer;
+several uvicorn workers can share it (SQLite serialises their writes).
+"""
+
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..core.json_codec import dumps
+from .audit_models import AuditLogEntry
+from .audit_store import AuditStore, to_us
+
+
+HOUR_US = 3600 * 1_000_000
+DAY_US = 24 * HOUR_US
+ACTIONS = ("ALLOW", "REDACT", "REWRITE", "BLOCK")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id                INTEGER PRIMARY KEY,
+    ts_us             INTEGER NOT NULL,
+    user_id           TEXT NOT NULL,
+    role              TEXT,
+    action            TEXT NOT NULL,
+    risk_score        INTEGER,
+    detections        INTEGER NOT NULL,
+    decision          TEXT NOT NULL,
+    detection_summary TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts_us);
+CREATE INDEX IF NOT EXISTS events_user_ts ON events (user_id, ts_us);
+CREATE INDEX IF NOT EXISTS events_action_ts ON events (action, ts_us);
+
+CREATE TABLE IF NOT EXISTS rollup_action_hourly (
+    hour    INTEGER NOT NULL,
+    action  TEXT NOT NULL,
+    entries INTEGER NOT NULL,
+    PRIMARY KEY (hour, action)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rollup_detection_hourly (
+    hour           INTEGER NOT NULL,
+    detection_type TEXT NOT NULL,
+    entries        INTEGER NOT NULL,
+    detections     INTEGER NOT NULL,
+    PRIMARY KEY (hour, detection_type)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rollup_user_daily (
+    day     INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    action  TEXT NOT NULL,
+    entries INTEGER NOT NULL,
+    PRIMARY KEY (day, user_id, action)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _value(v: Any) -> str:
+    return getattr(v, "value", v)  # enums from model_dump() vs plain JSON strings
+
+
+def _detection_counts(summary: Dict[str, Any]) -> Dict[str, int]:
+    counts = summary.get("detection_counts")
+    if counts:
+        return {_value(k): int(n) for k, n in counts.items() if n}
+    return dict(Counter(_value(d.get("type", "OTHER")) for d in summary.get("detections", [])))
+
+
+def _bucket_range(
+    since: Optional[datetime], until: Optional[datetime], bucket_us: int = HOUR_US
+) -> Tuple[int, int]:
+    lo = to_us(since) // bucket_us if since else -(2**62)
+    hi = to_us(until) // bucket_us if until else 2**62
+    return lo, hi
+
+
+def _hour_iso(hour: int) -> str:
+    return (datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(hours=hour)).isoformat()
+
+
+class AuditAnalytics:
+    def __init__(self, db_path: Path):
+        self._path = Path(db_path)
+        self._write_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._local = threading.local()  # one read connection per thread
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    # ---------- connections ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; the segment store is the record
+        return conn
+
+    def open(self):
+        if self._writer is not None:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        self._writer = conn
+
+    def close(self):
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        reader = getattr(self._local, "conn", None)
+        if reader is not None:
+            reader.close()
+            self._local.conn = None
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # ---------- writes ----------
+
+    def record(self, entries: Iterable[AuditLogEntry]):
+        """Insert a batch of entries + bump their rollups in one transaction."""
+        events = []
+        by_action: Counter = Counter()
+        by_user: Counter = Counter()
+        det_entries: Counter = Counter()
+        det_counts: Counter = Counter()
+
+        for entry in entries:
+            ts_us = to_us(entry.timestamp)
+            hour = ts_us // HOUR_US
+            decision = entry.decision
+            action = _value(decision.get("action", "ALLOW"))
+            counts = _detection_counts(entry.detection_summary)
+            events.append(
+                (
+                    ts_us,
+                    entry.user_id,
+                    entry.role,
+                    action,
+                    (decision.get("risk") or {}).get("score"),
+                    sum(counts.values()),
+                    dumps(decision).decode("utf-8"),
+                    dumps(entry.detection_summary).decode("utf-8"),
+                )
+            )
+            by_action[(hour, action)] += 1
+            by_user[(ts_us // DAY_US, entry.user_id, action)] += 1
+            for det_type, n in counts.items():
+                det_entries[(hour, det_type)] += 1
+                det_counts[(hour, det_type)] += n
+
+        if not events:
+            return
+        with self._write_lock:
+            conn = self._writer
+            if conn is None:
+                raise RuntimeError("Audit analytics database is not open")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO events (ts_us, user_id, role, action, risk_score, detections,"
+                    " decision, detection_summary) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    events,
+                )
+                conn.executemany(
+                    "INSERT INTO rollup_action_hourly VALUES (?, ?, ?)"
+                    " ON CONFLICT (hour, action) DO UPDATE SET entries = entries + excluded.entries",
+                    [(h, a, n) for (h, a), n in by_action.items()],
+                )
+                conn.executemany(
+                    "INSERT INTO rollup_user_daily VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (day, user_id, action) DO UPDATE SET entries = entries + excluded.entries",
+                    [(d, u, a, n) for (d, u, a), n in by_user.items()],
+                )
+                conn.executemany(
+                    "INSERT INTO rollup_detection_hourly VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (hour, detection_type) DO UPDATE SET"
+                    " entries = entries + excluded.entries, detections = detections + excluded.detections",
+                    [(h, t, n, det_counts[(h, t)]) for (h, t), n in det_entries.items()],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def backfill(self, store: AuditStore) -> int:
+        """
+        Load the existing segment store into an empty database, once. Only
+        entries older than the moment the backfill is claimed are loaded;
+        anything newer reaches the database through the sink.
+        """
+        cutoff = datetime.now(timezone.utc)
+        with self._write_lock:
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            claimed = conn.execute("SELECT 1 FROM meta WHERE key = 'backfill_cutoff'").fetchone() is None
+            if claimed:  # first worker to get here does the work
+                conn.execute(
+                    "INSERT INTO meta VALUES ('backfill_cutoff', ?)", (cutoff.isoformat(),)
+                )
+            conn.execute("COMMIT")
+        if not claimed:
+            return 0
+
+        t0 = time.perf_counter()
+        count = 0
+        for batch in store.scan(until=cutoff, batch_size=5000):
+            self.record(batch)
+            count += len(batch)
+        if count:
+            print(
+                f"[AUDIT ANALYTICS] Backfilled {count} entries from {store.root} "
+                f"in {time.perf_counter() - t0:.1f}s"
+            )
+        return count
+
+    # ---------- stats ----------
+
+    def counts_by_action(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        lo, hi = _bucket_range(since, until)
+        rows = self._reader().execute(
+            "SELECT action, SUM(entries) FROM rollup_action_hourly"
+            " WHERE hour BETWEEN ? AND ? GROUP BY action",
+            (lo, hi),
+        ).fetchall()
+        counts = {a: 0 for a in ACTIONS}
+        counts.update({a: n for a, n in rows})
+        total = sum(counts.values())
+        return {
+            "total": total,
+            "by_action": counts,
+            "block_rate": counts["BLOCK"] / total if total else 0.0,
+            "violation_rate": (total - counts["ALLOW"]) / total if total else 0.0,
+        }
+
+    def counts_by_detection(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Detection types, most frequent first (the "top violations")."""
+        lo, hi = _bucket_range(since, until)
+        rows = self._reader().execute(
+            "SELECT detection_type, SUM(entries) AS e, SUM(detections) FROM rollup_detection_hourly"
+            " WHERE hour BETWEEN ? AND ? GROUP BY detection_type ORDER BY e DESC, detection_type",
+            (lo, hi),
+        ).fetchall()
+        return [{"type": t, "entries": e, "detections": d} for t, e, d in rows]
+
+    def counts_by_user(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Users with the most non-ALLOW decisions first (day-granular window)."""
+        lo, hi = _bucket_range(since, until, DAY_US)
+        conn = self._reader()
+        top = conn.execute(
+            "SELECT user_id, SUM(entries) AS total,"
+            " SUM(CASE WHEN action != 'ALLOW' THEN entries ELSE 0 END) AS violations"
+            " FROM rollup_user_daily WHERE day BETWEEN ? AND ?"
+            " GROUP BY user_id ORDER BY violations DESC, total DESC, user_id LIMIT ?",
+            (lo, hi, limit),
+        ).fetchall()
+        if not top:
+            return []
+        # per-action breakdown for the selected users only
+        marks = ",".join("?" * len(top))
+        rows = conn.execute(
+            f"SELECT user_id, action, SUM(entries) FROM rollup_user_daily"
+            f" WHERE day BETWEEN ? AND ? AND user_id IN ({marks}) GROUP BY user_id, action",
+            (lo, hi, *[u for u, _, _ in top]),
+        ).fetchall()
+        by_action: Dict[str, Dict[str, int]] = {u: {a: 0 for a in ACTIONS} for u, _, _ in top}
+        for user_id, action, n in rows:
+            by_action[user_id][action] = n
+        return [
+            {"user_id": u, "total": total, "violations": v, "by_action": by_action[u]}
+            for u, total, v in top
+        ]
+
+    def counts_by_hour(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """One row per hour that has entries, oldest first."""
+        lo, hi = _bucket_range(since, until)
+        rows = self._reader().execute(
+            "SELECT hour, action, entries FROM rollup_action_hourly"
+            " WHERE hour BETWEEN ? AND ? ORDER BY hour",
+            (lo, hi),
+        ).fetchall()
+        hours: Dict[int, Dict[str, int]] = {}
+        for hour, action, n in rows:
+            hours.setdefault(hour, {a: 0 for a in ACTIONS})[action] = n
+        return [
+            {"hour": _hour_iso(h), "total": sum(c.values()), "by_action": c}
+            for h, c in hours.items()
+        ]
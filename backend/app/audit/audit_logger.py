@@ -1,43 +1,122 @@
-import json
+import os
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
+from ..core.config import settings
+from .audit_analytics import AuditAnalytics
 from .audit_models import AuditLogEntry
+from .audit_sink import audit_sink
+from .audit_store import AuditPage, AuditStore
 
 
 BASE_DIR = Path(__file__).resolve().parents[2]  # .../backend
 LOG_DIR = BASE_DIR / "data"
+# Pre-segment single-file log; imported into the store once (see init_audit_sink)
 LOG_FILE = LOG_DIR / "audit_logs.jsonl"
 
 LOG_DIR.mkdir(exist_ok=True)
 
+audit_store = AuditStore(BASE_DIR / settings.AUDIT_LOG_DIR)
+# Optional SQLite backend for /admin/stats (opened in init_audit_sink)
+audit_analytics: Optional[AuditAnalytics] = (
+    AuditAnalytics(BASE_DIR / settings.AUDIT_ANALYTICS_DB_PATH)
+    if settings.AUDIT_ANALYTICS_ENABLED
+    else None
+)
+
+
+def migrate_legacy_log() -> None:
+    """Import data/audit_logs.jsonl into the segment store, once per store."""
+    if not LOG_FILE.exists():
+        return
+    audit_store.root.mkdir(parents=True, exist_ok=True)
+    marker = audit_store.root / ".legacy_imported"
+    try:
+        # O_EXCL: exactly one worker process does the import
+        os.close(os.open(marker, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+    except FileExistsError:
+        return
+    count = audit_store.import_jsonl(LOG_FILE)
+    print(f"[AUDIT] Imported {count} entries from {LOG_FILE} into {audit_store.root}")
+
+
+def init_analytics() -> None:
+    """Open the analytics database; the first start backfills it from the store."""
+    if audit_analytics is None:
+        return
+    try:
+        audit_analytics.open()
+        audit_analytics.backfill(audit_store)
+    except Exception as e:
+        # stats are optional; audit logging itself must keep working
+        print(f"[AUDIT ANALYTICS] Disabled: {e}")
+        audit_analytics.close()
+
+
+def init_audit_sink():
+    """Called from app.main startup event: audit writes leave the request path."""
+    migrate_legacy_log()
+    init_analytics()
+    analytics = audit_analytics if audit_analytics is not None and audit_analytics.is_open else None
+    audit_sink.start(audit_store, analytics)
+
+
+def shutdown_audit_sink():
+    """Called from app.main shutdown event: drain + fsync pending entries."""
+    audit_sink.stop()
+    audit_store.close()
+    if audit_analytics is not None:
+        audit_analytics.close()
+
+
+def _append_now(entries: List[AuditLogEntry]) -> None:
+    """Synchronous write, used when the sink is not running (scripts, benchmarks)."""
+    audit_store.append(entries)
+    if audit_analytics is not None and audit_analytics.is_open:
+        audit_analytics.record(entries)
+
 
 def write_audit_log(entry: AuditLogEntry) -> None:
-    with LOG_FILE.open("a", encoding="utf-8") as f:
-        f.write(entry.model_dump_json() + "\n")
+    if audit_sink.running:
+        audit_sink.submit(entry)
+        return
+    _append_now([entry])
 
 
-def read_audit_logs(limit: int = 50) -> List[AuditLogEntry]:
-    if not LOG_FILE.exists():
-        return []
-
-    with LOG_FILE.open("r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    # last N lines
-    last_lines = lines[-limit:]
-    entries: List[AuditLogEntry] = []
-    for line in last_lines:
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            data = json.loads(line)
-            entries.append(AuditLogEntry(**data))
-        except Exception:
-            # skip malformed line
-            continue
+def write_audit_logs(entries: List[AuditLogEntry]) -> None:
+    """Bulk variant: one locked append for the whole batch."""
+    if not entries:
+        return
+    if audit_sink.running:
+        audit_sink.submit_many(entries)
+        return
+    _append_now(entries)
+
 
+def query_audit_logs(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    user_id: Optional[str] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> AuditPage:
+    """Newest-first page of audit entries; raises ValueError on a bad cursor."""
+    audit_sink.flush()  # include entries still queued in the writer
+    return audit_store.query(
+        limit=limit, cursor=cursor, user_id=user_id, action=action, since=since, until=until
+    )
+
+
+def get_audit_analytics() -> Optional[AuditAnalytics]:
+    """The open analytics database (None if disabled); flushes the sink so counts are current."""
+    if audit_analytics is None or not audit_analytics.is_open:
+        return None
+    audit_sink.flush()
+    return audit_analytics
+
+
+def read_audit_logs(limit: int = 50) -> List[AuditLogEntry]:
     # newest first
-    entries.reverse()
-    return entries
+    return query_audit_logs(limit=limit).entries
@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Union
 from pydantic import BaseModel
 
+from ..core.json_codec import dumps, loads
 from ..models.schemas import AnalyzeRequest, AnalyzeResponse
 
 
@@ -27,3 +28,18 @@ def build_audit_entry(req: AnalyzeRequest, res: AnalyzeResponse) -> AuditLogEntr
         detection_summary=res.detection_summary.model_dump(),
         safety_timeline=res.safety_timeline,
     )
+
+
+# The audit log's on-disk format: one entry per line. decision and
+# detection_summary are plain dicts, so json_codec encodes an entry
+# directly (same bytes as model_dump_json()) and validation on read only
+# has to check the top-level fields.
+
+
+def encode_audit_entry(entry: AuditLogEntry) -> bytes:
+    """One JSON line, with the trailing newline."""
+    return dumps(entry) + b"\n"
+
+
+def decode_audit_entry(line: Union[bytes, str]) -> AuditLogEntry:
+    return AuditLogEntry.model_validate(loads(line))
@@ -0,0 +1,301 @@
+# backend/app/audit/audit_sink.py
+
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..core.config import settings
+from .audit_analytics import AuditAnalytics
+from .audit_models import AuditLogEntry, encode_audit_entry
+from .audit_store import AuditStore
+
+
+FSYNC_POLICIES = ("always", "interval", "never")
+QUEUE_FULL_POLICIES = ("block", "drop")
+
+
+class _Flush:
+    """Queue marker: commit everything before it, then set `done`."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+# Entries serialized per GIL hold on the writer thread; keeps a large batch
+# from stalling request handlers for milliseconds at a time.
+_SERIALIZE_SLICE = 16
+
+
+class AuditSink:
+    """
+    Bounded in-memory queue + background writer thread for audit entries.
+
+    Request handlers only enqueue the entry object; JSON serialization and
+    disk I/O happen on the writer thread, which group-commits: it collects
+    entries until `batch_size` are pending or `flush_interval_ms` has passed
+    since the first one, then appends the whole batch to the AuditStore in
+    one write (the store flocks, so several uvicorn workers can share it
+    without interleaving lines) and fsyncs according to `fsync_policy`:
+
+      - "always":   after every batch
+      - "interval": at most every `fsync_interval_ms`, and on shutdown
+      - "never":    leave it to the OS
+
+    If an AuditAnalytics database is attached, each committed batch is also
+    recorded there (one SQLite transaction); a failure there is counted in
+    stats()["analytics_errors"] and never loses the store write.
+
+    When the queue is full, "block" waits up to `enqueue_timeout_ms` for
+    room and "drop" gives up straight away; either way a dropped entry is
+    counted in stats() instead of slowing the request down.
+
+    audit_logger.write_audit_log() falls back to a synchronous append when
+    the sink has not been started (scripts, benchmarks).
+    """
+
+    def __init__(
+        self,
+        max_queue: int = settings.AUDIT_QUEUE_MAX_ENTRIES,
+        batch_size: int = settings.AUDIT_BATCH_MAX_ENTRIES,
+        flush_interval_ms: int = settings.AUDIT_FLUSH_INTERVAL_MS,
+        fsync_policy: str = settings.AUDIT_FSYNC_POLICY,
+        fsync_interval_ms: int = settings.AUDIT_FSYNC_INTERVAL_MS,
+        queue_full_policy: str = settings.AUDIT_QUEUE_FULL_POLICY,
+        enqueue_timeout_ms: int = settings.AUDIT_ENQUEUE_TIMEOUT_MS,
+    ):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"fsync_policy must be one of {FSYNC_POLICIES}")
+        if queue_full_policy not in QUEUE_FULL_POLICIES:
+            raise ValueError(f"queue_full_policy must be one of {QUEUE_FULL_POLICIES}")
+
+        self._max_queue = max_queue
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval_ms / 1000.0
+        self._fsync_policy = fsync_policy
+        self._fsync_interval = fsync_interval_ms / 1000.0
+        self._block = queue_full_policy == "block"
+        self._enqueue_timeout = enqueue_timeout_ms / 1000.0
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._wakeup = threading.Event()  # full batch / flush / stop: commit now
+        self._thread: Optional[threading.Thread] = None
+        self._store: Optional[AuditStore] = None
+        self._analytics: Optional[AuditAnalytics] = None
+        self._last_fsync = 0.0
+        self._unsynced = False
+
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "write_errors": 0,
+            "analytics_errors": 0,
+            "batches": 0,
+            "fsyncs": 0,
+            "max_batch": 0,
+            "last_batch_ms": 0.0,
+        }
+
+    # ---------- lifecycle ----------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, store: AuditStore, analytics: Optional[AuditAnalytics] = None):
+        if self.running:
+            return
+        self._store = store
+        self._analytics = analytics
+        self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        print(
+            f"[AUDIT] Sink writing to {store.root} (batch={self._batch_size}, "
+            f"flush={self._flush_interval * 1000:.0f}ms, fsync={self._fsync_policy})"
+        )
+
+    def stop(self, timeout: float = 10.0):
+        """Drain the queue, fsync and stop the writer thread."""
+        if not self.running:
+            return
+        self._queue.put(_STOP)  # blocks until there is room; the writer is draining
+        self._wakeup.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"[AUDIT] Sink did not stop within {timeout}s; {self._queue.qsize()} entries pending")
+            return
+        self._thread = None
+        print(f"[AUDIT] Sink stopped: {self.stats()}")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything submitted so far is on disk (readers use this)."""
+        if not self.running:
+            return True
+        marker = _Flush()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        self._wakeup.set()
+        return marker.done.wait(timeout)
+
+    # ---------- producers ----------
+
+    def submit(self, entry: AuditLogEntry) -> bool:
+        """Enqueue one entry; False if it was dropped because the queue is full."""
+        if not self.running:
+            raise RuntimeError("Audit sink is not running")
+        try:
+            if self._block:
+                self._queue.put(entry, timeout=self._enqueue_timeout)
+            else:
+                self._queue.put_nowait(entry)
+        except queue.Full:
+            self._count_drop()
+            return False
+        self._bump("enqueued")
+        if self._queue.qsize() >= self._batch_size:
+            self._wakeup.set()
+        return True
+
+    def submit_many(self, entries: List[AuditLogEntry]) -> int:
+        """Enqueue a batch; returns how many entries were accepted."""
+        return sum(1 for entry in entries if self.submit(entry))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update(
+            running=self.running,
+            queue_depth=self._queue.qsize(),
+            queue_capacity=self._max_queue,
+            fsync_policy=self._fsync_policy,
+        )
+        return stats
+
+    def _bump(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def _count_drop(self):
+        with self._stats_lock:
+            self._stats["dropped"] += 1
+            dropped = self._stats["dropped"]
+        if dropped == 1 or dropped % 1000 == 0:
+            print(f"[AUDIT] Queue full; dropped {dropped} entries so far")
+
+    # ---------- writer thread ----------
+
+    def _run(self):
+        stopping = False
+
+        try:
+            while not stopping:
+                try:
+                    first = self._queue.get(timeout=self._next_fsync_wait())
+                except queue.Empty:
+                    self._fsync(force=False)
+                    continue
+
+                # Group commit: sleep until the flush interval is up or a full
+                # batch is queued, instead of waking up for every entry.
+                if isinstance(first, AuditLogEntry) and self._queue.qsize() < self._batch_size - 1:
+                    self._wakeup.wait(self._flush_interval)
+                self._wakeup.clear()
+
+                pending: List[AuditLogEntry] = []
+                flushes: List[_Flush] = []
+                item = first
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    if isinstance(item, _Flush):
+                        flushes.append(item)
+                    else:
+                        pending.append(item)
+                        if len(pending) >= self._batch_size:
+                            break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                if pending:
+                    self._commit(pending)
+                for marker in flushes:
+                    marker.done.set()
+                self._fsync(force=False)
+
+            # entries submitted while stopping, behind the stop marker
+            leftovers: List[AuditLogEntry] = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, _Flush):
+                    item.done.set()
+                elif item is not _STOP:
+                    leftovers.append(item)
+            if leftovers:
+                self._commit(leftovers)
+        finally:
+            self._fsync(force=True)
+
+    def _next_fsync_wait(self) -> Optional[float]:
+        """Seconds until an interval fsync is due (None = sleep until work arrives)."""
+        if self._unsynced and self._fsync_policy == "interval":
+            return max(0.0, self._last_fsync + self._fsync_interval - time.monotonic())
+        return None
+
+    def _commit(self, batch: List[AuditLogEntry]):
+        t0 = time.perf_counter()
+        try:
+            lines: List[bytes] = []
+            for i, entry in enumerate(batch, 1):
+                lines.append(encode_audit_entry(entry))
+                if i % _SERIALIZE_SLICE == 0:
+                    time.sleep(0)  # let request threads have the GIL
+            self._store.append(batch, lines)
+        except Exception as e:
+            self._bump("write_errors")
+            print(f"[AUDIT] Failed to write {len(batch)} entries: {e}")
+            return
+
+        self._unsynced = True
+        if self._fsync_policy == "always":
+            self._fsync(force=True)
+
+        if self._analytics is not None:
+            try:
+                self._analytics.record(batch)
+            except Exception as e:
+                self._bump("analytics_errors")
+                print(f"[AUDIT] Failed to record {len(batch)} entries in analytics: {e}")
+
+        with self._stats_lock:
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+            self._stats["last_batch_ms"] = (time.perf_counter() - t0) * 1000.0
+
+    def _fsync(self, force: bool):
+        if not self._unsynced or self._fsync_policy == "never":
+            return
+        now = time.monotonic()
+        if not force and now - self._last_fsync < self._fsync_interval:
+            return
+        self._store.fsync()
+        self._last_fsync = now
+        self._unsynced = False
+        self._bump("fsyncs")
+
+
+audit_sink = AuditSink()
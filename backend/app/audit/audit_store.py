@@ -0,0 +1,451 @@
+# backend/app/audit/audit_store.py
+
+"""
+Segment-rotated audit log store with a sidecar offset index.
+
+Layout under settings.AUDIT_LOG_DIR (default data/audit/):
+
+    segment-00000001.jsonl   one AuditLogEntry JSON per line
+    segment-00000001.idx     one 32-byte record per line (see INDEX_RECORD)
+    segment-00000002.jsonl   ...
+    .lock                    flock'd while appending (several uvicorn workers)
+
+The active (highest-numbered) segment is rotated once it is larger than
+AUDIT_SEGMENT_MAX_BYTES or its first entry is older than
+AUDIT_SEGMENT_MAX_AGE_S.
+
+Queries never parse a whole segment: the .idx files are memory-mapped as
+NumPy record arrays, filtered on timestamp / user / action in bulk, and only
+the matching lines are read with pread(). A tail read of `limit` entries
+touches `limit` lines, however large the history is.
+"""
+
+import hashlib
+import os
+import re
+import struct
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+try:  # advisory lock between worker processes (not available on Windows)
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from ..core.config import settings
+from .audit_models import AuditLogEntry, decode_audit_entry, encode_audit_entry
+
+
+# ts_us, offset, user_hash, length, action, reserved
+INDEX_RECORD = struct.Struct("<qQQIHH")
+INDEX_DTYPE = np.dtype(
+    [
+        ("ts_us", "<i8"),
+        ("offset", "<u8"),
+        ("user_hash", "<u8"),
+        ("length", "<u4"),
+        ("action", "<u2"),
+        ("reserved", "<u2"),
+    ]
+)
+assert INDEX_DTYPE.itemsize == INDEX_RECORD.size
+
+# Stored in the index; never renumber existing codes.
+ACTION_CODES: Dict[str, int] = {"ALLOW": 1, "REDACT": 2, "REWRITE": 3, "BLOCK": 4}
+
+_SEGMENT_RE = re.compile(r"^segment-(\d{8})\.jsonl$")
+
+
+def user_hash(user_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(user_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def to_us(ts: datetime) -> int:
+    """Microseconds since the epoch; naive datetimes are UTC (build_audit_entry uses utcnow)."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp() * 1_000_000)
+
+
+def _action_of(entry: AuditLogEntry) -> int:
+    action = entry.decision.get("action")
+    return ACTION_CODES.get(getattr(action, "value", action), 0)
+
+
+class AuditPage(NamedTuple):
+    entries: List[AuditLogEntry]
+    next_cursor: Optional[str]
+
+
+class AuditStore:
+    def __init__(
+        self,
+        root: Path,
+        max_segment_bytes: int = settings.AUDIT_SEGMENT_MAX_BYTES,
+        max_segment_age_s: int = settings.AUDIT_SEGMENT_MAX_AGE_S,
+    ):
+        self._root = Path(root)
+        self._max_bytes = max_segment_bytes
+        self._max_age_us = max_segment_age_s * 1_000_000
+
+        self._lock = threading.Lock()  # this process; .lock covers other workers
+        self._active: Optional[int] = None
+        self._data_fd: Optional[int] = None
+        self._idx_fd: Optional[int] = None
+        self._active_first_ts: Optional[int] = None
+
+        # sealed segments never change, so their index maps + bounds are cached
+        self._sealed_index: Dict[int, np.ndarray] = {}
+        self._sealed_bounds: Dict[int, Tuple[int, int]] = {}
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    # ---------- segment bookkeeping ----------
+
+    def _data_path(self, seq: int) -> Path:
+        return self._root / f"segment-{seq:08d}.jsonl"
+
+    def _idx_path(self, seq: int) -> Path:
+        return self._root / f"segment-{seq:08d}.idx"
+
+    def segments(self) -> List[int]:
+        if not self._root.exists():
+            return []
+        seqs = []
+        for name in os.listdir(self._root):
+            m = _SEGMENT_RE.match(name)
+            if m:
+                seqs.append(int(m.group(1)))
+        return sorted(seqs)
+
+    def _open_segment(self, seq: int):
+        self._close_fds()
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        self._data_fd = os.open(self._data_path(seq), flags, 0o644)
+        self._idx_fd = os.open(self._idx_path(seq), flags, 0o644)
+        self._active = seq
+        self._active_first_ts = None
+        self._repair(seq)
+
+    def _close_fds(self):
+        for fd in (self._data_fd, self._idx_fd):
+            if fd is not None:
+                os.close(fd)
+        self._data_fd = self._idx_fd = None
+        self._active = None
+
+    def close(self):
+        with self._lock:
+            self._close_fds()
+
+    def _repair(self, seq: int):
+        """
+        Bring the index in line with the data file after a crash: drop a torn
+        index record, index lines that were written but not indexed, and
+        drop a torn last line (one without its trailing newline). A complete
+        line that does not decode is left unindexed, so queries skip it, and
+        the entries after it are kept.
+        """
+        idx_size = os.fstat(self._idx_fd).st_size
+        if idx_size % INDEX_RECORD.size:
+            os.truncate(self._idx_path(seq), idx_size - idx_size % INDEX_RECORD.size)
+            idx_size -= idx_size % INDEX_RECORD.size
+
+        indexed_end = 0
+        if idx_size:
+            with self._idx_path(seq).open("rb") as f:
+                f.seek(idx_size - INDEX_RECORD.size)
+                _, offset, _, length, _, _ = INDEX_RECORD.unpack(f.read(INDEX_RECORD.size))
+            indexed_end = offset + length
+
+        data_size = os.fstat(self._data_fd).st_size
+        if data_size <= indexed_end:
+            return
+
+        records = []
+        skipped = 0
+        keep_end = indexed_end
+        with self._data_path(seq).open("rb") as f:
+            f.seek(indexed_end)
+            offset = indexed_end
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write at the end
+                try:
+                    entry = decode_audit_entry(line)
+                except Exception:
+                    skipped += 1  # complete but malformed: keep it, unindexed
+                else:
+                    records.append(
+                        INDEX_RECORD.pack(
+                            to_us(entry.timestamp), offset, user_hash(entry.user_id), len(line),
+                            _action_of(entry), 0,
+                        )
+                    )
+                offset += len(line)
+                keep_end = offset
+
+        if records:
+            os.write(self._idx_fd, b"".join(records))
+        if keep_end < data_size:
+            os.truncate(self._data_path(seq), keep_end)
+        print(
+            f"[AUDIT STORE] Repaired segment {seq}: indexed {len(records)} trailing entries"
+            + (f", skipped {skipped} malformed lines" if skipped else "")
+        )
+
+    def _first_ts(self, seq: int) -> Optional[int]:
+        with self._idx_path(seq).open("rb") as f:
+            head = f.read(INDEX_RECORD.size)
+        if len(head) < INDEX_RECORD.size:
+            return None
+        return INDEX_RECORD.unpack(head)[0]
+
+    def _ensure_active(self, now_us: int):
+        """Called with the process + file lock held: pick / rotate the segment to append to."""
+        seqs = self.segments()
+        newest = seqs[-1] if seqs else 0
+        if newest == 0:
+            self._open_segment(1)
+            return
+        if self._active != newest:  # first append, or another worker rotated
+            self._open_segment(newest)
+
+        if self._active_first_ts is None:
+            self._active_first_ts = self._first_ts(newest)
+        too_big = os.fstat(self._data_fd).st_size >= self._max_bytes
+        too_old = self._active_first_ts is not None and now_us - self._active_first_ts >= self._max_age_us
+        if too_big or too_old:
+            self._open_segment(newest + 1)
+
+    # ---------- writes ----------
+
+    def append(self, entries: List[AuditLogEntry], lines: Optional[List[bytes]] = None):
+        """
+        Append entries (one line each) and their index records. `lines` may
+        carry the already-serialized JSON lines (with trailing newline).
+        """
+        if not entries:
+            return
+        if lines is None:
+            lines = [encode_audit_entry(entry) for entry in entries]
+
+        self._root.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._file_lock():
+            self._ensure_active(to_us(entries[0].timestamp))
+
+            offset = os.fstat(self._data_fd).st_size
+            records = []
+            for entry, line in zip(entries, lines):
+                records.append(
+                    INDEX_RECORD.pack(
+                        to_us(entry.timestamp), offset, user_hash(entry.user_id), len(line),
+                        _action_of(entry), 0,
+                    )
+                )
+                offset += len(line)
+
+            # data first: an index record never points past the data
+            _write_all(self._data_fd, b"".join(lines))
+            _write_all(self._idx_fd, b"".join(records))
+            if self._active_first_ts is None:
+                self._active_first_ts = to_us(entries[0].timestamp)
+
+    def fsync(self):
+        with self._lock:
+            for fd in (self._data_fd, self._idx_fd):
+                if fd is not None:
+                    os.fsync(fd)
+
+    def _file_lock(self):
+        return _FileLock(self._root / ".lock")
+
+    # ---------- reads ----------
+
+    def _index(self, seq: int, sealed: bool) -> np.ndarray:
+        if sealed and seq in self._sealed_index:
+            return self._sealed_index[seq]
+        path = self._idx_path(seq)
+        n = path.stat().st_size // INDEX_RECORD.size if path.exists() else 0
+        index = (
+            np.memmap(path, dtype=INDEX_DTYPE, mode="r", shape=(n,))
+            if n
+            else np.zeros(0, dtype=INDEX_DTYPE)
+        )
+        if sealed:
+            self._sealed_index[seq] = index
+            if n:
+                self._sealed_bounds[seq] = (int(index["ts_us"].min()), int(index["ts_us"].max()))
+        return index
+
+    def query(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        user_id: Optional[str] = None,
+        action: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> AuditPage:
+        """
+        Newest-first page of entries matching every given filter. Pass the
+        returned `next_cursor` back to get the following page.
+        """
+        start_seq, start_pos = _parse_cursor(cursor) if cursor else (None, None)
+        since_us = to_us(since) if since else None
+        until_us = to_us(until) if until else None
+        want_user = user_hash(user_id) if user_id is not None else None
+        want_action = ACTION_CODES.get(action, -1) if action is not None else None
+
+        seqs = self.segments()
+        newest = seqs[-1] if seqs else None
+        entries: List[AuditLogEntry] = []
+        next_cursor: Optional[str] = None
+
+        for seq in reversed(seqs):
+            if start_seq is not None and seq > start_seq:
+                continue
+            sealed = seq != newest
+            index = self._index(seq, sealed)
+            end = len(index)
+            if start_seq == seq:
+                end = min(end, start_pos)
+            if end == 0:
+                continue
+
+            bounds = self._sealed_bounds.get(seq) if sealed else None
+            if bounds and (
+                (since_us is not None and bounds[1] < since_us)
+                or (until_us is not None and bounds[0] > until_us)
+            ):
+                continue
+
+            view = index[:end]
+            mask = np.ones(end, dtype=bool)
+            if since_us is not None:
+                mask &= view["ts_us"] >= since_us
+            if until_us is not None:
+                mask &= view["ts_us"] <= until_us
+            if want_user is not None:
+                mask &= view["user_hash"] == np.uint64(want_user)
+            if want_action is not None:
+                mask &= view["action"] == want_action
+            positions = np.flatnonzero(mask)[::-1]
+            if not positions.size:
+                continue
+
+            with self._data_path(seq).open("rb") as f:
+                fd = f.fileno()
+                for pos in positions:
+                    rec = view[pos]
+                    line = os.pread(fd, int(rec["length"]), int(rec["offset"]))
+                    try:
+                        entry = decode_audit_entry(line)
+                    except Exception:
+                        continue  # skip malformed line
+                    if user_id is not None and entry.user_id != user_id:
+                        continue  # 64-bit hash collision
+                    entries.append(entry)
+                    if len(entries) == limit:
+                        next_cursor = f"{seq}-{int(pos)}"
+                        return AuditPage(entries, next_cursor)
+
+        return AuditPage(entries, next_cursor)
+
+    def scan(
+        self, until: Optional[datetime] = None, batch_size: int = 1000
+    ) -> Iterator[List[AuditLogEntry]]:
+        """
+        Every entry oldest-first, in batches (optionally only those strictly
+        before `until`). Each batch is read with a single pread.
+        """
+        until_us = to_us(until) if until else None
+        seqs = self.segments()
+        for seq in seqs:
+            index = self._index(seq, sealed=seq != seqs[-1])
+            positions = np.arange(len(index))
+            if until_us is not None:
+                positions = np.flatnonzero(index["ts_us"] < until_us)
+            if not positions.size:
+                continue
+            with self._data_path(seq).open("rb") as f:
+                fd = f.fileno()
+                for start in range(0, positions.size, batch_size):
+                    recs = index[positions[start : start + batch_size]]
+                    base = int(recs["offset"][0])
+                    end = int(recs["offset"][-1]) + int(recs["length"][-1])
+                    blob = os.pread(fd, end - base, base)
+                    batch: List[AuditLogEntry] = []
+                    for off, length in zip(recs["offset"].tolist(), recs["length"].tolist()):
+                        try:
+                            batch.append(
+                                decode_audit_entry(blob[off - base : off - base + length])
+                            )
+                        except Exception:
+                            continue  # skip malformed line
+                    if batch:
+                        yield batch
+
+    def is_empty(self) -> bool:
+        return not self.segments()
+
+    def import_jsonl(self, path: Path, batch_size: int = 1000) -> int:
+        """Append every valid line of a legacy single-file log (one-time migration)."""
+        count = 0
+        batch: List[AuditLogEntry] = []
+        with Path(path).open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    batch.append(decode_audit_entry(line))
+                except Exception:
+                    continue  # skip malformed line
+                if len(batch) >= batch_size:
+                    self.append(batch)
+                    count += len(batch)
+                    batch = []
+        if batch:
+            self.append(batch)
+            count += len(batch)
+        return count
+
+
+class _FileLock:
+    def __init__(self, path: Path):
+        self._path = path
+        self._fd: Optional[int] = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _parse_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        seq, pos = cursor.split("-", 1)
+        return int(seq), int(pos)
+    except ValueError:
+        raise ValueError(f"Invalid audit log cursor '{cursor}'")
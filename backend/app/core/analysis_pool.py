@@ -0,0 +1,159 @@
+# backend/app/core/analysis_pool.py
+
+"""
+Process pool for the CPU-bound part of /analyze (classifier, TF-IDF / RAG,
+regex detectors, decision logic), so one uvicorn worker can use more than
+one core.
+
+Workers are forked after the safety model and policy index are loaded, so
+they start with both already in memory: the policy index arrays are
+memory-mapped (shared page cache) and the rest is shared copy-on-write
+until touched. Where fork is unavailable, and when the pool is restarted
+after a worker crash (the app has threads by then, which fork does not
+mix well with), workers come from forkserver / spawn and the initializer
+loads the models in each of them instead.
+
+Calls pass a module-level function (pickled by name) plus the prompt, and
+get back the response as a JSON string, so a request costs one small
+pickle each way and one model_validate_json() in the parent.
+
+Sizing: settings.ANALYZE_PROCESS_WORKERS (0 = disabled, the in-process
+stage graph is used). Budget cores across uvicorn workers x pool workers.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from .config import settings
+
+
+class AnalysisPool:
+    def __init__(self, workers: int = settings.ANALYZE_PROCESS_WORKERS):
+        self._workers = workers
+        self._initializer: Optional[Callable[[], None]] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            "dispatched": 0,
+            "completed": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "restarts": 0,
+            "total_ms": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def start(self, initializer: Optional[Callable[[], None]] = None, workers: Optional[int] = None):
+        """
+        Fork the workers now (not lazily on first request), before the app
+        starts background threads. No-op when the pool is disabled.
+        """
+        if workers is not None:
+            self._workers = workers
+        if self._workers <= 0 or self.running:
+            return
+        self._initializer = initializer
+        with self._lock:
+            self._executor = self._spawn(allow_fork=True)
+        print(f"[ANALYSIS POOL] Started {self._workers} worker processes")
+
+    def _spawn(self, allow_fork: bool) -> ProcessPoolExecutor:
+        methods = multiprocessing.get_all_start_methods()
+        if allow_fork and "fork" in methods:
+            ctx = multiprocessing.get_context("fork")
+        else:
+            ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        executor = ProcessPoolExecutor(
+            max_workers=self._workers, mp_context=ctx, initializer=self._initializer
+        )
+        # ProcessPoolExecutor forks on demand; fill the pool up front
+        for f in [executor.submit(time.sleep, 0.05) for _ in range(self._workers)]:
+            f.result()
+        return executor
+
+    def stop(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is not broken:
+                return  # another request already replaced it
+            print("[ANALYSIS POOL] A worker died; restarting the pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            try:
+                self._executor = self._spawn(allow_fork=False)
+            except Exception as e:
+                # callers fall back to the in-process stage graph
+                self._executor = None
+                print(f"[ANALYSIS POOL] Restart failed, pool disabled: {e}")
+                return
+        self._bump("restarts")
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout_s: float) -> Any:
+        """
+        Run `fn(*args)` in a worker process. Raises asyncio.TimeoutError or
+        the worker's exception; a crashed worker (BrokenProcessPool) also
+        restarts the pool.
+        """
+        executor = self._executor
+        if executor is None:
+            raise RuntimeError("Analysis pool is not running")
+        loop = asyncio.get_running_loop()
+        t0 = time.perf_counter()
+        self._bump("dispatched")
+        try:
+            result = await asyncio.wait_for(
+                loop.run_in_executor(executor, fn, *args), timeout=timeout_s
+            )
+        except asyncio.TimeoutError:
+            self._bump("timeouts")
+            raise
+        except BrokenProcessPool:
+            self._bump("errors")
+            await loop.run_in_executor(None, self._restart, executor)
+            raise
+        except Exception:
+            self._bump("errors")
+            raise
+        with self._stats_lock:
+            self._stats["completed"] += 1
+            self._stats["total_ms"] += (time.perf_counter() - t0) * 1000.0
+        return result
+
+    def _bump(self, key: str):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update(
+            running=self.running,
+            workers=self._workers,
+            mean_ms=stats["total_ms"] / stats["completed"] if stats["completed"] else 0.0,
+        )
+        return stats
+
+
+analysis_pool = AnalysisPool()
+
+
+def shutdown_analysis_pool():
+    """Called from app.main shutdown event."""
+    analysis_pool.stop()
@@ -7,9 +7,140 @@ class Settings(BaseSettings):
     ENV: str = "development"
 
     # RAG / policy
-    POLICY_VECTOR_STORE_PATH: str = "ml_models/vector_store_faiss"
+    # Prebuilt TF-IDF index (scripts/build_policy_index.py), memory-mapped at startup
+    POLICY_VECTOR_STORE_PATH: str = "ml_models/policy_index"
     POLICY_CHUNKS_PATH: str = "policies/chunked_policies.json"
 
+    # Policy retrieval backend: "sparse" (exact TF-IDF), "dense" (FAISS ANN
+    # over local embeddings) or "hybrid" (both, fused). Dense artifacts are
+    # built by scripts/build_vector_store.py.
+    POLICY_RETRIEVAL_BACKEND: str = "sparse"
+    POLICY_DENSE_INDEX_PATH: str = "ml_models/vector_store_faiss"
+    EMBEDDING_MODEL_PATH: str = "ml_models/embeddings_model"
+    POLICY_DENSE_CANDIDATES: int = 100  # ANN hits fetched per query
+    POLICY_HYBRID_ALPHA: float = 0.5  # weight of the sparse score in hybrid mode
+
+    # Incremental policy ingestion (scripts/build_policy_chunks.py and the
+    # /admin/policies/documents API): only documents whose sha256 changed are
+    # re-chunked. Their chunks reuse the fitted TF-IDF vocabulary / idf until
+    # more than REFIT_RATIO of the index was appended since the last fit, or
+    # less than MIN_VOCAB_COVERAGE of their words are in the vocabulary (a
+    # new topic); removed chunks are tombstoned and compacted once they
+    # exceed COMPACT_RATIO of it.
+    POLICY_SOURCE_DIR: str = "policies/source"
+    POLICY_INGEST_MANIFEST_PATH: str = "policies/ingest_manifest.json"
+    POLICY_INGEST_REFIT_RATIO: float = 0.25
+    POLICY_INGEST_MIN_VOCAB_COVERAGE: float = 0.5
+    POLICY_INGEST_COMPACT_RATIO: float = 0.2
+    POLICY_UPLOAD_MAX_BYTES: int = 20 * 1024 * 1024
+    # Text extraction / chunking process pool (0 = one worker per CPU, 1 =
+    # in-process); PDFs are split into tasks of this many pages
+    POLICY_CHUNK_WORKERS: int = 0
+    POLICY_CHUNK_PAGES_PER_TASK: int = 8
+
+    # Safety classifier: "compiled" scores with the NumPy artifact exported by
+    # train_safety_classifier.py (falls back to the joblib pipeline when it
+    # is missing or was exported from another model), "sklearn" always uses
+    # the pipeline
+    SAFETY_CLASSIFIER_MODE: str = "compiled"
+
+    # Optional JSON overriding the built-in keyword / phrase lists
+    KEYWORD_LISTS_PATH: str = "policies/keyword_lists.json"
+
+    # POST /analyze/batch
+    ANALYZE_BATCH_MAX_ITEMS: int = 1000
+
+    # POST /analyze stage graph: classifier, RAG and detectors run
+    # concurrently on a dedicated pool. On timeout / error a fail-"open"
+    # stage falls back to an empty result, a fail-"closed" one blocks.
+    # 0 = one per CPU (+1, at most 8): stage threads share the GIL, so more
+    # threads than cores mostly adds event-loop lag
+    ANALYZE_STAGE_WORKERS: int = 0
+    ANALYZE_CLASSIFIER_TIMEOUT_MS: int = 2000
+    ANALYZE_CLASSIFIER_ON_FAILURE: str = "open"
+    ANALYZE_RAG_TIMEOUT_MS: int = 2000
+    ANALYZE_RAG_ON_FAILURE: str = "open"
+    ANALYZE_DETECTORS_TIMEOUT_MS: int = 5000
+    ANALYZE_DETECTORS_ON_FAILURE: str = "closed"
+
+    # Poll interval (seconds) of the watcher that hot-reloads the policy
+    # index / safety model when their files change; 0 = only reload via
+    # POST /api/admin/reload
+    MODEL_RELOAD_POLL_S: float = 0.0
+
+    # Per-request step timings (ms) in the Server-Timing header of POST
+    # /analyze; the same steps always feed the /api/metrics histograms
+    ANALYZE_SERVER_TIMING: bool = True
+
+    # Decision cascade: "cascade" checks the harmful-intent phrases first (a
+    # match skips the classifier and policy lookup), runs the detectors and
+    # classifier concurrently, and skips the policy lookup once their
+    # results settle the action (skips are listed in the explanation);
+    # "full" always runs every stage, e.g. when audits need complete scores
+    # and policy refs
+    ANALYZE_CASCADE_MODE: str = "cascade"
+    # A SAFE prediction at least this confident with no detections is ALLOW
+    # without a policy lookup
+    ANALYZE_CASCADE_SAFE_PROB: float = 0.8
+
+    # Worker processes for the CPU-bound analysis (0 = off: run the stage
+    # graph in-process). Each uvicorn worker gets its own pool.
+    ANALYZE_PROCESS_WORKERS: int = 0
+
+    # POST /analyze/stream: text is scanned in windows of STREAM_WINDOW_CHARS;
+    # the last STREAM_OVERLAP_CHARS of each window are rescanned with the
+    # next one so matches across chunk boundaries are found whole. A single
+    # token longer than STREAM_MAX_BUFFER_CHARS is cut there (bounds memory).
+    STREAM_WINDOW_CHARS: int = 64 * 1024
+    STREAM_OVERLAP_CHARS: int = 1024
+    STREAM_MAX_BUFFER_CHARS: int = 4 * 1024 * 1024
+    # Prefix of the original / redacted text kept in the audit entry
+    STREAM_AUDIT_PROMPT_CHARS: int = 4096
+
+    # Local model behind /complete: an OpenAI-compatible server (llama.cpp,
+    # vLLM, ...) serving /v1/chat/completions at LLM_BASE_URL; empty = the
+    # built-in echo stub
+    LLM_BASE_URL: str = ""
+    LLM_MODEL: str = "local"
+    LLM_MAX_TOKENS: int = 512
+    # Backend client: one keep-alive connection pool per process. At most
+    # LLM_MAX_IN_FLIGHT requests run at a time; up to LLM_MAX_QUEUED more wait
+    # for a slot (at most LLM_QUEUE_TIMEOUT_S), beyond that /complete answers
+    # 503. LLM_TIMEOUT_S bounds a whole answer, LLM_READ_TIMEOUT_S the wait
+    # for each token.
+    LLM_MAX_IN_FLIGHT: int = 4
+    LLM_MAX_QUEUED: int = 64
+    LLM_QUEUE_TIMEOUT_S: float = 30.0
+    LLM_CONNECT_TIMEOUT_S: float = 5.0
+    LLM_READ_TIMEOUT_S: float = 30.0
+    LLM_TIMEOUT_S: float = 120.0
+    LLM_KEEPALIVE_S: float = 60.0
+    # Outbound scanning of model answers: every finding is redacted; a secret
+    # also ends the answer where it starts ("cut") unless this is "redact"
+    COMPLETE_SECRET_ACTION: str = "cut"  # "cut" | "redact"
+
+    # Decision cache for repeated prompts (0 entries disables it)
+    DECISION_CACHE_MAX_ENTRIES: int = 10000
+    DECISION_CACHE_TTL_S: float = 600.0
+
+    # Audit log store: size/time-rotated segments + offset index
+    AUDIT_LOG_DIR: str = "data/audit"
+    AUDIT_SEGMENT_MAX_BYTES: int = 64 * 1024 * 1024
+    AUDIT_SEGMENT_MAX_AGE_S: int = 24 * 60 * 60
+
+    # Audit analytics: SQLite (WAL) with hourly rollups behind /admin/stats
+    AUDIT_ANALYTICS_ENABLED: bool = True
+    AUDIT_ANALYTICS_DB_PATH: str = "data/audit/analytics.db"
+
+    # Audit sink (background writer into the audit log store)
+    AUDIT_QUEUE_MAX_ENTRIES: int = 10000
+    AUDIT_BATCH_MAX_ENTRIES: int = 512
+    AUDIT_FLUSH_INTERVAL_MS: int = 200
+    AUDIT_FSYNC_POLICY: str = "interval"  # "always" | "interval" | "never"
+    AUDIT_FSYNC_INTERVAL_MS: int = 1000
+    AUDIT_QUEUE_FULL_POLICY: str = "block"  # "block" (up to the timeout) | "drop"
+    AUDIT_ENQUEUE_TIMEOUT_MS: int = 50
+
     # Risk thresholds
     RISK_LOW_THRESHOLD: int = 30
     RISK_HIGH_THRESHOLD: int = 70
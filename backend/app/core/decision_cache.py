@@ -0,0 +1,124 @@
+# backend/app/core/decision_cache.py
+
+"""
+Bounded LRU + TTL cache of analyze results, keyed by content.
+
+Many /analyze calls repeat a prompt verbatim (canned system prompts, retries,
+templated jobs). For those the classifier, detectors, RAG and response model
+construction are pure functions of (prompt, role, loaded policy index,
+loaded classifier), so the AnalyzeResponse can be reused. The caller still
+writes a fresh audit entry for every request.
+
+The key is a hash of the exact prompt and role. The prompt is not
+normalised any further: highlight spans, the sanitized prompt and
+original_prompt are all derived from the exact text, so two prompts that
+differ only in whitespace must not share a response.
+
+Invalidation is by version: every lookup passes the current versions of the
+policy index and classifier; when they change (reload, backend swap) the
+cache is emptied before answering.
+
+Cached responses are shared between requests and must be treated as
+read-only.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .config import settings
+
+
+class DecisionCache:
+    def __init__(
+        self,
+        max_entries: int = settings.DECISION_CACHE_MAX_ENTRIES,
+        ttl_s: float = settings.DECISION_CACHE_TTL_S,
+    ):
+        self._max_entries = max_entries
+        self._ttl = ttl_s
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+        self._version: Hashable = None
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    @staticmethod
+    def key(prompt: str, role: Optional[str]) -> bytes:
+        h = hashlib.blake2b(digest_size=16)
+        h.update((role or "").encode("utf-8"))
+        h.update(b"\0")
+        h.update(prompt.encode("utf-8", "surrogatepass"))
+        return h.digest()
+
+    def _check_version(self, version: Hashable):
+        """Called with the lock held."""
+        if version != self._version:
+            if self._entries:
+                self._stats["invalidations"] += 1
+                self._entries.clear()
+            self._version = version
+
+    def get(self, key: bytes, version: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(version)
+            item = self._entries.get(key)
+            if item is None:
+                self._stats["misses"] += 1
+                return None
+            expires, value = item
+            if expires <= now:
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def put(self, key: bytes, version: Hashable, value: Any):
+        if not self.enabled:
+            return
+        expires = time.monotonic() + self._ttl if self._ttl > 0 else float("inf")
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            if self._entries:
+                self._stats["invalidations"] += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats.update(
+            capacity=self._max_entries,
+            ttl_s=self._ttl,
+            hit_rate=stats["hits"] / lookups if lookups else 0.0,
+        )
+        return stats
+
+
+decision_cache = DecisionCache()
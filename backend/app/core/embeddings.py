@@ -0,0 +1,143 @@
+# backend/app/core/embeddings.py
+
+"""
+Local, CPU-only text embedding model used for dense policy retrieval.
+
+The model is a small LSA projection: hashed word uni/bi-grams (no
+vocabulary to store), sublinear TF x IDF, then a TruncatedSVD projection
+to `dim` dimensions and L2 normalisation, so inner product = cosine.
+It is fitted offline by scripts/build_vector_store.py and saved under
+settings.EMBEDDING_MODEL_PATH:
+
+    manifest.json     format version, model_id, n_features, ngram_range, dim
+    idf.npy           float32[n_features]
+    components.npy    float32[dim, n_features]   (memory-mapped at load)
+
+Anything with the same `encode(texts) -> float32[n, dim]` / `dim` /
+`model_id` surface can be used in its place by the dense backend.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+EMBEDDING_FORMAT_VERSION = 1
+
+
+class EmbeddingModel:
+    def __init__(
+        self,
+        idf: np.ndarray,
+        components: np.ndarray,
+        ngram_range=(1, 2),
+        model_id: str = "",
+    ):
+        self._idf = idf
+        self._components = components
+        self._ngram_range = tuple(ngram_range)
+        self._model_id = model_id
+        self._hasher = HashingVectorizer(
+            n_features=components.shape[1],
+            ngram_range=self._ngram_range,
+            stop_words="english",
+            alternate_sign=False,
+            norm=None,
+        )
+
+    @property
+    def dim(self) -> int:
+        return self._components.shape[0]
+
+    @property
+    def model_id(self) -> str:
+        return self._model_id
+
+    def _weighted_terms(self, texts: List[str]):
+        X = self._hasher.transform(texts).tocsr()
+        X.data = np.log1p(X.data)  # sublinear tf
+        X = X.multiply(self._idf).tocsr()
+        # float32 like the components; a float64 X would upcast the whole
+        # projection matrix on every call
+        return normalize(X).astype(np.float32)
+
+    def encode(self, texts: List[str], batch_size: int = 4096) -> np.ndarray:
+        """float32[len(texts), dim], rows L2-normalised (all-zero for empty text)."""
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            X = self._weighted_terms(texts[start : start + batch_size])
+            out[start : start + X.shape[0]] = X @ self._components.T
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+    # ---------- fit / save / load ----------
+
+    @classmethod
+    def fit(
+        cls,
+        texts: List[str],
+        dim: int = 128,
+        n_features: int = 2**15,
+        ngram_range=(1, 2),
+        seed: int = 0,
+    ) -> "EmbeddingModel":
+        hasher = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=tuple(ngram_range),
+            stop_words="english",
+            alternate_sign=False,
+            norm=None,
+        )
+        X = hasher.transform(texts).tocsr()
+        df = np.bincount(X.indices, minlength=n_features)
+        idf = (np.log((1 + X.shape[0]) / (1 + df)) + 1.0).astype(np.float32)
+
+        X.data = np.log1p(X.data)
+        X = normalize(X.multiply(idf).tocsr())
+
+        # SVD cannot produce more components than there are documents
+        n_components = max(1, min(dim, X.shape[0] - 1))
+        svd = TruncatedSVD(n_components=n_components, random_state=seed).fit(X)
+        components = svd.components_.astype(np.float32)
+
+        digest = hashlib.sha256(idf.tobytes())
+        digest.update(components.tobytes())
+        return cls(idf, components, ngram_range, model_id=digest.hexdigest()[:16])
+
+    def save(self, out_dir: Path) -> Dict[str, Any]:
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        np.save(out_dir / "idf.npy", np.asarray(self._idf, dtype=np.float32))
+        np.save(out_dir / "components.npy", np.asarray(self._components, dtype=np.float32))
+        manifest = {
+            "format_version": EMBEDDING_FORMAT_VERSION,
+            "model_id": self._model_id,
+            "n_features": int(self._components.shape[1]),
+            "ngram_range": list(self._ngram_range),
+            "dim": self.dim,
+        }
+        (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        return manifest
+
+    @classmethod
+    def load(cls, model_dir: Path) -> "EmbeddingModel":
+        model_dir = Path(model_dir)
+        manifest = json.loads((model_dir / "manifest.json").read_text(encoding="utf-8"))
+        if manifest.get("format_version") != EMBEDDING_FORMAT_VERSION:
+            raise ValueError(
+                f"Embedding model format {manifest.get('format_version')} is not supported "
+                f"(expected {EMBEDDING_FORMAT_VERSION})"
+            )
+        return cls(
+            np.load(model_dir / "idf.npy"),
+            np.load(model_dir / "components.npy", mmap_mode="r"),
+            manifest["ngram_range"],
+            model_id=manifest["model_id"],
+        )
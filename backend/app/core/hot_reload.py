@@ -0,0 +1,223 @@
+# backend/app/core/hot_reload.py
+
+"""
+Runtime reload of the policy index and the safety model.
+
+HotSwap is the module-level handle other modules import (policy_rag_store,
+safety_classifier). Attribute access is forwarded to the live instance,
+which starts out as an unloaded one. reload() creates a new instance and
+load()s it, off the event loop (admin endpoint thread or the watcher thread), and swaps it in with
+one reference assignment. A request that already started holds a bound
+method of the old instance and finishes on it; nothing is mutated in
+place. If the new instance fails to build or is not ready, the old one
+stays live and the error is reported in status().
+
+Dependent caches key on the components' version (see _cache_version in
+analyze.py); swap listeners additionally clear them right away. Analysis
+pool workers compare reload_epoch() with the one they last synced to and
+rebuild their own copies (see analyze_in_worker).
+
+update(build) swaps in build(live) the same way, for changes derived from
+the live instance instead of a full load (incremental policy ingestion,
+see policy/ingest.py).
+
+ReloadWatcher polls the components' source files (mtime + size) every
+settings.MODEL_RELOAD_POLL_S seconds and reloads a component once its
+files changed and then stayed unchanged for one more poll, so a
+half-written file is not picked up.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .config import settings
+
+
+_epoch_lock = threading.Lock()
+_epoch = 0  # successful swaps in this process
+
+
+def reload_epoch() -> int:
+    return _epoch
+
+
+class HotSwap:
+    def __init__(
+        self,
+        name: str,
+        create: Callable[[], Any],
+        describe: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    ):
+        """`create()` returns a new, not yet loaded instance (cheap)."""
+        self._hs_name = name
+        self._hs_create = create
+        self._hs_describe = describe
+        self._hs_live: Any = create()
+        self._hs_reload_lock = threading.Lock()
+        self._hs_listeners: List[Callable[[], None]] = []
+        self._hs_status: Dict[str, Any] = {
+            "loaded_at": None,
+            "load_ms": None,
+            "loads": 0,
+            "failed_loads": 0,
+            "last_error": None,
+        }
+
+    def __getattr__(self, attr: str) -> Any:
+        # only called for names HotSwap itself does not have
+        return getattr(self.__dict__["_hs_live"], attr)
+
+    @property
+    def live(self) -> Any:
+        return self._hs_live
+
+    def add_swap_listener(self, fn: Callable[[], None]):
+        """Called after every successful swap (e.g. to clear a cache)."""
+        self._hs_listeners.append(fn)
+
+    def reload(self) -> Dict[str, Any]:
+        """
+        Build a new instance and swap it in. Blocking: call it from a
+        worker thread. Concurrent calls run one after the other. Returns
+        status().
+        """
+
+        def build(live: Any) -> Any:
+            fresh = self._hs_create()
+            fresh.load()
+            if not fresh.is_ready and live.is_ready:
+                raise RuntimeError("new instance did not load; keeping the current one")
+            return fresh
+
+        return self.update(build, "reload")
+
+    def update(self, build: Callable[[Any], Any], what: str = "update") -> Dict[str, Any]:
+        """
+        Swap in `build(live)`, a new instance derived from the live one
+        (e.g. the policy store with a few documents added). Runs under the
+        same lock as reload(); if `build` raises, the live instance stays.
+        """
+        global _epoch
+        with self._hs_reload_lock:
+            t0 = time.perf_counter()
+            try:
+                fresh = build(self._hs_live)
+            except Exception as e:
+                self._hs_status["failed_loads"] += 1
+                self._hs_status["last_error"] = f"{type(e).__name__}: {e}"
+                print(f"[RELOAD] {self._hs_name} {what} failed: {self._hs_status['last_error']}")
+                return self.status()
+
+            self._hs_live = fresh
+            with _epoch_lock:
+                _epoch += 1
+            load_ms = (time.perf_counter() - t0) * 1000.0
+            self._hs_status.update(
+                loaded_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                load_ms=load_ms,
+                loads=self._hs_status["loads"] + 1,
+                last_error=None,
+            )
+            print(f"[RELOAD] {self._hs_name} version {fresh.version} live after {what} ({load_ms:.1f} ms)")
+        for fn in self._hs_listeners:
+            try:
+                fn()
+            except Exception as e:
+                print(f"[RELOAD] {self._hs_name} swap listener failed: {e}")
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        live = self._hs_live
+        status = dict(self._hs_status, name=self._hs_name, ready=live.is_ready, version=live.version)
+        if self._hs_describe is not None:
+            status.update(self._hs_describe(live))
+        return status
+
+
+def _fingerprint(paths: Sequence[Path]) -> Tuple:
+    prints = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            prints.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            prints.append(None)
+    return tuple(prints)
+
+
+class ReloadWatcher:
+    def __init__(self, poll_s: float = settings.MODEL_RELOAD_POLL_S):
+        self._poll_s = poll_s
+        self._watched: List[Dict[str, Any]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, handle: HotSwap, paths: Sequence[Path]):
+        """Watch `paths` for `handle` (replaces an earlier watch of the same handle)."""
+        paths = list(paths)
+        self._watched = [e for e in self._watched if e["handle"] is not handle]
+        self._watched.append({"handle": handle, "paths": paths, "seen": _fingerprint(paths), "pending": None})
+
+    def acknowledge(self, handle: HotSwap):
+        """
+        Take the current state of `handle`'s files as seen, e.g. after the
+        process wrote them itself and already swapped in the result.
+        """
+        for entry in self._watched:
+            if entry["handle"] is handle:
+                entry["seen"], entry["pending"] = _fingerprint(entry["paths"]), None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self._poll_s <= 0 or self.running or not self._watched:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reload-watcher", daemon=True)
+        self._thread.start()
+        print(f"[RELOAD] Watching model / policy files every {self._poll_s:g}s")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def poll(self):
+        """One check of every watched component (the thread calls this)."""
+        for entry in self._watched:
+            current = _fingerprint(entry["paths"])
+            if current == entry["seen"]:
+                entry["pending"] = None
+                continue
+            if current != entry["pending"]:
+                entry["pending"] = current  # changed; wait until it is stable
+                continue
+            entry["seen"], entry["pending"] = current, None
+            print(f"[RELOAD] Files of {entry['handle']._hs_name} changed; reloading")
+            entry["handle"].reload()
+
+    def _run(self):
+        while not self._stop.wait(self._poll_s):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"[RELOAD] Watcher error: {e}")
+
+
+reload_watcher = ReloadWatcher()
+
+
+def start_reload_watcher():
+    """Called from app.main startup, after the analysis pool has forked."""
+    reload_watcher.start()
+
+
+def shutdown_reload_watcher():
+    """Called from app.main shutdown event."""
+    reload_watcher.stop()
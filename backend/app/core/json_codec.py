@@ -0,0 +1,82 @@
+# backend/app/core/json_codec.py
+
+"""
+JSON encoding for the hot paths: API responses, the audit log (writer,
+reader and analytics) and the NDJSON events of POST /analyze/stream.
+
+dumps() / loads() use orjson when it is installed and the standard
+library otherwise. Both give the same compact UTF-8 output as pydantic's
+model_dump_json(): enums as their values (also as dict keys, e.g.
+detection_counts), naive datetimes in ISO format. A BaseModel inside the
+data is encoded field by field, which is only cheap for shallow models
+whose fields hold plain data (AuditLogEntry); typed response models go
+through pydantic's own serializer (model_json).
+
+ModelJSONResponse sends such bytes as they are. FastAPI's response_model
+path validates the returned model against the declared type again before
+serializing it; endpoints that already hold a typed model return this
+response instead, and keep response_model for the OpenAPI schema.
+"""
+
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Union
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+try:  # optional: ~2-3x faster than json / pydantic for dict-shaped data
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return dict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    def loads(data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+else:
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_default)
+
+    def dumps(obj: Any) -> bytes:
+        return _encoder.encode(obj).encode("utf-8")
+
+    def loads(data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+def model_json(model: BaseModel) -> bytes:
+    """model_dump_json() as bytes, without the str round trip."""
+    return model.__pydantic_serializer__.to_json(model)
+
+
+class ModelJSONResponse(Response):
+    """
+    JSON response for content that is already typed: a BaseModel (see
+    model_json), pre-encoded bytes, or anything dumps() takes.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, BaseModel):
+            return model_json(content)
+        return dumps(content)
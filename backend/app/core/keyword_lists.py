@@ -0,0 +1,197 @@
+# backend/app/core/keyword_lists.py
+
+"""
+Keyword / phrase lists used across the gateway.
+
+The built-in defaults below can be overridden per section by a JSON file at
+settings.KEYWORD_LISTS_PATH (relative to backend/). A section present in the
+file replaces the default section entirely, e.g.:
+
+{
+  "harmful_intent": {"hacking": ["hack into", "..."], "violence": ["..."]},
+  "policy_intents": [
+    {"name": "compensation", "triggers": ["salary"], "categories": ["COMPENSATION"],
+     "required_keywords": []}
+  ],
+  "secret_key_phrases": ["api key", "secret key", "access key"],
+  "chunk_categories": [{"category": "LEAVE_POLICY", "keywords": ["leave"]}]
+}
+
+All matching is case-insensitive substring matching (see PhraseMatcher).
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from .config import settings
+
+
+BASE_DIR = Path(__file__).resolve().parents[2]  # .../backend
+KEYWORD_LISTS_PATH = BASE_DIR / settings.KEYWORD_LISTS_PATH
+
+
+DEFAULT_KEYWORD_LISTS: Dict[str, Any] = {
+    # Rule-based harmful-intent check in /analyze (group -> phrases)
+    "harmful_intent": {
+        "hacking": [
+            "hack ", " hacking", "hack into", "hack the system", "hack the server",
+            "how to hack", "crack wifi", "crack password", "bruteforce", "brute force",
+            "keylogger", "malware", "ransomware", "rootkit", "backdoor",
+            "sql injection", "xss attack", "csrf attack", "ddos", "dos attack",
+            "bypass login", "bypass authentication", "steal data", "steal credentials",
+            "phishing email", "phishing attack",
+        ],
+        "violence": [
+            "kill someone", "kill him", "kill her", "how to kill",
+            "murder someone", "commit murder", "stab someone",
+            "shoot someone", "school shooting", "mass shooting",
+            "plant a bomb", "make a bomb", "bomb attack",
+            "terrorist attack", "join terrorist", "assassinate",
+            "poison someone", "poison her", "poison him",
+        ],
+    },
+    # Query intent -> preferred policy categories + keywords the policy text
+    # must contain (PolicyRAGStore). Order matters for category priority.
+    "policy_intents": [
+        {
+            # Resume / portfolio / company projects / external sharing of work
+            "name": "resume_portfolio",
+            "triggers": [
+                "resume", "cv", "portfolio", "company project", "project in resume",
+                "upload project", "put project in", "show work in resume",
+            ],
+            "categories": ["SECURITY_PRIVACY", "CONDUCT_ETHICS", "SOCIAL_MEDIA"],
+            "required_keywords": [
+                "confidential", "proprietary", "information security", "social media",
+                "public", "external", "blog", "website", "internet", "email", "post",
+                "publish", "share", "disclose",
+            ],
+        },
+        {
+            # Social media / online posting
+            "name": "social_media",
+            "triggers": [
+                "social media", "linkedin", "facebook", "twitter", "instagram",
+                "blog", "post on", "post to",
+            ],
+            "categories": ["SOCIAL_MEDIA", "SECURITY_PRIVACY", "CONDUCT_ETHICS"],
+            "required_keywords": [
+                "social media", "blog", "website", "post", "internet", "external",
+                "public", "email",
+            ],
+        },
+        {
+            # Salary words are usually enough, no extra keywords forced
+            "name": "compensation",
+            "triggers": ["salary", "ctc", "payroll", "pay day", "compensation", "bonus"],
+            "categories": ["COMPENSATION"],
+            "required_keywords": [],
+        },
+        {
+            "name": "leave",
+            "triggers": ["leave", "holiday", "vacation", "paid time off", "pto", "maternity"],
+            "categories": ["LEAVE_POLICY"],
+            "required_keywords": [],
+        },
+        {
+            "name": "workplace_safety",
+            "triggers": ["safety", "accident", "violence", "security", "drug", "alcohol"],
+            "categories": ["SAFETY_SECURITY"],
+            "required_keywords": [],
+        },
+        {
+            "name": "conduct",
+            "triggers": [
+                "behavior", "behaviour", "ethics", "code of conduct", "gift", "bribe",
+                "conflict of interest",
+            ],
+            "categories": ["CONDUCT_ETHICS"],
+            "required_keywords": [],
+        },
+    ],
+    # Phrases that usually precede a secret ("api key is ...")
+    "secret_key_phrases": ["api key", "secret key", "access key"],
+    # Rule-based category for policy chunks (scripts/build_policy_chunks.py);
+    # first category with a matching keyword wins.
+    "chunk_categories": [
+        {
+            "category": "SECURITY_PRIVACY",
+            "keywords": [
+                "information security", "proprietary information", "confidential information",
+                "social media policy", "use of electronic communication",
+                "email", "internet", "voicemail",
+            ],
+        },
+        {
+            "category": "FAIR_EMPLOYMENT",
+            "keywords": [
+                "harassment", "discrimination", "equal employment", "protected",
+                "sexual harassment",
+            ],
+        },
+        {
+            "category": "LEAVE_POLICY",
+            "keywords": [
+                "paid time off", "leave", "holidays", "attendance", "maternity",
+                "earned leaves",
+            ],
+        },
+        {
+            "category": "COMPENSATION",
+            "keywords": ["salary", "pay days", "ctc", "reimbursements", "payroll", "bonus"],
+        },
+        {
+            "category": "CONDUCT_ETHICS",
+            "keywords": [
+                "employee behavior", "personal conduct", "ethical business practice",
+                "professional appearance", "corrective action", "complaint resolution",
+            ],
+        },
+        {
+            "category": "SAFETY_SECURITY",
+            "keywords": [
+                "safety", "security", "drug and alcohol-free", "workplace violence",
+                "fire evacuation", "accident reporting",
+            ],
+        },
+    ],
+}
+
+
+def _valid_section(name: str, value: Any) -> bool:
+    expected = type(DEFAULT_KEYWORD_LISTS[name])
+    if not isinstance(value, expected):
+        print(f"[KEYWORDS] Section '{name}' must be a {expected.__name__}; using defaults")
+        return False
+    return True
+
+
+def load_keyword_lists(path: Path = KEYWORD_LISTS_PATH) -> Dict[str, Any]:
+    lists = dict(DEFAULT_KEYWORD_LISTS)
+
+    if not path.exists():
+        return lists
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        print(f"[KEYWORDS] Failed to read {path}: {e}; using defaults")
+        return lists
+
+    if not isinstance(data, dict):
+        print(f"[KEYWORDS] {path} must contain an object; using defaults")
+        return lists
+
+    for name, value in data.items():
+        if name not in DEFAULT_KEYWORD_LISTS:
+            print(f"[KEYWORDS] Ignoring unknown section '{name}' in {path}")
+            continue
+        if _valid_section(name, value):
+            lists[name] = value
+
+    print(f"[KEYWORDS] Loaded keyword lists from {path}")
+    return lists
+
+
+keyword_lists = load_keyword_lists()
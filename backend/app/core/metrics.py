@@ -0,0 +1,190 @@
+# backend/app/core/metrics.py
+
+"""
+In-process metrics in the Prometheus text exposition format (0.0.4),
+served by GET /api/metrics.
+
+Counters and histograms are updated on the request path: one dict lookup
+and a few additions under a per-metric lock (a histogram also bisects its
+buckets), about a microsecond per update, so they stay on in production.
+Values that components already track (decision cache, audit sink,
+analysis pool, stage runner) are not duplicated here; the metrics router
+reads their stats() at scrape time and renders them with format_family().
+
+Metrics are per process: with several uvicorn workers each one is scraped
+(or aggregated) separately, like any multi-process Prometheus target.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# seconds; /analyze stages range from tens of microseconds (cache lookup)
+# to seconds (multi-MB prompts)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (sample name, labels, value)
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_family(name: str, kind: str, help_text: str, samples: Iterable[Sample]) -> str:
+    """One metric family: HELP and TYPE lines followed by its samples."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for sample_name, labels, value in samples:
+        if labels:
+            label_str = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+            lines.append(f"{sample_name}{{{label_str}}} {_format_value(value)}")
+        else:
+            lines.append(f"{sample_name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> str:
+        with self._lock:
+            values = sorted(self._values.items())
+        return format_family(
+            self.name,
+            "counter",
+            self.help_text,
+            ((self.name, dict(zip(self.labelnames, labels)), v) for labels, v in values),
+        )
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, *labels: str):
+        i = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self._buckets) + 1), 0.0]
+            entry[0][i] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, *labels)
+
+    def render(self) -> str:
+        with self._lock:
+            values = sorted((labels, list(counts), total) for labels, (counts, total) in self._values.items())
+        samples: List[Sample] = []
+        for labels, counts, total in values:
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self._buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", dict(base, le=_format_value(bound)), cumulative))
+            samples.append((f"{self.name}_sum", base, total))
+            samples.append((f"{self.name}_count", base, cumulative))
+        return format_family(self.name, "histogram", self.help_text, samples)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List = []
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None,
+    ) -> Histogram:
+        metric = Histogram(name, help_text, labelnames, buckets or DEFAULT_BUCKETS)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "".join(metric.render() for metric in self._metrics)
+
+
+metrics = MetricsRegistry()
+
+# --- /analyze pipeline ---
+STAGE_SECONDS = metrics.histogram(
+    "sentinelguard_analyze_stage_seconds",
+    "Time per analyze pipeline stage (classifier, rag, detectors, decision, cache, audit, ...).",
+    ("stage",),
+)
+REQUEST_SECONDS = metrics.histogram(
+    "sentinelguard_request_seconds",
+    "End-to-end handler time per endpoint.",
+    ("endpoint",),
+)
+DECISIONS = metrics.counter(
+    "sentinelguard_decisions_total",
+    "Analyzed prompts by endpoint and decision action.",
+    ("endpoint", "action"),
+)
+DETECTIONS = metrics.counter(
+    "sentinelguard_detections_total",
+    "Findings in analyzed prompts by detection type.",
+    ("type",),
+)
+
+# --- local model backend (/complete) ---
+# seconds; a whole answer can take a minute
+LLM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+LLM_QUEUE_SECONDS = metrics.histogram(
+    "sentinelguard_llm_queue_wait_seconds",
+    "Time a completion waited for a free model backend slot.",
+    buckets=LLM_BUCKETS,
+)
+LLM_BACKEND_SECONDS = metrics.histogram(
+    "sentinelguard_llm_backend_seconds",
+    "Model backend latency from sending the request: to the first token, and to the end of the answer.",
+    ("phase",),
+    buckets=LLM_BUCKETS,
+)
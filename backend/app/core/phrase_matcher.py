@@ -0,0 +1,111 @@
+# backend/app/core/phrase_matcher.py
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Set
+
+
+class PhraseMatch(NamedTuple):
+    start: int
+    end: int
+    phrase: str
+    group: str
+
+
+_TERMINAL = ""  # trie key holding the groups of a phrase that ends here
+
+
+class PhraseMatcher:
+    """
+    Multi-phrase, case-insensitive substring matcher built once per list.
+
+    Phrases are stored in a trie. The trie is also rendered as one regex
+    (`(?:h(?:ack(?: |ing)|...)|k(?:ill ...))`), which sre scans in C and
+    can skip quickly over characters that no phrase starts with. At every
+    position where some phrase starts, the trie is walked to collect every
+    phrase (and group) that matches there, so overlapping phrases such as
+    "hack " / "hack the system" are all reported.
+
+    Cost is one pass over the text plus a short trie walk per hit, so it
+    stays roughly O(len(text)) as the phrase lists grow. Semantics are the
+    same as `phrase in text.lower()`; offsets index the lowercased text
+    (identical to the original for ASCII).
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self._trie: Dict[str, dict] = {}
+        self._groups: List[str] = list(groups)
+
+        for group, phrases in groups.items():
+            for phrase in phrases:
+                phrase = phrase.lower()
+                if not phrase:
+                    continue
+                node = self._trie
+                for ch in phrase:
+                    node = node.setdefault(ch, {})
+                node.setdefault(_TERMINAL, [])
+                if group not in node[_TERMINAL]:
+                    node[_TERMINAL].append(group)
+
+        self._start_regex = re.compile(self._render(self._trie)) if self._trie else None
+
+    @property
+    def groups(self) -> List[str]:
+        return self._groups
+
+    @property
+    def is_empty(self) -> bool:
+        return self._start_regex is None
+
+    def _render(self, node: dict) -> str:
+        # Only "does some phrase start here" matters for the regex, so a
+        # node that completes a phrase does not need its children.
+        if _TERMINAL in node:
+            return ""
+        branches = [re.escape(ch) + self._render(child) for ch, child in sorted(node.items())]
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    def find_all(self, text: str) -> List[PhraseMatch]:
+        """Every (possibly overlapping) phrase occurrence, in text order."""
+        if self._start_regex is None:
+            return []
+
+        lower = text.lower()
+        n = len(lower)
+        search = self._start_regex.search
+        trie = self._trie
+        matches: List[PhraseMatch] = []
+
+        pos = 0
+        while True:
+            m = search(lower, pos)
+            if m is None:
+                break
+            start = m.start()
+
+            node = trie
+            i = start
+            while i < n:
+                node = node.get(lower[i])
+                if node is None:
+                    break
+                i += 1
+                for group in node.get(_TERMINAL, ()):
+                    matches.append(PhraseMatch(start, i, lower[start:i], group))
+
+            pos = start + 1
+
+        return matches
+
+    def matched_groups(self, text: str) -> Set[str]:
+        return {m.group for m in self.find_all(text)}
+
+    def matched_phrases(self, text: str) -> Set[str]:
+        return {m.phrase for m in self.find_all(text)}
+
+    def contains_any(self, text: str) -> bool:
+        if self._start_regex is None:
+            return False
+        return self._start_regex.search(text.lower()) is not None
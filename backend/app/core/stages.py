@@ -0,0 +1,170 @@
+# backend/app/core/stages.py
+
+"""
+Async stage runner for the analyze pipeline.
+
+Each pipeline stage (classifier, RAG lookup, detectors, ...) is a plain
+blocking function. StageRunner.run() executes it on a dedicated, sized
+thread pool (settings.ANALYZE_STAGE_WORKERS), so the event loop only awaits
+and independent stages of one request can overlap via asyncio.gather().
+Overlap pays off where a stage spends its time in code that releases the
+GIL (NumPy / SciPy kernels); pure-Python and regex work still interleaves.
+
+Every stage has a timeout and a failure policy:
+
+  - "open":   on timeout / exception the stage's fallback value is used and
+              the request carries on (degraded results are not cached)
+  - "closed": StageFailed is raised and the caller blocks the request
+
+Stages the caller decides not to run (the analyze cascade) are counted
+with skip(), so stats() can report a skip rate per stage.
+
+A timed-out stage cannot be interrupted: its worker thread finishes the
+call in the background before it takes new work, which is why the pool is
+sized separately from FastAPI's default threadpool.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from .config import settings
+from .metrics import STAGE_SECONDS
+
+
+FAILURE_POLICIES = ("open", "closed")
+
+
+class StageSpec(NamedTuple):
+    name: str
+    timeout_ms: int
+    on_failure: str  # "open" | "closed"
+
+
+class StageResult(NamedTuple):
+    value: Any
+    error: Optional[str] = None  # set when a fail-open stage fell back
+    elapsed_ms: float = 0.0
+
+
+class StageFailed(Exception):
+    """A fail-closed stage timed out or raised."""
+
+    def __init__(self, stage: str, reason: str):
+        super().__init__(f"{stage} stage failed: {reason}")
+        self.stage = stage
+        self.reason = reason
+
+
+class StageRunner:
+    def __init__(self, max_workers: int = settings.ANALYZE_STAGE_WORKERS):
+        if max_workers <= 0:
+            max_workers = min(8, (os.cpu_count() or 1) + 1)
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers, thread_name_prefix="analyze-stage"
+                    )
+        return self._executor
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    async def call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn` on the stage pool without a timeout / failure policy."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(fn, *args))
+
+    async def run(
+        self, spec: StageSpec, fn: Callable[..., Any], *args: Any, fallback: Any = None
+    ) -> StageResult:
+        """
+        Run one stage under its timeout and failure policy. Raises
+        StageFailed for a failing "closed" stage.
+        """
+        loop = asyncio.get_running_loop()
+        t0 = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            value = await asyncio.wait_for(
+                loop.run_in_executor(self.executor, partial(fn, *args)),
+                timeout=spec.timeout_ms / 1000.0,
+            )
+        except asyncio.TimeoutError:
+            error = f"timed out after {spec.timeout_ms} ms"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        self._record(spec.name, elapsed_ms, error)
+
+        if error is None:
+            return StageResult(value, None, elapsed_ms)
+        print(f"[ANALYZE] {spec.name} stage {error} (fail-{spec.on_failure})")
+        if spec.on_failure == "closed":
+            raise StageFailed(spec.name, error)
+        return StageResult(fallback, error, elapsed_ms)
+
+    def _entry(self, name: str) -> Dict[str, Any]:
+        """Called with the stats lock held."""
+        return self._stats.setdefault(
+            name, {"calls": 0, "skipped": 0, "failures": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+
+    def skip(self, name: str, count: int = 1):
+        """Count a stage that was not run because the decision was already settled."""
+        with self._stats_lock:
+            self._entry(name)["skipped"] += count
+
+    def _record(self, name: str, elapsed_ms: float, error: Optional[str]):
+        STAGE_SECONDS.observe(elapsed_ms / 1000.0, name)
+        with self._stats_lock:
+            s = self._entry(name)
+            s["calls"] += 1
+            s["total_ms"] += elapsed_ms
+            s["max_ms"] = max(s["max_ms"], elapsed_ms)
+            if error is not None:
+                s["failures"] += 1
+                if error.startswith("timed out"):
+                    s["timeouts"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stages = {
+                name: dict(
+                    s,
+                    mean_ms=s["total_ms"] / s["calls"] if s["calls"] else 0.0,
+                    skip_rate=s["skipped"] / (s["calls"] + s["skipped"]) if s["skipped"] else 0.0,
+                )
+                for name, s in self._stats.items()
+            }
+        return {"workers": self._max_workers, "stages": stages}
+
+
+def stage_spec(name: str, timeout_ms: int, on_failure: str) -> StageSpec:
+    if on_failure not in FAILURE_POLICIES:
+        raise ValueError(f"{name} stage failure policy must be one of {FAILURE_POLICIES}")
+    return StageSpec(name, timeout_ms, on_failure)
+
+
+stage_runner = StageRunner()
+
+
+def shutdown_stage_runner():
+    """Called from app.main shutdown event."""
+    stage_runner.shutdown()
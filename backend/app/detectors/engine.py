@@ -0,0 +1,259 @@
+# backend/app/detectors/engine.py
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .utils import EMAIL_REGEX, PHONE_REGEX
+from .secret_detector import SECRET_PATTERNS, KEY_PHRASES, CONTEXT_WINDOW, CONTEXT_TOKEN_REGEX
+from .financial_detector import CURRENCY_REGEX
+from .findings import Finding
+from .secret_detector import KNOWN_PROVIDER_EXTRA
+from ..models.schemas import DetectionType, SeverityLevel
+
+
+class PatternSpec(NamedTuple):
+    """
+    One detector pattern compiled into the engine.
+
+    - detector: family the pattern belongs to ("pii", "secret", "financial").
+      Secret detections are de-duplicated by (start, end, type) like
+      `detect_secrets` does.
+    - context: the pattern is a key phrase ("api key"); the emitted span is
+      the first token-like sequence in the window that follows it.
+    - scan: optional equivalent rewrite of `regex` used inside the combined
+      alternation (see _SCAN_FORMS).
+
+    `extra` is shared by every Finding of the pattern and must not be mutated.
+    """
+
+    name: str
+    regex: re.Pattern
+    type: DetectionType
+    severity: SeverityLevel
+    detector: str
+    extra: Dict[str, Any]
+    context: bool = False
+    scan: Optional[str] = None
+
+
+# Equivalent forms of the patterns that start with `\b`.
+#
+# Inside an alternation sre can only skip a branch cheaply when it starts
+# with a literal or a character class, so a leading `\b` makes every branch
+# run at every position. These forms consume the first character and check
+# the boundary with a lookbehind instead; they match exactly the same spans.
+_SCAN_FORMS: Dict[str, str] = {
+    "PII_PHONE": (
+        r"\+(?<=\w\+)\d{1,3}[ -]?\d{10}\b"
+        r"|\d(?<!\w\d)(?:\d{0,2}[ -]?\d{10}|\d{9})\b"
+        r"|[ -](?<=\w[ -])\d{10}\b"
+    ),
+    "SECRET_API_KEY": r"s(?<!\ws)k_(?:live|test)_[0-9a-zA-Z]{8,}\b",
+    "SECRET_AWS_KEY": r"A(?<!\wA)KIA[0-9A-Z]{16}\b",
+    # SECRET_TOKEN_LONG is left as-is: its rewrite benchmarks slower.
+}
+
+
+def _case_insensitive(phrase: str) -> str:
+    # "[aA][pP][iI] [kK]..." is much cheaper for sre than (?i) inside a
+    # large alternation, and avoids building a lowercased copy of the text.
+    return "".join(
+        f"[{c.lower()}{c.upper()}]" if c.isalpha() else re.escape(c)
+        for c in phrase
+    )
+
+
+def default_pattern_specs() -> List[PatternSpec]:
+    """
+    All built-in detector patterns, in the same order the per-detector path
+    (`detect_pii`, `detect_secrets`, `detect_financial`) reports them.
+    """
+    specs: List[PatternSpec] = [
+        PatternSpec("PII_EMAIL", EMAIL_REGEX, DetectionType.PII_EMAIL, SeverityLevel.MEDIUM, "pii", {}),
+        PatternSpec(
+            "PII_PHONE", PHONE_REGEX, DetectionType.PII_PHONE, SeverityLevel.MEDIUM, "pii", {},
+            scan=_SCAN_FORMS["PII_PHONE"],
+        ),
+    ]
+
+    for phrase in KEY_PHRASES:
+        specs.append(
+            PatternSpec(
+                f"CONTEXT_{phrase.upper().replace(' ', '_')}",
+                re.compile(_case_insensitive(phrase)),
+                DetectionType.SECRET_API_KEY,
+                SeverityLevel.HIGH,
+                "secret",
+                {"pattern": "CONTEXT_API_KEY", "phrase": phrase},
+                context=True,
+            )
+        )
+
+    for pattern, det_type, name in SECRET_PATTERNS:
+        specs.append(
+            PatternSpec(
+                name, pattern, det_type, SeverityLevel.HIGH, "secret", KNOWN_PROVIDER_EXTRA,
+                scan=_SCAN_FORMS.get(name),
+            )
+        )
+
+    specs.append(
+        PatternSpec("FINANCIAL_CURRENCY", CURRENCY_REGEX, DetectionType.FINANCIAL_DATA, SeverityLevel.HIGH, "financial", {})
+    )
+    return specs
+
+
+class DetectorEngine:
+    """
+    Single-pass multi-pattern detector.
+
+    Every pattern is folded into one alternation at construction time, so a
+    prompt is scanned once instead of once per detector / key phrase.
+
+    A plain `finditer` over an alternation only reports the first pattern
+    that matches at a position and then jumps past it, while the
+    per-detector path reports overlapping hits from different detectors
+    (e.g. a Stripe key that is also a SECRET_TOKEN_LONG, or a phone number
+    inside an e-mail address). So the scan stops at every position where
+    some pattern matches, asks the remaining alternatives (a pre-compiled
+    suffix of the alternation) whether they match there too, and keeps a
+    `finditer`-style resume position per pattern so a pattern never reports
+    two overlapping matches of itself. The result is exactly what running
+    each pattern on its own would give.
+    """
+
+    def __init__(self, specs: List[PatternSpec]):
+        self._specs = specs
+
+        parts = [re.compile(spec.scan) if spec.scan else spec.regex for spec in specs]
+
+        # _chain[k] = (alternation of specs[k:], marker group -> spec index).
+        # Each alternative is followed by an empty marker group, so
+        # `match.lastindex` tells which pattern won without named groups.
+        self._chain: List[Tuple[re.Pattern, Dict[int, int]]] = []
+        for k in range(len(specs)):
+            alternatives: List[str] = []
+            marker_to_spec: Dict[int, int] = {}
+            group_count = 0
+            for i in range(k, len(specs)):
+                alternatives.append(f"(?:{parts[i].pattern})()")
+                group_count += parts[i].groups + 1
+                marker_to_spec[group_count] = i
+            self._chain.append((re.compile("|".join(alternatives)), marker_to_spec))
+
+    @property
+    def specs(self) -> List[PatternSpec]:
+        return self._specs
+
+    def _context_span(self, text: str, phrase_end: int) -> Optional[Tuple[int, int]]:
+        window_end = min(len(text), phrase_end + CONTEXT_WINDOW)
+        token = CONTEXT_TOKEN_REGEX.search(text, phrase_end, window_end)
+        if token is None:
+            return None
+        return token.start(), token.end()
+
+    def scan(self, text: str) -> List[List[Tuple[int, int]]]:
+        """
+        Scan `text` once and return raw (start, end) hits bucketed per spec.
+        For context specs the hit is the secret token, not the key phrase.
+        """
+        buckets: List[List[Tuple[int, int]]] = [[] for _ in self._specs]
+        self.scan_window(text, buckets, [0] * len(self._specs))
+        return buckets
+
+    def scan_window(
+        self,
+        text: str,
+        buckets: List[List[Tuple[int, int]]],
+        resume: List[int],
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> int:
+        """
+        Scan `text` from `start`, appending hits to `buckets` and updating
+        the per-spec `resume` positions in place, so consecutive calls on a
+        sliding window behave like one scan (see stream_scanner.py).
+
+        With stop=None `text` is complete. Otherwise it is a window of a
+        longer stream: only matches starting before `stop` are taken, and a
+        position whose match could still change once more text arrives
+        (the match runs to the end of the window, or a key phrase's context
+        window does) is left for the next call. Returns the position the
+        next call should start from.
+        """
+        specs = self._specs
+        chain = self._chain
+        n_specs = len(specs)
+        n = len(text)
+        partial = stop is not None
+        pending: List[Tuple[int, int]] = []
+
+        search, first_markers = chain[0][0].search, chain[0][1]
+        pos = start
+        while True:
+            m = search(text, pos)
+            if m is None:
+                return stop if partial else n
+            at = m.start()
+            if partial and at >= stop:
+                return stop
+            i = first_markers[m.lastindex]
+
+            pending.clear()
+            while True:
+                if resume[i] <= at:
+                    end = m.end()
+                    if partial and (end >= n or (specs[i].context and end + CONTEXT_WINDOW > n)):
+                        return at
+                    pending.append((i, end))
+
+                # alternatives before `i` already failed at this position
+                if i + 1 == n_specs:
+                    break
+                rest, rest_markers = chain[i + 1]
+                m = rest.match(text, at)
+                if m is None:
+                    break
+                i = rest_markers[m.lastindex]
+
+            for i, end in pending:
+                resume[i] = end
+                if specs[i].context:
+                    span = self._context_span(text, end)
+                    if span is not None:
+                        buckets[i].append(span)
+                else:
+                    buckets[i].append((at, end))
+
+            pos = at + 1
+
+    def detect(self, text: str) -> List[Finding]:
+        """
+        Run every detector over `text` in one pass.
+
+        Returns the same findings as detect_pii + detect_secrets +
+        detect_financial, in the same order.
+        """
+        buckets = self.scan(text)
+        detections: List[Finding] = []
+        seen_secrets = set()
+
+        for spec, hits in zip(self._specs, buckets):
+            for start, end in hits:
+                if spec.detector == "secret":
+                    key = (start, end, spec.type)
+                    if key in seen_secrets:
+                        continue
+                    seen_secrets.add(key)
+
+                detections.append(Finding(start, end, spec.type, spec.severity, spec.extra))
+
+        return detections
+
+
+detector_engine = DetectorEngine(default_pattern_specs())
+
+
+def run_detectors(text: str) -> List[Finding]:
+    """Helper for analyze.py: all built-in detectors, single pass."""
+    return detector_engine.detect(text)
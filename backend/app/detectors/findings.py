@@ -0,0 +1,80 @@
+# backend/app/detectors/findings.py
+
+"""
+Compact internal record for detector hits.
+
+Detectors, risk, rules and redaction all work on Finding records: a
+`__slots__` object with the span offsets, type, severity and the
+pattern's `extra` dict (shared between the findings of one pattern, never
+mutated). A secret-heavy log paste yields thousands of them per request,
+so they are not Pydantic models. The public Detection / TextSpan schema is
+built once, when the response is assembled (to_detections), with
+model_construct(): the detectors already guarantee the field types, so
+there is nothing to validate.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..models.schemas import Detection, DetectionType, SeverityLevel, TextSpan
+
+
+_NO_EXTRA: Dict[str, Any] = {}
+
+class Finding:
+    """
+    One detector hit: text[start:end] of the analyzed prompt. `text` is
+    only set when the prompt is not kept around (stream_scanner.py);
+    otherwise the matched text is sliced from the prompt on conversion.
+    """
+
+    __slots__ = ("start", "end", "type", "severity", "extra", "text")
+
+    def __init__(
+        self,
+        start: int,
+        end: int,
+        type: DetectionType,
+        severity: SeverityLevel,
+        extra: Dict[str, Any] = _NO_EXTRA,
+        text: Optional[str] = None,
+    ):
+        self.start = start
+        self.end = end
+        self.type = type
+        self.severity = severity
+        self.extra = extra
+        self.text = text
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return (self.start, self.end, self.type, self.severity, self.extra) == (
+            other.start, other.end, other.type, other.severity, other.extra
+        )
+
+    def __hash__(self) -> int:
+        # `extra` is a dict; equal findings still hash alike without it
+        return hash((self.start, self.end, self.type, self.severity))
+
+    def __repr__(self) -> str:
+        return f"Finding({self.start}, {self.end}, {self.type.value}, {self.severity.value})"
+
+
+def to_detection(finding: Finding, text: Optional[str] = None) -> Detection:
+    """Public Detection for `finding`; `text` is the prompt it was found in."""
+    matched = finding.text if finding.text is not None else text[finding.start:finding.end]
+    span = TextSpan.model_construct(start=finding.start, end=finding.end, text=matched)
+    return Detection.model_construct(
+        type=finding.type, severity=finding.severity, span=span, extra=dict(finding.extra)
+    )
+
+
+def to_detections(findings: Iterable[Finding], text: Optional[str] = None) -> List[Detection]:
+    return [to_detection(f, text) for f in findings]
+
+
+def count_types(findings: Iterable[Finding]) -> Dict[DetectionType, int]:
+    counts: Dict[DetectionType, int] = {}
+    for f in findings:
+        counts[f.type] = counts.get(f.type, 0) + 1
+    return counts
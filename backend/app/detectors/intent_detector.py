@@ -0,0 +1,16 @@
+from typing import List
+
+from ..core.keyword_lists import keyword_lists
+from ..core.phrase_matcher import PhraseMatch, PhraseMatcher
+
+
+# Built once at startup from the configured phrase groups ("hacking", "violence", ...)
+HARMFUL_INTENT_MATCHER = PhraseMatcher(keyword_lists["harmful_intent"])
+
+
+def detect_harmful_intent(text: str) -> List[PhraseMatch]:
+    """
+    Rule-based harmful-intent check: every matched phrase with its offsets
+    and group. Empty list means no harmful phrase was found.
+    """
+    return HARMFUL_INTENT_MATCHER.find_all(text)
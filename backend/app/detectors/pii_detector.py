@@ -1,10 +1,11 @@
 from typing import List
+from .findings import Finding
 from .utils import EMAIL_REGEX, PHONE_REGEX, find_spans
-from ..models.schemas import Detection, DetectionType, SeverityLevel
+from ..models.schemas import DetectionType, SeverityLevel
 
 
-def detect_pii(text: str) -> List[Detection]:
-    detections: List[Detection] = []
+def detect_pii(text: str) -> List[Finding]:
+    detections: List[Finding] = []
     # Emails
     detections.extend(find_spans(EMAIL_REGEX, text, DetectionType.PII_EMAIL, SeverityLevel.MEDIUM))
     # Phones
@@ -3,36 +3,38 @@
 import re
 from typing import List
 
-from ..models.schemas import Detection, TextSpan
+from .findings import Finding
+from ..core.keyword_lists import keyword_lists
+from ..models.schemas import DetectionType, SeverityLevel
 
 
-# Known provider-style secret patterns
+# Known provider-style secret patterns: (regex, detection type, pattern name)
 SECRET_PATTERNS = [
     # Stripe live/test keys
-    (re.compile(r"\bsk_(live|test)_[0-9a-zA-Z]{8,}\b"), "SECRET_API_KEY"),
+    (re.compile(r"\bsk_(live|test)_[0-9a-zA-Z]{8,}\b"), DetectionType.SECRET_API_KEY, "SECRET_API_KEY"),
     # AWS access key
-    (re.compile(r"\bAKIA[0-9A-Z]{16}\b"), "SECRET_AWS_KEY"),
+    (re.compile(r"\bAKIA[0-9A-Z]{16}\b"), DetectionType.SECRET_API_KEY, "SECRET_AWS_KEY"),
     # Generic long high-entropy token (24+ chars of base64-ish stuff)
-    (re.compile(r"\b[a-zA-Z0-9_\-]{24,}\b"), "SECRET_TOKEN_LONG"),
+    (re.compile(r"\b[a-zA-Z0-9_\-]{24,}\b"), DetectionType.SECRET_GENERIC, "SECRET_TOKEN_LONG"),
 ]
 
-# Key phrases that usually precede secrets
-KEY_PHRASES = [
-    "api key",
-    "secret key",
-    "access key",
-]
+# Key phrases that usually precede secrets (configurable, see core/keyword_lists.py)
+KEY_PHRASES = [p.lower() for p in keyword_lists["secret_key_phrases"]]
 
+# How far after a key phrase we look for the secret itself
+CONTEXT_WINDOW = 100
+# First "token-like" sequence (letters/digits/_/-) of length ≥ 6
+CONTEXT_TOKEN_REGEX = re.compile(r"([A-Za-z0-9_\-]{6,})")
 
-def _make_span(start: int, end: int, text: str) -> TextSpan:
-    return TextSpan(start=start, end=end, text=text[start:end])
+KNOWN_PROVIDER_EXTRA = {"pattern": "KNOWN_PROVIDER"}
 
 
-def _detect_context_secrets(text: str) -> List[Detection]:
-    detections: List[Detection] = []
+def _detect_context_secrets(text: str) -> List[Finding]:
+    detections: List[Finding] = []
     lower_text = text.lower()
 
     for phrase in KEY_PHRASES:
+        extra = {"pattern": "CONTEXT_API_KEY", "phrase": phrase}
         # Find all positions of the phrase in the text (case-insensitive)
         for match in re.finditer(re.escape(phrase), lower_text):
             phrase_start = match.start()
@@ -41,56 +43,41 @@ def _detect_context_secrets(text: str) -> List[Detection]:
             # Look ahead in a small window after the phrase
             # e.g. " is kk_123456", " : kk_123456", " kk_123456"
             window_start = phrase_end
-            window_end = min(len(text), window_start + 100)
+            window_end = min(len(text), window_start + CONTEXT_WINDOW)
             window_text = text[window_start:window_end]
 
             # Find the first "token-like" sequence (letters/digits/_/-) of length ≥ 6
-            token_match = re.search(r"([A-Za-z0-9_\-]{6,})", window_text)
+            token_match = CONTEXT_TOKEN_REGEX.search(window_text)
             if not token_match:
                 continue
 
             key_start = window_start + token_match.start()
             key_end = window_start + token_match.end()
 
-            span = _make_span(key_start, key_end, text)
             detections.append(
-                Detection(
-                    type="SECRET_API_KEY",
-                    severity="HIGH",
-                    span=span,
-                    details={
-                        "pattern": "CONTEXT_API_KEY",
-                        "phrase": phrase,
-                    },
-                )
+                Finding(key_start, key_end, DetectionType.SECRET_API_KEY, SeverityLevel.HIGH, extra)
             )
 
     return detections
 
 
-def detect_secrets(text: str) -> List[Detection]:
-    detections: List[Detection] = []
+def detect_secrets(text: str) -> List[Finding]:
+    detections: List[Finding] = []
 
     # A) Context-based secrets like "api key is kk_123456"
     detections.extend(_detect_context_secrets(text))
 
     # B) Known provider-style secret formats anywhere in text
-    for pattern, det_type in SECRET_PATTERNS:
+    for pattern, det_type, _name in SECRET_PATTERNS:
         for m in pattern.finditer(text):
-            span = _make_span(m.start(), m.end(), text)
             detections.append(
-                Detection(
-                    type=det_type,
-                    severity="HIGH",
-                    span=span,
-                    details={"pattern": "KNOWN_PROVIDER"},
-                )
+                Finding(m.start(), m.end(), det_type, SeverityLevel.HIGH, KNOWN_PROVIDER_EXTRA)
             )
 
     # Deduplicate by (start, end, type)
     unique = {}
     for d in detections:
-        key = (d.span.start, d.span.end, d.type)
+        key = (d.start, d.end, d.type)
         if key not in unique:
             unique[key] = d
 
@@ -0,0 +1,217 @@
+# backend/app/detectors/stream_scanner.py
+
+"""
+Incremental detection for text that arrives in chunks (large uploads,
+POST /analyze/stream), with bounded memory.
+
+The text is scanned in windows of about settings.STREAM_WINDOW_CHARS. Each
+window ends STREAM_OVERLAP_CHARS before the end of the buffered text:
+positions in that tail are scanned again with the next chunk, so a match
+that straddles a chunk boundary is found whole, and DetectorEngine's
+per-pattern resume positions carry over so nothing is reported twice. A
+match that runs to the end of the buffered text (a long token, or a key
+phrase whose context window is not complete yet) is held back until more
+text arrives. Spans are absolute offsets into the whole stream.
+
+Once a window is scanned, everything before its end is final: no later
+detection can start there. That prefix is handed back as `text` so the
+caller can redact and forward it, and only the tail is kept.
+
+Detections match DetectorEngine.detect() on the whole text (reported in
+position order per window instead of grouped per pattern) as long as the
+overlap is longer than any text that only becomes a match once more of
+it arrives. A match that runs to the end of the buffer, and a key phrase
+whose CONTEXT_WINDOW of lookahead is incomplete, are held back
+(scan_window), so the secret after a phrase may come well after the
+overlap. But a prefix that does not match yet ("api ke", "alice@corp")
+is final once it is STREAM_OVERLAP_CHARS from the end: with a shorter
+overlap than the key phrase or e-mail address it is missed, or found
+with a shorter span. The 1 KB default covers the key phrases and
+realistic addresses; word_hold derives its hold from the key phrases
+(see below).
+A single token longer than STREAM_MAX_BUFFER_CHARS is cut at that size and
+its remainder is scanned as a new token.
+
+word_hold=True is for text generated token by token (POST
+/complete/stream), where a 1 KB overlap would hold back hundreds of
+tokens. Instead of a fixed overlap, only the last word (it may still grow)
+and the characters a match can span before it stay unscanned: every
+pattern match is a single whitespace-free word, except key phrases ("api
+key", from the keyword lists) and the few that join two words with one
+separator ("+91 9812345678", "$ 100"). The hold covers the longest of
+those before its last word (_word_join_chars). Text is then final about
+a word after it arrives.
+"""
+
+from typing import List, NamedTuple, Optional, Set, Tuple
+
+from .engine import DetectorEngine, detector_engine
+from .findings import Finding
+from .intent_detector import HARMFUL_INTENT_MATCHER
+from ..core.config import settings
+from ..core.keyword_lists import keyword_lists
+from ..models.schemas import DetectionType
+
+
+# Characters kept before the scan position for lookbehinds / `\b`
+_LOOKBEHIND_CHARS = 8
+
+# Harmful-intent phrases are matched on each window plus this much of the
+# previous one, so a phrase split across windows is still seen
+_PHRASE_OVERLAP_CHARS = max(
+    (len(p) for phrases in keyword_lists["harmful_intent"].values() for p in phrases), default=0
+)
+
+
+# Longest first part of a phone number or amount before its separated
+# last word: "+999 " (PHONE_REGEX), "$ " (CURRENCY_REGEX)
+_SEPARATED_PREFIX_CHARS = 5
+
+
+def _word_join_chars(engine: DetectorEngine) -> int:
+    """Longest text a match can span before its last word ("secret " of "secret key")."""
+    phrases = [spec.extra["phrase"] for spec in engine.specs if spec.context]
+    return max([_SEPARATED_PREFIX_CHARS] + [len(p) - len(p.split()[-1]) for p in phrases if p.strip()])
+
+
+class StreamUpdate(NamedTuple):
+    detections: List[Finding]  # new findings, absolute spans, matched text set
+    offset: int  # where `text` starts in the stream
+    text: str  # newly finalised original text (nothing more will be found in it)
+
+
+class StreamScanner:
+    def __init__(
+        self,
+        engine: Optional[DetectorEngine] = None,
+        window_chars: int = settings.STREAM_WINDOW_CHARS,
+        overlap_chars: int = settings.STREAM_OVERLAP_CHARS,
+        max_buffer_chars: int = settings.STREAM_MAX_BUFFER_CHARS,
+        word_hold: bool = False,
+    ):
+        self._engine = engine or detector_engine
+        self._window = window_chars
+        self._overlap = overlap_chars
+        self._max_buffer = max(max_buffer_chars, window_chars + overlap_chars)
+
+        self._chunks: List[str] = []  # fed, not yet joined into _buf
+        self._chunk_chars = 0
+        self._buf = ""  # the stream from _base on
+        self._base = 0
+        self._pos = 0  # next scan position
+        self._emitted = 0  # text before this offset has been returned
+        self._resume = [0] * len(self._engine.specs)
+        self._seen_secrets: Set[Tuple[int, int, DetectionType]] = set()
+        self._phrase_pos = 0
+        self._harmful: List[str] = []
+        self._closed = False
+        self._word_hold = word_hold
+        self._word_join = _word_join_chars(self._engine)
+        self._word_start: Optional[int] = None  # start of the last word fed (word_hold)
+        self._in_word = False
+
+    @property
+    def chars(self) -> int:
+        """Characters fed so far."""
+        return self._base + len(self._buf) + self._chunk_chars
+
+    @property
+    def buffered_chars(self) -> int:
+        return len(self._buf) + self._chunk_chars
+
+    @property
+    def harmful_groups(self) -> List[str]:
+        """Harmful-intent phrase groups seen so far ("hacking", ...)."""
+        return list(self._harmful)
+
+    def feed(self, chunk: str) -> StreamUpdate:
+        if self._closed:
+            raise RuntimeError("StreamScanner.feed() after finish()")
+        if chunk:
+            if self._word_hold:
+                self._track_words(chunk)
+            self._chunks.append(chunk)
+            self._chunk_chars += len(chunk)
+        if self._hold_from() - self._pos < self._window:
+            return StreamUpdate([], self._emitted, "")
+        return self._advance(final=False)
+
+    def finish(self) -> StreamUpdate:
+        """End of input: scan the rest and return everything not returned yet."""
+        self._closed = True
+        return self._advance(final=True)
+
+    def _track_words(self, chunk: str):
+        stripped = chunk.rstrip()
+        if stripped:
+            last = stripped.rsplit(None, 1)[-1]
+            start = len(stripped) - len(last)
+            if start > 0 or not self._in_word:  # else the previous word goes on
+                self._word_start = self.chars + start
+        self._in_word = not chunk[-1].isspace()
+
+    def _hold_from(self) -> int:
+        """Stream offset from which text is not scanned yet (held back)."""
+        if not self._word_hold:
+            return self.chars - self._overlap
+        if self._word_start is None:
+            return self.chars
+        return max(self._pos, self._word_start - self._word_join)
+
+    def _advance(self, final: bool) -> StreamUpdate:
+        if self._chunks:
+            self._buf += "".join(self._chunks)
+            self._chunks.clear()
+            self._chunk_chars = 0
+        text, base = self._buf, self._base
+        engine = self._engine
+        specs = engine.specs
+
+        buckets: List[List[Tuple[int, int]]] = [[] for _ in specs]
+        resume = [r - base for r in self._resume]
+        stop = None if final else self._hold_from() - base
+        pos = engine.scan_window(text, buckets, resume, self._pos - base, stop)
+        cut = not final and len(text) - pos > self._max_buffer
+        if cut:
+            # held back by one huge token: cut it here rather than buffer without bound
+            pos = engine.scan_window(text, buckets, resume, pos)
+        self._resume = [r + base for r in resume]
+
+        detections: List[Finding] = []
+        for spec, hits in zip(specs, buckets):
+            for start, end in hits:
+                if spec.detector == "secret":
+                    key = (base + start, base + end, spec.type)
+                    if key in self._seen_secrets:
+                        continue
+                    self._seen_secrets.add(key)
+                detections.append(
+                    Finding(base + start, base + end, spec.type, spec.severity, spec.extra, text[start:end])
+                )
+        detections.sort(key=lambda d: d.start)
+
+        self._scan_phrases(text, base, pos)
+
+        # no later detection can start before `pos`
+        new_pos = base + pos
+        self._pos = new_pos
+        self._seen_secrets = {k for k in self._seen_secrets if k[0] >= new_pos}
+        offset = self._emitted
+        out = text[offset - base:pos]
+        self._emitted = new_pos
+
+        if cut:
+            # no lookbehind context: the rest of the token is matched as a token of its own
+            keep_from = pos
+        else:
+            keep_from = max(0, min(pos - _LOOKBEHIND_CHARS, self._phrase_pos - _PHRASE_OVERLAP_CHARS - base))
+        self._buf = text[keep_from:]
+        self._base = base + keep_from
+        return StreamUpdate(detections, offset, out)
+
+    def _scan_phrases(self, text: str, base: int, pos: int):
+        start = max(0, self._phrase_pos - _PHRASE_OVERLAP_CHARS - base)
+        for match in HARMFUL_INTENT_MATCHER.find_all(text[start:pos]):
+            if match.group not in self._harmful:
+                self._harmful.append(match.group)
+        self._phrase_pos = base + pos
@@ -0,0 +1,212 @@
+# backend/app/llm/backend_client.py
+
+"""
+Client for the local model server behind /complete (llama.cpp, vLLM, ...:
+anything serving OpenAI-compatible POST /v1/chat/completions).
+
+One httpx.AsyncClient per process: its connections are kept alive between
+requests, so a completion does not pay for a new TCP connection (or for
+building a client, ~30 ms). A local model serves a handful of generations
+at a time, so at most `max_in_flight` requests go to it at once; the next
+`max_queued` wait for a slot in arrival order, at most `queue_timeout_s`,
+and the rest are turned away (LLMBackendBusy, 503) instead of piling up
+on the backend.
+
+Timeouts per request: `connect_timeout_s`, `read_timeout_s` between two
+tokens and `timeout_s` for the whole answer. A caller that stops reading
+(client disconnect, answer cut by the outbound scan) closes the stream:
+the connection is dropped, which stops the generation on the server, and
+the slot is freed.
+
+Queue wait and backend latency (first token, whole answer) feed the
+/api/metrics histograms; request outcomes and the current in-flight /
+queued counts are in stats().
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from ..core.config import settings
+from ..core.json_codec import dumps, loads
+from ..core.metrics import LLM_BACKEND_SECONDS, LLM_QUEUE_SECONDS
+
+
+class LLMBackendError(Exception):
+    """The model backend could not be reached, failed or timed out."""
+
+
+class LLMBackendBusy(LLMBackendError):
+    """No backend slot: the queue is full or the wait for a slot timed out."""
+
+
+class LLMBackendClient:
+    def __init__(
+        self,
+        max_in_flight: int = settings.LLM_MAX_IN_FLIGHT,
+        max_queued: int = settings.LLM_MAX_QUEUED,
+        queue_timeout_s: float = settings.LLM_QUEUE_TIMEOUT_S,
+        connect_timeout_s: float = settings.LLM_CONNECT_TIMEOUT_S,
+        read_timeout_s: float = settings.LLM_READ_TIMEOUT_S,
+        timeout_s: float = settings.LLM_TIMEOUT_S,
+        keepalive_s: float = settings.LLM_KEEPALIVE_S,
+    ):
+        self._max_in_flight = max(1, max_in_flight)
+        self._max_queued = max(0, max_queued)
+        self._queue_timeout_s = queue_timeout_s
+        self._timeout = httpx.Timeout(read_timeout_s, connect=connect_timeout_s)
+        self._timeout_s = timeout_s
+        self._keepalive_s = keepalive_s
+        self._client: Optional[httpx.AsyncClient] = None
+        self._base_url = ""
+        self._slots = asyncio.Semaphore(self._max_in_flight)
+        self._in_flight = 0
+        self._queued = 0
+        self._queue_wait_s = 0.0  # over the requests that got a slot
+        self._admitted = 0
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "completed": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "rejected": 0,
+            "cancelled": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._client is not None
+
+    @property
+    def saturated(self) -> bool:
+        """A request made now would be turned away."""
+        return self._slots.locked() and self._queued >= self._max_queued
+
+    def start(self, base_url: Optional[str] = None):
+        if self.running:
+            return
+        self._base_url = (base_url if base_url is not None else settings.LLM_BASE_URL).rstrip("/")
+        limits = httpx.Limits(
+            max_connections=self._max_in_flight,
+            max_keepalive_connections=self._max_in_flight,
+            keepalive_expiry=self._keepalive_s,
+        )
+        self._client = httpx.AsyncClient(base_url=self._base_url, limits=limits, timeout=self._timeout)
+
+    async def stop(self):
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        t0 = time.perf_counter()
+        if not self._slots.locked():
+            await self._slots.acquire()  # free slot, no one waiting: returns at once
+        elif self._queued >= self._max_queued:
+            self._stats["rejected"] += 1
+            raise LLMBackendBusy(f"LLM backend busy: {self._in_flight} requests running, {self._queued} queued")
+        else:
+            self._queued += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self._queue_timeout_s)
+            except asyncio.TimeoutError:
+                self._stats["rejected"] += 1
+                raise LLMBackendBusy(f"LLM backend busy: no free slot within {self._queue_timeout_s:g} s") from None
+            finally:
+                self._queued -= 1
+        waited = time.perf_counter() - t0
+        LLM_QUEUE_SECONDS.observe(waited)
+        self._queue_wait_s += waited
+        self._admitted += 1
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+
+    async def stream_chat(self, prompt: str) -> AsyncIterator[str]:
+        """The answer to `prompt` from POST /v1/chat/completions, token by token."""
+        if not self.running:
+            self.start()
+        body = {
+            "model": settings.LLM_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": settings.LLM_MAX_TOKENS,
+            "stream": True,
+        }
+        self._stats["requests"] += 1
+        async with self._slot():
+            started = time.perf_counter()
+            deadline = started + self._timeout_s
+            first_token = True
+            try:
+                async with self._client.stream(
+                    "POST", "/v1/chat/completions", content=dumps(body), headers={"Content-Type": "application/json"}
+                ) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        raise LLMBackendError(f"LLM backend returned {response.status_code}: {response.text[:200]}")
+                    async for line in response.aiter_lines():
+                        if time.perf_counter() > deadline:
+                            raise httpx.ReadTimeout(f"no complete answer within {self._timeout_s:g} s")
+                        if not line.startswith("data:"):
+                            continue  # blank separators, comments, "event:" lines
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            continue  # read to the end, or the connection is not reused
+                        choices = loads(data).get("choices") or [{}]
+                        token = (choices[0].get("delta") or {}).get("content")
+                        if token:
+                            if first_token:
+                                LLM_BACKEND_SECONDS.observe(time.perf_counter() - started, "first_token")
+                                first_token = False
+                            yield token
+            except httpx.TimeoutException as e:
+                self._stats["timeouts"] += 1
+                raise LLMBackendError(f"LLM backend timed out: {str(e) or type(e).__name__}") from e
+            except httpx.HTTPError as e:
+                self._stats["errors"] += 1
+                raise LLMBackendError(f"LLM backend request failed: {type(e).__name__}: {e}") from e
+            except LLMBackendError:
+                self._stats["errors"] += 1
+                raise
+            except (asyncio.CancelledError, GeneratorExit):
+                self._stats["cancelled"] += 1
+                raise
+            LLM_BACKEND_SECONDS.observe(time.perf_counter() - started, "total")
+            self._stats["completed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self._stats)
+        stats.update(
+            running=self.running,
+            in_flight=self._in_flight,
+            queued=self._queued,
+            max_in_flight=self._max_in_flight,
+            max_queued=self._max_queued,
+            mean_queue_wait_ms=self._queue_wait_s * 1000.0 / self._admitted if self._admitted else 0.0,
+        )
+        return stats
+
+
+llm_client = LLMBackendClient()
+
+
+def init_llm_client():
+    """Called from app.main startup: opens the connection pool when a backend is configured."""
+    if settings.LLM_BASE_URL:
+        llm_client.start()
+        print(
+            f"[LLM CLIENT] {settings.LLM_BASE_URL}: up to {settings.LLM_MAX_IN_FLIGHT} requests in flight, "
+            f"{settings.LLM_MAX_QUEUED} queued"
+        )
+
+
+async def shutdown_llm_client():
+    """Called from app.main shutdown event."""
+    await llm_client.stop()
@@ -1,7 +1,37 @@
+# backend/app/llm/local_llm.py
+
+"""
+Model answers for /complete.
+
+With settings.LLM_BASE_URL set, the answer is streamed from a local
+OpenAI-compatible server (llama.cpp, vLLM, ...) through the shared,
+concurrency-limited client in backend_client.py. Without it, the Phase 1
+stub answers by echoing the prompt.
+"""
+
+import re
+from typing import AsyncIterator
+
+from ..core.config import settings
+from .backend_client import llm_client
+
+
+_STUB_TOKEN = re.compile(r"\s*\S+")
+
+
 def generate_response(prompt: str) -> str:
     """
     Phase 1: no real LLM.
     Simply echo the prompt with a dummy message.
-    Later, you can plug a local model here.
     """
     return f"[DUMMY LLM ANSWER] Based on your sanitized prompt: {prompt[:200]}..."
+
+
+async def stream_response(prompt: str) -> AsyncIterator[str]:
+    """The answer to `prompt`, token by token as the backend produces it."""
+    if not settings.LLM_BASE_URL:
+        for token in _STUB_TOKEN.findall(generate_response(prompt)):
+            yield token
+        return
+    async for token in llm_client.stream_chat(prompt):
+        yield token
@@ -0,0 +1,101 @@
+# backend/app/llm/outbound.py
+
+"""
+Outbound scanning of model answers, token by token.
+
+OutboundScan runs the detectors over the answer as it is generated
+(StreamScanner with word_hold, so a token is released about a word after
+it arrives, and a match split across tokens is still found whole) and
+returns the redacted text that may be forwarded. Every finding is
+redacted; with settings.COMPLETE_SECRET_ACTION == "cut" a secret also ends
+the answer where it starts, and nothing after it is released.
+"""
+
+from typing import Dict, List, Optional
+
+from ..core.config import settings
+from ..detectors.findings import Finding
+from ..detectors.stream_scanner import StreamScanner, StreamUpdate
+from ..models.schemas import Decision, DecisionAction, DetectionType, RiskLevel
+from ..policy.rule_engine import evaluate_rules
+from ..risk.confidence_engine import compute_confidence
+from ..risk.risk_engine import compute_risk
+from ..sanitize.redact import StreamRedactor
+
+
+SECRET_TYPES = frozenset((DetectionType.SECRET_API_KEY, DetectionType.SECRET_GENERIC))
+
+# Findings kept per type for the decision (see _STREAM_SAMPLE_PER_TYPE in api/analyze.py)
+_SAMPLE_PER_TYPE = 32
+
+
+class OutboundScan:
+    """State of one answer: scanner, redactor, finding counts and the cut position."""
+
+    def __init__(self, secret_action: Optional[str] = None):
+        self.scanner = StreamScanner(window_chars=1, overlap_chars=0, word_hold=True)
+        self.redactor = StreamRedactor()
+        self.cut_secrets = (secret_action or settings.COMPLETE_SECRET_ACTION) == "cut"
+        self.counts: Dict[DetectionType, int] = {}
+        self.sample: List[Finding] = []
+        self.cut_at: Optional[int] = None  # stream offset of the secret that ended the answer
+
+    @property
+    def cut(self) -> bool:
+        return self.cut_at is not None
+
+    def feed(self, token: str) -> str:
+        """Redacted text that can be forwarded now (often "": held back)."""
+        if self.cut:
+            return ""
+        return self._release(self.scanner.feed(token))
+
+    def finish(self) -> str:
+        """End of the answer: the rest of the redacted text."""
+        if self.cut:
+            return ""
+        return self._release(self.scanner.finish())
+
+    def _release(self, update: StreamUpdate) -> str:
+        text = update.text
+        for d in update.detections:
+            n = self.counts.get(d.type, 0)
+            self.counts[d.type] = n + 1
+            if n < _SAMPLE_PER_TYPE:
+                self.sample.append(d)
+            if self.cut_secrets and self.cut_at is None and d.type in SECRET_TYPES:
+                self.cut_at = d.start
+        self.redactor.add(update.detections)
+        if self.cut_at is not None:
+            text = text[:self.cut_at - update.offset]
+        return self.redactor.push(update.offset, text) if text else ""
+
+    def decision(self) -> Decision:
+        """Outbound decision over the answer so far: detectors and rules."""
+        total = sum(self.counts.values())
+        harmful_groups = self.scanner.harmful_groups
+        risk = compute_risk(self.sample)
+        risk.explanation = f"Computed risk score {risk.score} based on {total} detections in the answer."
+        action, policy_refs = evaluate_rules(self.sample, risk)
+        if harmful_groups:
+            risk.score = 100
+            risk.level = RiskLevel.HIGH
+            action = DecisionAction.BLOCK
+        confidence = compute_confidence(self.sample, policy_match_strength=0.0, model_confidence_raw=0.85)
+
+        notes = ""
+        if self.cut:
+            notes += f" Answer cut at a secret (character {self.cut_at})."
+        if harmful_groups:
+            notes += " Harmful or illegal intent detected in the answer."
+        return Decision(
+            action=action,
+            risk=risk,
+            confidence=confidence,
+            policy_refs=policy_refs,
+            explanation=(
+                f"Action: {action.value}. Risk {risk.score} ({risk.level.value}). "
+                f"Confidence {confidence.score}%. Outbound scan: detectors and rules only; "
+                f"{total} findings redacted.{notes}"
+            ),
+        )
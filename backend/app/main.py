@@ -4,9 +4,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import settings
-from .api import analyze, complete, health, admin, compliance
+from .api import analyze, complete, health, admin, admin_policies, compliance, metrics
+from .api.analyze import init_analysis_pool
 from .policy.rag_store import init_policy_rag
+from .audit.audit_logger import init_audit_sink, shutdown_audit_sink
 from .ml.safety_classifier import init_safety_classifier
+from .core.analysis_pool import shutdown_analysis_pool
+from .core.stages import shutdown_stage_runner
+from .core.hot_reload import shutdown_reload_watcher, start_reload_watcher
+from .llm.backend_client import init_llm_client, shutdown_llm_client
 
 
 def create_app() -> FastAPI:
@@ -32,13 +38,31 @@ def create_app() -> FastAPI:
         # Load policy RAG index + safety classifier at startup
         init_policy_rag()
         init_safety_classifier()
+        # fork analysis workers while the process has loaded models and no
+        # background threads yet (the audit sink starts one)
+        init_analysis_pool()
+        init_audit_sink()
+        init_llm_client()
+        # picks up re-chunked policies / retrained models without a restart
+        start_reload_watcher()
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        shutdown_reload_watcher()
+        # Flush queued audit entries before the worker exits
+        shutdown_audit_sink()
+        shutdown_stage_runner()
+        shutdown_analysis_pool()
+        await shutdown_llm_client()
 
     # Routers
     app.include_router(health.router, prefix=settings.API_V1_PREFIX)
     app.include_router(analyze.router, prefix=settings.API_V1_PREFIX)
     app.include_router(complete.router, prefix=settings.API_V1_PREFIX)
     app.include_router(admin.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(admin_policies.router, prefix=settings.API_V1_PREFIX)
     app.include_router(compliance.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(metrics.router, prefix=settings.API_V1_PREFIX)
 
     return app
 
@@ -0,0 +1,261 @@
+# backend/app/ml/compiled_classifier.py
+
+"""
+Inference-only form of the TF-IDF + LogisticRegression safety pipeline.
+
+Exported by train_safety_classifier.py next to the joblib pipeline and used
+by SafetyClassifier in "compiled" mode. Scoring a prompt is: one regex
+findall, a dict lookup per word and word pair, and a handful of NumPy ops
+on the few columns that occur (counts x idf, l2 norm, gather of
+coefficient rows, softmax). No sklearn objects, input validation or sparse-matrix
+construction per call, and loading is np.load + json instead of
+unpickling the pipeline.
+
+Layout of the artifact directory (format version 1):
+
+    manifest.json      format version, source joblib + sha256, classes,
+                       tokenizer settings (pattern, lowercase, ngram range)
+    vocabulary.json    terms in column order (term -> column is the index)
+    stop_words.json    stop words removed before n-grams are formed
+    idf.npy            float64[n_terms]
+    coef.npy           float64[n_terms, n_classes] (transposed, so the rows
+                       for a prompt's terms are one gather)
+    intercept.npy      float64[n_classes]
+
+Arrays are opened with mmap_mode="r", like the policy index.
+
+Probabilities match Pipeline.predict_proba up to float rounding in the
+final dot product; export() checks that on sample texts.
+"""
+
+import json
+import os
+import re
+import shutil
+import time
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..policy.policy_index import file_sha256
+
+
+COMPILED_FORMAT_VERSION = 1
+
+_ARRAYS = ["idf", "coef", "intercept"]
+
+# Equivalent, cheaper forms of common token patterns (same tokens). For
+# sklearn's default, `\w\w+` is greedy, so every match is already a whole
+# run of word characters and the `\b` checks are redundant.
+_FAST_TOKEN_PATTERNS: Dict[str, str] = {
+    r"(?u)\b\w\w+\b": r"(?u)\w\w+",
+}
+
+
+class CompiledClassifier:
+    def __init__(
+        self,
+        manifest: Dict[str, Any],
+        vocabulary: List[str],
+        stop_words: List[str],
+        idf: np.ndarray,
+        coef: np.ndarray,
+        intercept: np.ndarray,
+    ):
+        self.manifest = manifest
+        self.classes_ = np.asarray(manifest["classes"], dtype=object)
+        self._columns: Dict[str, int] = {term: col for col, term in enumerate(vocabulary)}
+        # bigrams as first word -> second word -> column: most adjacent word
+        # pairs are rejected on the first word without building "a b"
+        self._bigrams: Dict[str, Dict[str, int]] = {}
+        for col, term in enumerate(vocabulary):
+            if term.count(" ") == 1:
+                first, second = term.split(" ")
+                self._bigrams.setdefault(first, {})[second] = col
+        self._stop_words = frozenset(stop_words)
+        pattern = manifest["token_pattern"]
+        self._token_re = re.compile(_FAST_TOKEN_PATTERNS.get(pattern, pattern))
+        self._lowercase = manifest["lowercase"]
+        self._min_n, self._max_n = manifest["ngram_range"]
+        self._binary = manifest["binary"]
+        self._idf = idf
+        self._coef = coef
+        self._intercept = intercept
+
+    # --- building ---
+
+    @classmethod
+    def from_pipeline(cls, pipeline, source_path: Optional[Path] = None) -> "CompiledClassifier":
+        """
+        Compile a fitted Pipeline([("tfidf", TfidfVectorizer), ("logreg", LogisticRegression)]).
+        Raises ValueError for settings the fast path does not reproduce.
+        """
+        tfidf, logreg = pipeline.steps[0][1], pipeline.steps[-1][1]
+        if len(pipeline.steps) != 2:
+            raise ValueError("Expected a TF-IDF + LogisticRegression pipeline")
+        unsupported = {
+            "analyzer": tfidf.analyzer != "word",
+            "preprocessor / tokenizer": tfidf.preprocessor is not None or tfidf.tokenizer is not None,
+            "strip_accents": tfidf.strip_accents is not None,
+            "binary": tfidf.binary,
+            "sublinear_tf": tfidf.sublinear_tf,
+            "use_idf=False": not tfidf.use_idf,
+            "norm": tfidf.norm != "l2",
+            "multi_class='ovr'": getattr(logreg, "multi_class", "auto") == "ovr" and len(logreg.classes_) > 2,
+        }
+        bad = [name for name, flag in unsupported.items() if flag]
+        if bad:
+            raise ValueError(f"Cannot compile pipeline with: {', '.join(bad)}")
+
+        vocabulary = [""] * len(tfidf.vocabulary_)
+        for term, col in tfidf.vocabulary_.items():
+            vocabulary[col] = term
+        stop_words = sorted(tfidf.get_stop_words() or [])
+
+        manifest = {
+            "format_version": COMPILED_FORMAT_VERSION,
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "source": source_path.name if source_path else None,
+            "source_sha256": file_sha256(source_path) if source_path and source_path.exists() else None,
+            "classes": [str(c) for c in logreg.classes_],
+            "n_terms": len(vocabulary),
+            "token_pattern": tfidf.token_pattern,
+            "lowercase": bool(tfidf.lowercase),
+            "ngram_range": list(tfidf.ngram_range),
+            "binary": len(logreg.classes_) == 2,
+        }
+        return cls(
+            manifest,
+            vocabulary,
+            stop_words,
+            np.asarray(tfidf.idf_, dtype=np.float64),
+            np.ascontiguousarray(logreg.coef_.T, dtype=np.float64),
+            np.asarray(logreg.intercept_, dtype=np.float64),
+        )
+
+    def save(self, out_dir: Path):
+        """Write into a temp sibling directory, then swap it in (see write_policy_index)."""
+        out_dir = Path(out_dir)
+        out_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = out_dir.with_name(f"{out_dir.name}.tmp-{os.getpid()}")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir()
+
+        vocabulary = [""] * len(self._columns)
+        for term, col in self._columns.items():
+            vocabulary[col] = term
+        for name in _ARRAYS:
+            np.save(tmp_dir / f"{name}.npy", np.asarray(getattr(self, f"_{name}")))
+        (tmp_dir / "vocabulary.json").write_text(json.dumps(vocabulary, ensure_ascii=False), encoding="utf-8")
+        (tmp_dir / "stop_words.json").write_text(json.dumps(sorted(self._stop_words)), encoding="utf-8")
+        (tmp_dir / "manifest.json").write_text(json.dumps(self.manifest, indent=2), encoding="utf-8")
+
+        old_dir = out_dir.with_name(f"{out_dir.name}.old-{os.getpid()}")
+        if out_dir.exists():
+            os.replace(out_dir, old_dir)
+        os.replace(tmp_dir, out_dir)
+        if old_dir.exists():
+            shutil.rmtree(old_dir)
+
+    @classmethod
+    def load(cls, model_dir: Path) -> Optional["CompiledClassifier"]:
+        """Memory-map an artifact written by save(), or None if unusable."""
+        model_dir = Path(model_dir)
+        manifest_path = model_dir / "manifest.json"
+        if not manifest_path.exists():
+            return None
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("format_version") != COMPILED_FORMAT_VERSION:
+                print(
+                    f"[SAFETY CLASSIFIER] Compiled model format {manifest.get('format_version')} "
+                    f"at {model_dir} is not supported (expected {COMPILED_FORMAT_VERSION}); re-export it"
+                )
+                return None
+            vocabulary = json.loads((model_dir / "vocabulary.json").read_text(encoding="utf-8"))
+            stop_words = json.loads((model_dir / "stop_words.json").read_text(encoding="utf-8"))
+            arrays = {name: np.load(model_dir / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+        except (OSError, ValueError) as e:
+            print(f"[SAFETY CLASSIFIER] Could not read compiled model at {model_dir}: {e}")
+            return None
+        return cls(manifest, vocabulary, stop_words, **arrays)
+
+    # --- scoring ---
+
+    def _columns_of(self, text: str) -> List[int]:
+        """
+        Vocabulary columns of the text's n-grams, as TfidfVectorizer's
+        analyzer builds them (order does not matter, they are counted).
+        """
+        if self._lowercase:
+            text = text.lower()
+        stop = self._stop_words
+        tokens = [t for t in self._token_re.findall(text) if t not in stop]
+        columns = self._columns
+
+        cols: List[int] = []
+        if self._min_n == 1:
+            cols = [columns[t] for t in tokens if t in columns]
+        if self._min_n <= 2 <= self._max_n:
+            bigrams = self._bigrams.get
+            for first, second in zip(tokens, tokens[1:]):
+                seconds = bigrams(first)
+                if seconds is not None:
+                    col = seconds.get(second)
+                    if col is not None:
+                        cols.append(col)
+        for n in range(max(3, self._min_n), self._max_n + 1):
+            grams = map(" ".join, zip(*(tokens[k:] for k in range(n))))
+            cols.extend(columns[g] for g in grams if g in columns)
+        return cols
+
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        The whole batch at once: (row, column) pairs of every n-gram are
+        counted with one np.unique, then tf-idf, row l2 norms and the
+        coefficient sums are computed over those pairs in column order.
+        """
+        n_rows, n_terms = len(texts), len(self._idf)
+        per_text = [self._columns_of(text) for text in texts]
+        lengths = np.fromiter(map(len, per_text), dtype=np.intp, count=n_rows)
+        flat = np.fromiter(chain.from_iterable(per_text), dtype=np.intp, count=int(lengths.sum()))
+
+        keys, counts = np.unique(np.repeat(np.arange(n_rows), lengths) * n_terms + flat, return_counts=True)
+        rows, cols = np.divmod(keys, n_terms)
+
+        scores = np.tile(np.asarray(self._intercept, dtype=np.float64), (n_rows, 1))
+        if keys.size:
+            vals = counts * self._idf[cols]
+            vals /= np.sqrt(np.bincount(rows, weights=vals * vals, minlength=n_rows))[rows]
+            starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+            scores[rows[starts]] += np.add.reduceat(vals[:, None] * self._coef[cols], starts, axis=0)
+        return scores
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        scores = self.decision_function(texts)
+        if self._binary:
+            p = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            return np.column_stack([1.0 - p, p])
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+
+def export(pipeline, out_dir: Path, source_path: Optional[Path] = None, check_texts: Sequence[str] = ()) -> CompiledClassifier:
+    """
+    Compile `pipeline`, check it against the pipeline on `check_texts`
+    (ValueError if any probability differs by more than 1e-9) and save it.
+    """
+    compiled = CompiledClassifier.from_pipeline(pipeline, source_path)
+    texts = list(check_texts)
+    if texts:
+        diff = float(np.abs(compiled.predict_proba(texts) - pipeline.predict_proba(texts)).max())
+        if diff > 1e-9:
+            raise ValueError(f"Compiled classifier differs from the pipeline by {diff:.3g}")
+        print(f"[SAFETY TRAIN] Compiled model matches the pipeline on {len(texts)} texts (max diff {diff:.1e})")
+    compiled.save(out_dir)
+    return compiled
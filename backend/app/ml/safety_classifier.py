@@ -1,13 +1,23 @@
 # backend/app/ml/safety_classifier.py
 
+from itertools import count
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import joblib
 
+from .compiled_classifier import CompiledClassifier
+from ..core.config import settings
+from ..core.hot_reload import HotSwap, reload_watcher
+from ..policy.policy_index import file_sha256
+
 # .../backend/app
 BASE_DIR = Path(__file__).resolve().parents[1]
 MODEL_PATH = BASE_DIR / "ml" / "models" / "safety_classifier.joblib"
+COMPILED_MODEL_PATH = BASE_DIR / "ml" / "models" / "safety_classifier_compiled"
+
+# Shared by all instances, so a reloaded model never reuses an old version
+_GENERATIONS = count(1)
 
 
 class SafetyClassifier:
@@ -19,22 +29,57 @@ class SafetyClassifier:
       - SENSITIVE
       - POLICY_RISK
       - HARMFUL
+
+    `_model` is either the sklearn Pipeline or a CompiledClassifier (see
+    compiled_classifier.py); both expose predict_proba() and classes_.
     """
 
-    def __init__(self):
+    def __init__(self, mode: str = settings.SAFETY_CLASSIFIER_MODE):
+        self._mode = mode
         self._model = None
+        self._compiled = False
+        self._generation = 0  # bumped on every (re)load
 
     def load(self):
+        if self._mode == "compiled" and self._load_compiled():
+            return
         if not MODEL_PATH.exists():
             print(f"[SAFETY CLASSIFIER] No model found at {MODEL_PATH}. Skipping load.")
             return
         self._model = joblib.load(MODEL_PATH)
+        self._compiled = False
+        self._generation = next(_GENERATIONS)
         print(f"[SAFETY CLASSIFIER] Loaded model from {MODEL_PATH}")
 
+    def _load_compiled(self) -> bool:
+        compiled = CompiledClassifier.load(COMPILED_MODEL_PATH)
+        if compiled is None:
+            print(f"[SAFETY CLASSIFIER] No compiled model at {COMPILED_MODEL_PATH}; using the pipeline")
+            return False
+        # a retrained pipeline that was not re-exported wins over the stale export
+        expected = compiled.manifest.get("source_sha256")
+        if MODEL_PATH.exists() and expected and file_sha256(MODEL_PATH) != expected:
+            print(f"[SAFETY CLASSIFIER] Compiled model at {COMPILED_MODEL_PATH} is stale; using the pipeline")
+            return False
+        self._model = compiled
+        self._compiled = True
+        self._generation = next(_GENERATIONS)
+        print(f"[SAFETY CLASSIFIER] Loaded compiled model from {COMPILED_MODEL_PATH}")
+        return True
+
     @property
     def is_ready(self) -> bool:
         return self._model is not None
 
+    @property
+    def is_compiled(self) -> bool:
+        return self._compiled
+
+    @property
+    def version(self) -> int:
+        """Changes whenever a model is (re)loaded."""
+        return self._generation
+
     def classify(self, text: str) -> Tuple[Optional[str], float]:
         """
         Returns (label, probability_of_label).
@@ -49,10 +94,41 @@ class SafetyClassifier:
         label = self._model.classes_[idx]
         return label, prob
 
+    def classify_batch(self, texts: List[str]) -> List[Tuple[Optional[str], float]]:
+        """
+        Vectorized classify(): one predict_proba call for the whole batch.
+        Returns one (label, probability_of_label) per text, in order.
+        """
+        if not self.is_ready:
+            return [(None, 0.0) for _ in texts]
+        if not texts:
+            return []
+
+        probs = self._model.predict_proba(texts)
+        idxs = probs.argmax(axis=1)
+        classes = self._model.classes_
+        return [
+            (classes[idx], float(probs[row, idx]))
+            for row, idx in enumerate(idxs)
+        ]
+
+
+def _describe(clf: SafetyClassifier) -> Dict[str, Any]:
+    return {
+        "compiled": clf.is_compiled,
+        "sources": [str(MODEL_PATH), str(COMPILED_MODEL_PATH)],
+    }
+
+
+# Reloadable handle (see core/hot_reload.py); attribute access goes to the
+# live SafetyClassifier
+safety_classifier = HotSwap("safety_classifier", SafetyClassifier, _describe)
 
-safety_classifier = SafetyClassifier()
+# Files whose change triggers a reload when the watcher is enabled
+CLASSIFIER_WATCH_PATHS = [MODEL_PATH, COMPILED_MODEL_PATH / "manifest.json"]
 
 
 def init_safety_classifier():
     """Call from app startup."""
-    safety_classifier.load()
+    safety_classifier.reload()
+    reload_watcher.watch(safety_classifier, CLASSIFIER_WATCH_PATHS)
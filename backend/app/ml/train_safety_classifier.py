@@ -1,5 +1,7 @@
 # backend/app/ml/train_safety_classifier.py
 
+import argparse
+import sys
 from pathlib import Path
 
 import pandas as pd
@@ -17,6 +19,13 @@ MODEL_DIR = BASE_DIR / "ml" / "models"
 
 DATA_PATH = DATA_DIR / "safety_prompts.csv"
 MODEL_PATH = MODEL_DIR / "safety_classifier.joblib"
+COMPILED_MODEL_PATH = MODEL_DIR / "safety_classifier_compiled"
+
+# for app.* imports when run as a script
+if str(BASE_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR.parent))
+
+from app.ml.compiled_classifier import export  # noqa: E402
 
 
 def load_data() -> pd.DataFrame:
@@ -74,6 +83,25 @@ def train():
     joblib.dump(clf, MODEL_PATH)
     print(f"[SAFETY TRAIN] Saved model to {MODEL_PATH}")
 
+    export_compiled(clf, X.tolist())
+
+
+def export_compiled(clf: Pipeline, check_texts):
+    """Inference artifact for SafetyClassifier's "compiled" mode."""
+    export(clf, COMPILED_MODEL_PATH, source_path=MODEL_PATH, check_texts=check_texts)
+    print(f"[SAFETY TRAIN] Saved compiled model to {COMPILED_MODEL_PATH}")
+
 
 if __name__ == "__main__":
-    train()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--export-only",
+        action="store_true",
+        help="compile the saved pipeline without retraining",
+    )
+    args = parser.parse_args()
+
+    if args.export_only:
+        export_compiled(joblib.load(MODEL_PATH), load_data()["text"].astype(str).tolist())
+    else:
+        train()
@@ -112,6 +112,15 @@ class AnalyzeResponse(BaseModel):
     highlight_spans: List[TextSpan]
 
 
+class AnalyzeBatchRequest(BaseModel):
+    requests: List[AnalyzeRequest]
+
+
+class AnalyzeBatchResponse(BaseModel):
+    # same order as AnalyzeBatchRequest.requests
+    results: List[AnalyzeResponse]
+
+
 # ---------- Complete request/response ----------
 
 class CompleteRequest(BaseModel):
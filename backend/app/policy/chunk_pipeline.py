@@ -0,0 +1,320 @@
+# backend/app/policy/chunk_pipeline.py
+
+"""
+Parallel, streaming text extraction + chunking of policy source documents.
+
+Every document becomes one or more tasks for a process pool: a .txt file
+is one task, a PDF one task per settings.POLICY_CHUNK_PAGES_PER_TASK pages.
+A task extracts its text and does the per-paragraph work (section header
+match, keyword category). Pages are joined by a blank line, so a paragraph
+never spans two pages and tasks need nothing from each other. The parent
+then walks a document's paragraphs in order, carrying the current section
+/ title forward and numbering the chunks, which gives exactly the chunks
+chunk_text_by_paragraphs() makes from the whole text.
+
+iter_document_chunks() keeps at most workers * IN_FLIGHT_PER_WORKER tasks
+in flight and yields one DocumentChunks per document, in input order, as
+soon as its last task is done. Memory is bounded by that window, not by
+the corpus, as long as the caller writes chunks out as they come (see
+policy_loader.ChunksFileWriter; JSON Lines for large corpora).
+
+Workers are started with forkserver / spawn, never fork, so the pipeline
+is safe to run from the API process (admin sync) as well as from
+scripts/build_policy_chunks.py.
+"""
+
+import multiprocessing
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..core.config import settings
+from ..core.keyword_lists import keyword_lists
+from ..core.phrase_matcher import PhraseMatcher
+
+
+DOCUMENT_SUFFIXES = (".txt", ".pdf")
+MIN_CHUNK_CHARS = 80  # shorter paragraphs are headers / page furniture
+IN_FLIGHT_PER_WORKER = 4
+
+# Chunks of these categories get more influence on the policy score
+WEIGHTED_CATEGORIES = ("SECURITY_PRIVACY", "SAFETY_SECURITY", "CONDUCT_ETHICS", "SOCIAL_MEDIA")
+
+# Detect lines like: "5.11 Holidays", "Section 10.2 Workplace Violence", etc.
+SECTION_RE = re.compile(
+    r"^\s*(?:Section\s+)?(\d+(\.\d+)*)[\.\)]?\s+(.*)$",
+    re.IGNORECASE,
+)
+
+# Ordered category rules (first match wins), configurable via KEYWORD_LISTS_PATH
+CATEGORY_RULES = keyword_lists["chunk_categories"]
+CATEGORY_MATCHER = PhraseMatcher({rule["category"]: rule["keywords"] for rule in CATEGORY_RULES})
+
+# (text, (section, title) if it starts with a section header, keyword category or None)
+Paragraph = Tuple[str, Optional[Tuple[str, str]], Optional[str]]
+
+
+# ---------- per-paragraph work (runs in the workers) ----------
+
+
+def keyword_category(para: str) -> Optional[str]:
+    """First category rule whose keywords occur in `para`, if any."""
+    # Security / privacy, fair employment, leave, compensation, conduct, safety...
+    matched = CATEGORY_MATCHER.matched_groups(para)
+    for rule in CATEGORY_RULES:
+        if rule["category"] in matched:
+            return rule["category"]
+    return None
+
+
+def fallback_category(section: str) -> str:
+    if section.startswith("11."):
+        return "SOCIAL_MEDIA"
+    if section.startswith("10."):
+        return "SAFETY_SECURITY"
+    return "GENERAL_HR"
+
+
+def guess_category(para: str, section: str) -> str:
+    """Very simple rule-based category classifier."""
+    return keyword_category(para) or fallback_category(section)
+
+
+def split_paragraphs(text: str) -> List[Paragraph]:
+    """Paragraphs (split on double newlines) with their header / category hints."""
+    paragraphs: List[Paragraph] = []
+    for para in text.split("\n\n"):
+        para = para.strip()
+        if not para:
+            continue
+        m = SECTION_RE.match(para.splitlines()[0])
+        header = None
+        if m:
+            section = m.group(1).strip()
+            header = (section, m.group(3).strip() or f"Section {section}")
+        paragraphs.append((para, header, keyword_category(para)))
+    return paragraphs
+
+
+def _is_pdf(name: str) -> bool:
+    return name.lower().endswith(".pdf")
+
+
+def _extract(path: str, pdf: bool, start: int, end: Optional[int]) -> Tuple[List[Paragraph], int]:
+    """Pool task: paragraphs of a .txt file, or of PDF pages [start, end)."""
+    if not pdf:
+        return split_paragraphs(Path(path).read_text(encoding="utf-8", errors="ignore")), 0
+
+    from PyPDF2 import PdfReader  # free PDF library, only needed for .pdf sources
+
+    try:
+        pages = PdfReader(path).pages[start:end]
+    except Exception as e:
+        raise ValueError(f"Could not read PDF {Path(path).name}: {e}") from e
+    paragraphs: List[Paragraph] = []
+    for page in pages:
+        try:
+            text = page.extract_text() or ""
+        except Exception:
+            continue
+        paragraphs.extend(split_paragraphs(text))
+    return paragraphs, len(pages)
+
+
+# ---------- per-document assembly (runs in the parent) ----------
+
+
+def assemble_chunks(paragraphs: Iterable[Paragraph], source_name: str) -> List[Dict[str, Any]]:
+    """Chunks in paragraph order: section / title carried forward, category fallback, weight."""
+    chunks: List[Dict[str, Any]] = []
+
+    current_section = "?"
+    current_title = f"From {source_name}"
+
+    for idx, (para, header, category) in enumerate(paragraphs):
+        if header:
+            current_section, current_title = header
+        category = category or fallback_category(current_section)
+
+        chunks.append(
+            {
+                "id": f"{source_name}-chunk-{idx}",
+                "section": current_section,
+                "title": current_title,
+                "text": para,
+                "source": source_name,
+                "category": category,
+                "weight": 1.5 if category in WEIGHTED_CATEGORIES else 1.0,
+            }
+        )
+
+    return chunks
+
+
+def chunk_text_by_paragraphs(text: str, source_name: str) -> List[Dict[str, Any]]:
+    """
+    Chunk by paragraphs (split on double newlines).
+    Try to detect section headers, assign section/title/category/weight.
+    """
+    return assemble_chunks(split_paragraphs(text), source_name)
+
+
+# ---------- pipeline ----------
+
+
+class DocumentChunks(NamedTuple):
+    name: str
+    path: Path
+    chunks: List[Dict[str, Any]]  # without the very short ones
+    pages: int
+    error: Optional[str]
+
+
+class PipelineStats:
+    def __init__(self, total_documents: Optional[int] = None):
+        self.total_documents = total_documents
+        self.documents = 0
+        self.errors = 0
+        self.pages = 0
+        self.bytes = 0
+        self.chunks = 0
+        self.started = time.perf_counter()
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return {
+            "documents": self.documents,
+            "total_documents": self.total_documents,
+            "errors": self.errors,
+            "pages": self.pages,
+            "chunks": self.chunks,
+            "mb": self.bytes / 1e6,
+            "elapsed_s": elapsed,
+            "documents_per_s": self.documents / elapsed,
+            "pages_per_s": self.pages / elapsed,
+            "mb_per_s": self.bytes / 1e6 / elapsed,
+        }
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """Explicit count, else settings.POLICY_CHUNK_WORKERS (0 = one per CPU)."""
+    if workers is None:
+        workers = settings.POLICY_CHUNK_WORKERS
+    return workers if workers > 0 else multiprocessing.cpu_count()
+
+
+def _plan(name: str, path: Path, pages_per_task: int) -> List[Tuple[str, bool, int, Optional[int]]]:
+    """Pool tasks of one document: the whole file, or page ranges of a PDF."""
+    whole = [(str(path), _is_pdf(name), 0, None)]
+    if not _is_pdf(name):
+        return whole
+    from PyPDF2 import PdfReader
+
+    try:
+        n_pages = len(PdfReader(str(path)).pages)
+    except Exception:
+        return whole  # the task reports the error
+    ranges = [(str(path), True, start, min(start + pages_per_task, n_pages)) for start in range(0, n_pages, pages_per_task)]
+    return ranges or whole
+
+
+class _Done:
+    """Inline stand-in for a Future when running without a pool."""
+
+    def __init__(self, fn: Callable, *args):
+        try:
+            self._value, self._error = fn(*args), None
+        except Exception as e:
+            self._value, self._error = None, e
+
+    def result(self):
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class _Document:
+    def __init__(self, name: str, path: Path):
+        self.name = name
+        self.path = path
+        self.parts: List[List[Paragraph]] = []
+        self.pages = 0
+        self.error: Optional[str] = None
+
+
+def iter_document_chunks(
+    documents: Iterable[Tuple[str, Path]],
+    workers: Optional[int] = None,
+    pages_per_task: Optional[int] = None,
+    stats: Optional[PipelineStats] = None,
+    progress: Optional[Callable[[PipelineStats], None]] = None,
+) -> Iterator[DocumentChunks]:
+    """
+    Chunks of each (name, path) document, in input order; the type (.txt
+    / .pdf) comes from the name, so `path` may be a temp file. Unreadable
+    documents come back with `error` set and no chunks. workers=1 runs
+    everything in this process. `progress(stats)` is called after each
+    document.
+    """
+    workers = resolve_workers(workers)
+    pages_per_task = max(1, pages_per_task or settings.POLICY_CHUNK_PAGES_PER_TASK)
+    stats = stats if stats is not None else PipelineStats()
+    window = workers * IN_FLIGHT_PER_WORKER
+
+    pool = None
+    if workers > 1:
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+
+    def submit(task):
+        return pool.submit(_extract, *task) if pool is not None else _Done(_extract, *task)
+
+    def collect() -> Optional[DocumentChunks]:
+        """Wait for the oldest task; the finished document if it was its last."""
+        doc, last, future = pending.popleft()
+        try:
+            paragraphs, pages = future.result()
+            doc.parts.append(paragraphs)
+            doc.pages += pages
+        except Exception as e:
+            doc.error = doc.error or f"{type(e).__name__}: {e}"
+        if not last:
+            return None
+
+        chunks = [] if doc.error else assemble_chunks(chain.from_iterable(doc.parts), doc.name)
+        chunks = [ch for ch in chunks if len(ch["text"]) > MIN_CHUNK_CHARS]
+        stats.documents += 1
+        stats.errors += doc.error is not None
+        stats.pages += doc.pages
+        stats.chunks += len(chunks)
+        try:
+            stats.bytes += doc.path.stat().st_size
+        except OSError:
+            pass
+        if progress is not None:
+            progress(stats)
+        return DocumentChunks(doc.name, doc.path, chunks, doc.pages, doc.error)
+
+    pending: deque = deque()  # (document, is its last task, future), in submission order
+    try:
+        for name, path in documents:
+            doc = _Document(name, Path(path))
+            tasks = _plan(name, doc.path, pages_per_task)
+            for i, task in enumerate(tasks):
+                while len(pending) >= window:
+                    done = collect()
+                    if done is not None:
+                        yield done
+                pending.append((doc, i == len(tasks) - 1, submit(task)))
+        while pending:
+            done = collect()
+            if done is not None:
+                yield done
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
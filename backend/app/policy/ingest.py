@@ -0,0 +1,368 @@
+# backend/app/policy/ingest.py
+
+"""
+Incremental policy ingestion.
+
+Source documents (.txt / .pdf in settings.POLICY_SOURCE_DIR) are split into
+the chunks of settings.POLICY_CHUNKS_PATH by the parallel chunk pipeline
+(chunk_pipeline.py). The ingest manifest (settings.POLICY_INGEST_MANIFEST_PATH)
+records the sha256 and chunk count of every ingested document, so a sync
+only re-reads and re-chunks the documents whose content changed and drops
+the chunks of deleted ones; every other chunk is kept as it is. New chunks
+are streamed into the chunks file ahead of the kept ones.
+
+The resulting ChunkDelta (chunks added, chunk ids removed) is applied to
+the live store with PolicyRAGStore.with_changes() (appended postings and
+tombstones instead of a TF-IDF refit) through policy_rag_store.update(),
+and the updated index is written to settings.POLICY_VECTOR_STORE_PATH so
+restarts and analysis pool workers load it as is. The new chunks file and
+manifest are staged in temp files and only moved into place once the
+index swap succeeded: after a failed update the manifest still holds the
+old sha256s, so the next sync retries the same documents.
+
+    sync_policy_sources(full)             rescan the source dir
+    ingest_policy_document(name, data)    add / replace one document
+    delete_policy_document(name)          remove one document
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from ..core.config import settings
+from ..core.hot_reload import reload_watcher
+from .chunk_pipeline import DOCUMENT_SUFFIXES, PipelineStats, iter_document_chunks
+from .policy_index import file_sha256
+from .policy_loader import ChunksFileWriter, iter_chunks_file
+from .rag_store import BASE_DIR, POLICY_FILE, POLICY_INDEX_DIR, PolicyRAGStore, policy_rag_store
+
+
+SOURCE_DIR = BASE_DIR / settings.POLICY_SOURCE_DIR
+MANIFEST_FILE = BASE_DIR / settings.POLICY_INGEST_MANIFEST_PATH
+
+MANIFEST_FORMAT_VERSION = 1
+
+_DOCUMENT_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9 ._-]{0,199}$")
+
+
+def check_document_name(name: str) -> str:
+    """`name` if it is a plain .txt / .pdf file name, else ValueError."""
+    if not _DOCUMENT_NAME_RE.match(name) or Path(name).name != name:
+        raise ValueError(f"Invalid document name '{name}'")
+    if not name.lower().endswith(DOCUMENT_SUFFIXES):
+        raise ValueError(f"Unsupported document type '{name}' (expected {', '.join(DOCUMENT_SUFFIXES)})")
+    return name
+
+
+# ---------- chunks file + manifest ----------
+
+
+class StagedFiles:
+    """A new chunks file and manifest, complete in temp files but not in place yet."""
+
+    def __init__(self, chunks: ChunksFileWriter, manifest_path: Path, manifest: Dict[str, Any]):
+        self._chunks = chunks
+        self._manifest_path = manifest_path
+        self._manifest_tmp = manifest_path.with_name(f"{manifest_path.name}.tmp-{os.getpid()}")
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._manifest_tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        except BaseException:
+            self.discard()
+            raise
+
+    @property
+    def chunks_path(self) -> Path:
+        """Where the new chunks file is until commit()."""
+        return self._chunks.tmp_path
+
+    def commit(self):
+        self._chunks.commit()
+        os.replace(self._manifest_tmp, self._manifest_path)
+
+    def discard(self):
+        self._chunks.discard()
+        self._manifest_tmp.unlink(missing_ok=True)
+
+
+class ChunkDelta(NamedTuple):
+    added: List[Dict[str, Any]]  # empty when the caller did not collect them
+    removed_ids: List[str]
+    documents: Dict[str, str]  # name -> "added" | "changed" | "removed" | "unchanged" | "failed"
+    n_added: int
+    staged: Optional[StagedFiles] = None  # stage=True: files the caller must commit() or discard()
+
+    @property
+    def empty(self) -> bool:
+        return not self.n_added and not self.removed_ids
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "documents": self.documents,
+            "chunks_added": self.n_added,
+            "chunks_removed": len(self.removed_ids),
+        }
+
+
+class PolicyIngestor:
+    """
+    Keeps the chunks file and the ingest manifest in step with a source
+    directory. Methods return the ChunkDelta they wrote; callers serialise
+    them (see _ingest_lock). With stage=True nothing is moved into place:
+    the delta carries the StagedFiles to commit() or discard().
+    """
+
+    def __init__(self, source_dir: Path, chunks_path: Path, manifest_path: Path):
+        self.source_dir = Path(source_dir)
+        self.chunks_path = Path(chunks_path)
+        self.manifest_path = Path(manifest_path)
+
+    def documents(self) -> Dict[str, Dict[str, Any]]:
+        """Manifest entries: name -> sha256, size, chunks, ingested_at."""
+        if not self.manifest_path.exists():
+            return {}
+        manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+            print(f"[POLICY INGEST] Ignoring manifest {self.manifest_path} (format {manifest.get('format_version')})")
+            return {}
+        return manifest.get("documents", {})
+
+    def sync(
+        self,
+        full: bool = False,
+        workers: Optional[int] = None,
+        stats: Optional[PipelineStats] = None,
+        progress: Optional[Callable[[PipelineStats], None]] = None,
+        collect: bool = True,
+        stage: bool = False,
+    ) -> ChunkDelta:
+        """
+        Re-chunk the source documents whose sha256 differs from the manifest
+        and drop the ones that were deleted. `full` re-chunks every document
+        and drops chunks that came from no current source file (the old
+        whole-rebuild behaviour). collect=False leaves delta.added empty, so
+        nothing but the pipeline window is held in memory.
+        """
+        docs = self.documents()
+        on_disk = {
+            path.name: path
+            for path in sorted(self.source_dir.glob("*"))
+            if path.is_file() and path.suffix.lower() in DOCUMENT_SUFFIXES
+        }
+        changed = []
+        for name, path in on_disk.items():
+            sha = file_sha256(path)
+            if full or docs.get(name, {}).get("sha256") != sha:
+                changed.append((name, path, sha))
+        removed = {name for name in docs if name not in on_disk}
+        if stats is not None:
+            stats.total_documents = len(changed)
+        return self._apply(
+            changed,
+            removed,
+            docs,
+            keep_sources=set(on_disk) if full else None,
+            workers=workers,
+            stats=stats,
+            progress=progress,
+            collect=collect,
+            stage=stage,
+        )
+
+    def put(self, name: str, data: bytes, stage: bool = False) -> ChunkDelta:
+        """
+        Add or replace one document (written into the source dir);
+        ValueError if it cannot be read, in which case nothing changes.
+        """
+        check_document_name(name)
+        docs = self.documents()
+        target = self.source_dir / name
+        sha = hashlib.sha256(data).hexdigest()
+        if docs.get(name, {}).get("sha256") == sha and target.is_file():
+            return ChunkDelta([], [], {name: "unchanged"}, 0)
+
+        self.source_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.source_dir / f".{name}.tmp-{os.getpid()}"  # not a source name until renamed
+        tmp.write_bytes(data)
+        try:
+            delta = self._apply([(name, tmp, sha)], set(), docs, workers=1, strict=True, stage=stage)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return delta
+
+    def delete(self, name: str, stage: bool = False) -> ChunkDelta:
+        """Remove one document and its chunks; KeyError if it is unknown."""
+        docs = self.documents()
+        path = self.source_dir / name
+        if name not in docs and not (Path(name).name == name and path.is_file()):
+            raise KeyError(name)
+        delta = self._apply([], {name}, docs, stage=stage)
+        if path.is_file():
+            path.unlink()
+        return delta
+
+    def _apply(
+        self,
+        changed: List[Tuple[str, Path, str]],
+        removed: Set[str],
+        docs: Dict[str, Dict[str, Any]],
+        keep_sources: Optional[Set[str]] = None,
+        workers: Optional[int] = None,
+        stats: Optional[PipelineStats] = None,
+        progress: Optional[Callable[[PipelineStats], None]] = None,
+        collect: bool = True,
+        strict: bool = False,
+        stage: bool = False,
+    ) -> ChunkDelta:
+        """
+        Re-chunk the (name, path, sha256) documents in `changed` and drop
+        the chunks of `removed` (and, if given, of every source not in
+        `keep_sources`). A document that cannot be read keeps its old
+        chunks and manifest entry (strict: ValueError, nothing written).
+        """
+        docs = dict(docs)
+        statuses: Dict[str, str] = {name: "removed" for name in removed}
+        added: List[Dict[str, Any]] = []
+        replaced = set(removed)
+        shas = {name: sha for name, _, sha in changed}
+        n_added = 0
+
+        with ChunksFileWriter(self.chunks_path) as out:
+            for doc in iter_document_chunks(
+                [(name, path) for name, path, _ in changed], workers=workers, stats=stats, progress=progress
+            ):
+                if doc.error:
+                    if strict:
+                        raise ValueError(doc.error)
+                    statuses[doc.name] = "failed"
+                    print(f"[POLICY INGEST] Skipped {doc.name}: {doc.error}")
+                    continue
+                for chunk in doc.chunks:
+                    out.write(chunk)
+                n_added += len(doc.chunks)
+                if collect:
+                    added.extend(doc.chunks)
+                statuses[doc.name] = "changed" if doc.name in docs else "added"
+                replaced.add(doc.name)
+                docs[doc.name] = {
+                    "sha256": shas[doc.name],
+                    "size": doc.path.stat().st_size,
+                    "chunks": len(doc.chunks),
+                    "ingested_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                }
+
+            removed_ids: List[str] = []
+            for chunk in iter_chunks_file(self.chunks_path):
+                source = chunk.get("source")
+                if source in replaced or (keep_sources is not None and source not in keep_sources):
+                    removed_ids.append(str(chunk.get("id")))
+                    if statuses.get(source) == "added":
+                        statuses[source] = "changed"  # chunked before the manifest existed
+                    continue
+                out.write(chunk)
+
+            for name in removed:
+                docs.pop(name, None)
+            delta = ChunkDelta(added=added, removed_ids=removed_ids, documents=statuses, n_added=n_added)
+            if delta.empty and self.manifest_path.exists():
+                return delta  # nothing written; the writer discards its temp file
+            out.finish()
+
+        staged = StagedFiles(out, self.manifest_path, {"format_version": MANIFEST_FORMAT_VERSION, "documents": docs})
+        print(
+            f"[POLICY INGEST] {n_added} chunks added, {len(removed_ids)} removed; "
+            f"{out.count} in {self.chunks_path.name}" + (" (staged)" if stage else "")
+        )
+        if not stage:
+            staged.commit()
+            return delta
+        return delta._replace(staged=staged)
+
+
+# ---------- applying a delta to the live store ----------
+
+
+policy_ingestor = PolicyIngestor(SOURCE_DIR, POLICY_FILE, MANIFEST_FILE)
+
+# One ingestion at a time: the chunks file, manifest and index are
+# read-modify-written as a unit
+_ingest_lock = threading.Lock()
+
+
+def _publish(delta: ChunkDelta) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Apply `delta` to the live store, write the index and swap it in.
+    Returns (index status, the error of this update or None).
+    """
+    errors: List[str] = []
+    # the index records the sha256 of the chunks file it was built from
+    source_path = delta.staged.chunks_path if delta.staged is not None else POLICY_FILE
+
+    def build(live: PolicyRAGStore) -> PolicyRAGStore:
+        try:
+            fresh = live.with_changes(delta.added, delta.removed_ids)
+            if fresh.is_ready:
+                fresh.save_index(POLICY_INDEX_DIR, source_path=source_path)
+                fresh.configure_backend(settings.POLICY_RETRIEVAL_BACKEND)
+            return fresh
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+            raise
+
+    status = policy_rag_store.update(build, "ingest")
+    return status, (errors[0] if errors else None)
+
+
+def _run(change) -> Dict[str, Any]:
+    """
+    Run `change` (an ingestor call with stage=True) and publish its delta;
+    the staged chunks file and manifest are moved into place only if the
+    index update succeeded. `index_error` is that update's error, if any
+    (the status's last_error may be older).
+    """
+    with _ingest_lock:
+        if not policy_rag_store.is_ready:
+            # the delta is relative to the current chunks file; load it first
+            policy_rag_store.reload()
+        delta = change()
+        try:
+            status, error = (policy_rag_store.status(), None) if delta.empty else _publish(delta)
+        except BaseException:
+            if delta.staged is not None:
+                delta.staged.discard()
+            raise
+        if delta.staged is not None:
+            if error is None:
+                delta.staged.commit()
+            else:
+                delta.staged.discard()
+        if not delta.empty and error is None:
+            # we wrote those files ourselves; the watcher need not reload them
+            reload_watcher.acknowledge(policy_rag_store)
+    return {**delta.summary(), "index": status, "index_error": error}
+
+
+def sync_policy_sources(
+    full: bool = False,
+    workers: Optional[int] = None,
+    stats: Optional[PipelineStats] = None,
+    progress: Optional[Callable[[PipelineStats], None]] = None,
+) -> Dict[str, Any]:
+    """Bring chunks + index in line with settings.POLICY_SOURCE_DIR."""
+    return _run(lambda: policy_ingestor.sync(full=full, workers=workers, stats=stats, progress=progress, stage=True))
+
+
+def ingest_policy_document(name: str, data: bytes) -> Dict[str, Any]:
+    """Add or replace one document; ValueError for a bad name or unreadable file."""
+    return _run(lambda: policy_ingestor.put(name, data, stage=True))
+
+
+def delete_policy_document(name: str) -> Dict[str, Any]:
+    """Remove one document; KeyError if it is unknown."""
+    return _run(lambda: policy_ingestor.delete(name, stage=True))
@@ -0,0 +1,195 @@
+# backend/app/policy/policy_index.py
+
+"""
+Versioned on-disk policy index.
+
+Built offline by scripts/build_policy_index.py from chunked_policies.json and
+loaded by every worker at startup from settings.POLICY_VECTOR_STORE_PATH, so
+workers no longer refit TF-IDF on boot.
+
+Layout of the index directory (format version 1):
+
+    manifest.json          format version, source file + sha256, shapes,
+                           vectorizer params, required-keyword fingerprint,
+                           chunks appended since the last fit
+    vocabulary.json        TF-IDF terms in column order
+    idf.npy                float64[n_terms]
+    postings_data.npy      term x chunk CSR matrix (the transposed TF-IDF
+    postings_indices.npy   matrix, which is what the query path multiplies
+    postings_indptr.npy    against)
+    weights.npy            float64[n_chunks]
+    keyword_bits.npy       uint8[n_chunks, n_bytes] packed required-keyword bitmask
+    chunks.json            chunk metadata + text, in row order
+
+The .npy arrays are opened with mmap_mode="r": workers on the same host
+share the page-cache pages instead of each holding a private copy.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+INDEX_FORMAT_VERSION = 1
+
+# Shared by the offline build and the in-process fallback fit.
+VECTORIZER_PARAMS: Dict[str, Any] = {
+    "ngram_range": (1, 2),
+    "max_df": 0.9,
+    "min_df": 2,
+    "stop_words": "english",
+}
+
+_ARRAYS = ["idf", "postings_data", "postings_indices", "postings_indptr", "weights", "keyword_bits"]
+
+
+class PolicyIndex(NamedTuple):
+    manifest: Dict[str, Any]
+    chunks: List[Dict[str, Any]]
+    vectorizer: TfidfVectorizer
+    postings: csr_matrix
+    weights: np.ndarray
+    keyword_bits: np.ndarray
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def keyword_fingerprint(keywords: List[str]) -> str:
+    """Identifies the keyword -> bit layout used for keyword_bits."""
+    return hashlib.sha256(json.dumps(keywords).encode("utf-8")).hexdigest()
+
+
+def new_vectorizer() -> TfidfVectorizer:
+    return TfidfVectorizer(**VECTORIZER_PARAMS)
+
+
+def write_policy_index(
+    out_dir: Path,
+    *,
+    chunks: List[Dict[str, Any]],
+    vectorizer: TfidfVectorizer,
+    postings: csr_matrix,
+    weights: np.ndarray,
+    keyword_bits: np.ndarray,
+    keywords: List[str],
+    source_path: Optional[Path] = None,
+    appended_since_fit: int = 0,
+) -> Dict[str, Any]:
+    """
+    Write the index into `out_dir`.
+
+    Files go to a sibling temp directory first, which then replaces
+    `out_dir`, so readers never see a half-written index. Workers that
+    already mapped the old files keep reading them until they reload.
+    """
+    out_dir = Path(out_dir)
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = out_dir.with_name(f"{out_dir.name}.tmp-{os.getpid()}")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir()
+
+    # vocabulary_ only exists once a loaded vectorizer has transformed something
+    term_to_col = getattr(vectorizer, "vocabulary_", None) or vectorizer.vocabulary
+    vocabulary = [""] * len(term_to_col)
+    for term, col in term_to_col.items():
+        vocabulary[col] = term
+
+    arrays = {
+        "idf": np.asarray(vectorizer.idf_, dtype=np.float64),
+        "postings_data": postings.data,
+        "postings_indices": postings.indices,
+        "postings_indptr": postings.indptr,
+        "weights": np.asarray(weights, dtype=np.float64),
+        "keyword_bits": np.asarray(keyword_bits, dtype=np.uint8),
+    }
+    for name, arr in arrays.items():
+        np.save(tmp_dir / f"{name}.npy", arr)
+
+    (tmp_dir / "vocabulary.json").write_text(json.dumps(vocabulary, ensure_ascii=False), encoding="utf-8")
+    (tmp_dir / "chunks.json").write_text(json.dumps(chunks, ensure_ascii=False), encoding="utf-8")
+
+    manifest = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "source": source_path.name if source_path else None,
+        "source_sha256": file_sha256(source_path) if source_path else None,
+        "n_chunks": len(chunks),
+        "n_terms": len(vocabulary),
+        "nnz": int(postings.nnz),
+        "vectorizer": {k: list(v) if isinstance(v, tuple) else v for k, v in VECTORIZER_PARAMS.items()},
+        "keyword_fingerprint": keyword_fingerprint(keywords),
+        # chunks transformed with the fitted vocabulary instead of refit
+        "appended_since_fit": appended_since_fit,
+    }
+    (tmp_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    old_dir = out_dir.with_name(f"{out_dir.name}.old-{os.getpid()}")
+    if out_dir.exists():
+        os.replace(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+
+    return manifest
+
+
+def read_policy_index(index_dir: Path) -> Optional[PolicyIndex]:
+    """Memory-map an index written by write_policy_index, or None if unusable."""
+    index_dir = Path(index_dir)
+    manifest_path = index_dir / "manifest.json"
+    if not manifest_path.exists():
+        print(f"[POLICY INDEX] No index found at {index_dir}")
+        return None
+
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("format_version") != INDEX_FORMAT_VERSION:
+            print(
+                f"[POLICY INDEX] Index format {manifest.get('format_version')} at {index_dir} "
+                f"is not supported (expected {INDEX_FORMAT_VERSION}); rebuild it"
+            )
+            return None
+
+        arrays = {name: np.load(index_dir / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+        vocabulary = json.loads((index_dir / "vocabulary.json").read_text(encoding="utf-8"))
+        chunks = json.loads((index_dir / "chunks.json").read_text(encoding="utf-8"))
+    except Exception as e:
+        print(f"[POLICY INDEX] Failed to read index at {index_dir}: {e}")
+        return None
+
+    params = dict(manifest.get("vectorizer") or VECTORIZER_PARAMS)
+    params["ngram_range"] = tuple(params["ngram_range"])
+    # A fixed vocabulary + idf is all transform() needs; nothing is refit.
+    vectorizer = TfidfVectorizer(**params, vocabulary={term: col for col, term in enumerate(vocabulary)})
+    vectorizer.idf_ = arrays["idf"]
+
+    # copy=False keeps the memory-mapped buffers (no private copy per worker)
+    postings = csr_matrix(
+        (arrays["postings_data"], arrays["postings_indices"], arrays["postings_indptr"]),
+        shape=(len(vocabulary), len(chunks)),
+        copy=False,
+    )
+
+    return PolicyIndex(
+        manifest=manifest,
+        chunks=chunks,
+        vectorizer=vectorizer,
+        postings=postings,
+        weights=arrays["weights"],
+        keyword_bits=arrays["keyword_bits"],
+    )
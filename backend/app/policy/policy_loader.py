@@ -1,6 +1,7 @@
 import json
+import os
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 from ..core.config import settings
 
@@ -9,16 +10,100 @@ BASE_DIR = Path(__file__).resolve().parents[2]  # .../backend
 POLICY_CHUNKS_PATH = BASE_DIR / settings.POLICY_CHUNKS_PATH
 
 
+# The chunks file is a JSON array, or JSON Lines (one chunk per line) when
+# its name ends in .jsonl; JSON Lines is read and written without holding
+# the whole corpus in memory.
+
+
+def _is_jsonl(path: Path) -> bool:
+    return path.suffix.lower() == ".jsonl"
+
+
+def iter_chunks_file(path: Path) -> Iterator[Dict[str, Any]]:
+    """Chunks of a chunks file in order (nothing if it does not exist)."""
+    path = Path(path)
+    if not path.exists():
+        return
+    if _is_jsonl(path):
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, list):
+        raise ValueError(f"{path.name} must contain a list")
+    yield from data
+
+
+def read_chunks_file(path: Path) -> List[Dict[str, Any]]:
+    return list(iter_chunks_file(path))
+
+
+class ChunksFileWriter:
+    """
+    Streams chunks into `path` through a temp file that replaces it on
+    commit(); leaving the `with` block without commit() or finish() (or
+    with an exception) discards what was written. finish() completes the
+    temp file without moving it into place, for callers that commit()
+    later or discard() it. The JSON array layout is the same as
+    json.dumps(chunks, indent=2).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = self.path.with_name(f"{self.path.name}.tmp-{os.getpid()}")
+        self._jsonl = _is_jsonl(self.path)
+        self._f = self._tmp.open("w", encoding="utf-8")
+        self.count = 0
+        if not self._jsonl:
+            self._f.write("[")
+
+    def write(self, chunk: Dict[str, Any]):
+        if self._jsonl:
+            self._f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+        else:
+            body = json.dumps(chunk, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            self._f.write(("," if self.count else "") + "\n  " + body)
+        self.count += 1
+
+    @property
+    def tmp_path(self) -> Path:
+        return self._tmp
+
+    def finish(self):
+        if self._f.closed:
+            return
+        if not self._jsonl:
+            self._f.write("\n]" if self.count else "]")
+        self._f.close()
+
+    def commit(self):
+        self.finish()
+        os.replace(self._tmp, self.path)
+
+    def discard(self):
+        if not self._f.closed:
+            self._f.close()
+        self._tmp.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ChunksFileWriter":
+        return self
+
+    def __exit__(self, *exc):
+        if not self._f.closed:
+            self.discard()
+        return False
+
+
 def load_policy_chunks() -> List[Dict[str, Any]]:
     if not POLICY_CHUNKS_PATH.exists():
         print(f"[POLICY] chunked_policies.json not found at {POLICY_CHUNKS_PATH}")
         return []
 
-    with POLICY_CHUNKS_PATH.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    if not isinstance(data, list):
+    try:
+        return read_chunks_file(POLICY_CHUNKS_PATH)
+    except ValueError:
         print("[POLICY] chunked_policies.json must contain a list")
         return []
-
-    return data
@@ -1,24 +1,51 @@
+from itertools import count
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
 
-import json
+import numpy as np
+from scipy.sparse import hstack
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+from ..core.config import settings
+from ..core.hot_reload import HotSwap, reload_watcher
+from ..core.keyword_lists import keyword_lists
+from ..core.phrase_matcher import PhraseMatcher
+from .policy_index import (
+    PolicyIndex,
+    file_sha256,
+    keyword_fingerprint,
+    new_vectorizer,
+    read_policy_index,
+    write_policy_index,
+)
+from .policy_loader import read_chunks_file
+from .retrieval import HybridBackend, RetrievalBackend, SparseTfidfBackend, load_dense_backend
 
 
 BASE_DIR = Path(__file__).resolve().parents[2]  # .../backend
-POLICY_FILE = BASE_DIR / "policies" / "chunked_policies.json"
+POLICY_FILE = BASE_DIR / settings.POLICY_CHUNKS_PATH
+POLICY_INDEX_DIR = BASE_DIR / settings.POLICY_VECTOR_STORE_PATH
+DENSE_INDEX_DIR = BASE_DIR / settings.POLICY_DENSE_INDEX_PATH
+EMBEDDING_MODEL_DIR = BASE_DIR / settings.EMBEDDING_MODEL_PATH
+
+# Shared by all instances, so a reloaded store never reuses an old version
+_GENERATIONS = count(1)
 
 
 class PolicyRAGStore:
     """
     TF-IDF based RAG store for policy / handbook chunks.
 
+    Similarities come from a pluggable RetrievalBackend (exact TF-IDF by
+    default, FAISS ANN or hybrid via settings.POLICY_RETRIEVAL_BACKEND).
+
     This version is:
       - category-aware
       - query-intent aware
       - uses per-query keyword filters to avoid random matches
       - de-duplicates near-duplicate chunks from same section/title/category
+      - updatable in place of a refit (with_changes): chunks are appended
+        with the fitted vocabulary and removed ones tombstoned
     """
 
     def __init__(self):
@@ -26,33 +53,324 @@ class PolicyRAGStore:
         self._vectorizer: TfidfVectorizer | None = None
         self._matrix = None
 
+        # Query intent groups + the union of their required keywords, built
+        # once from config so each query / chunk is scanned in one pass.
+        self._intents: List[Dict[str, Any]] = keyword_lists["policy_intents"]
+        self._intent_matcher = PhraseMatcher(
+            {intent["name"]: intent["triggers"] for intent in self._intents}
+        )
+        self._keyword_matcher = PhraseMatcher(
+            {
+                "required": [
+                    kw for intent in self._intents for kw in intent.get("required_keywords", [])
+                ]
+            }
+        )
+        self._keyword_bit: Dict[str, int] = {}
+        for intent in self._intents:
+            for kw in intent.get("required_keywords", []):
+                self._keyword_bit.setdefault(kw.lower(), len(self._keyword_bit))
+
+        # Per-chunk arrays built in index_chunks(); the query path only does
+        # NumPy work over these, never a Python loop over every chunk.
+        self._postings = None  # term x chunk CSR (transpose of _matrix)
+        self._weights = np.zeros(0, dtype=np.float64)
+        self._keyword_bits = np.zeros((0, 0), dtype=np.uint8)  # packed required-keyword bitmask
+        self._category_index: Dict[str, int] = {}
+        self._category_names: List[str] = []
+        self._category_ids = np.zeros(0, dtype=np.int32)
+        self._dedup_index: Dict[str, int] = {}
+        self._dedup_ids = np.zeros(0, dtype=np.int64)  # section|title|category group
+
+        # Incremental updates (with_changes): removed chunks stay in the
+        # arrays, flagged here, until compaction; appended ones count towards
+        # the next refit
+        self._tombstones = np.zeros(0, dtype=bool)
+        self._removed = 0
+        self._appended = 0
+
+        self._sparse_backend: RetrievalBackend | None = None
+        self._backend: RetrievalBackend | None = None
+        # why the configured retrieval backend is not the one in use, or None
+        self._backend_fallback: str | None = None
+        self._generation = 0  # bumped whenever chunks or backend change
+
     def load(self):
+        """
+        Memory-map the prebuilt index (settings.POLICY_VECTOR_STORE_PATH).
+        Falls back to fitting TF-IDF from the chunks JSON when the index is
+        missing, unreadable or was built from a different chunks file.
+        """
+        index = read_policy_index(POLICY_INDEX_DIR)
+        if index is not None and self._index_is_current(index):
+            self.attach_index(index)
+            print(
+                f"[POLICY RAG] Loaded index of {len(self._policies)} chunks from {POLICY_INDEX_DIR} "
+                f"(built {index.manifest.get('built_at')})"
+            )
+            self.configure_backend(settings.POLICY_RETRIEVAL_BACKEND)
+            return
+
         if not POLICY_FILE.exists():
             print(f"[POLICY RAG] No policy file found at {POLICY_FILE}")
             return
 
-        data = json.loads(POLICY_FILE.read_text(encoding="utf-8"))
-        if not isinstance(data, list):
+        try:
+            data = read_chunks_file(POLICY_FILE)
+        except ValueError:
             print("[POLICY RAG] Policy JSON is not a list")
             return
+        if not data:
+            print(f"[POLICY RAG] No policy chunks in {POLICY_FILE}")
+            return
+
+        self.index_chunks(data)
+        print(
+            f"[POLICY RAG] Loaded {len(self._policies)} chunks from {POLICY_FILE} "
+            "(run scripts/build_policy_index.py to skip this fit at startup)"
+        )
+        self.configure_backend(settings.POLICY_RETRIEVAL_BACKEND)
+
+    def configure_backend(self, name: str):
+        """
+        Switch to the "sparse", "dense" or "hybrid" retrieval backend. Falls
+        back to sparse when the dense index cannot serve these chunks (e.g.
+        after an incremental ingest, until scripts/build_vector_store.py
+        rebuilds it); backend_fallback then says why.
+        """
+        self._backend_fallback = None
+        if name == "sparse" or not self.is_ready:
+            self.set_backend(self._sparse_backend)
+            return
+        if name not in ("dense", "hybrid"):
+            print(f"[POLICY RAG] Unknown retrieval backend '{name}'; using sparse")
+            self._backend_fallback = f"unknown retrieval backend '{name}'"
+            self.set_backend(self._sparse_backend)
+            return
+
+        dense = load_dense_backend(DENSE_INDEX_DIR, EMBEDDING_MODEL_DIR, self._policies)
+        if dense is None:
+            print(f"[POLICY RAG] Dense index unavailable; using sparse instead of {name}")
+            self._backend_fallback = (
+                f"{name} configured, but the dense index is missing or was built for other chunks; "
+                "using sparse until scripts/build_vector_store.py rebuilds it"
+            )
+            self.set_backend(self._sparse_backend)
+            return
+
+        if name == "hybrid":
+            self.set_backend(HybridBackend(self._sparse_backend, dense, settings.POLICY_HYBRID_ALPHA))
+        else:
+            self.set_backend(dense)
+        print(f"[POLICY RAG] Using {name} retrieval backend")
+
+    def set_backend(self, backend: RetrievalBackend):
+        self._backend = backend
+        self._generation = next(_GENERATIONS)
+
+    @property
+    def version(self) -> int:
+        """Changes whenever retrieval results may change (index or backend swap)."""
+        return self._generation
+
+    @property
+    def backend(self) -> RetrievalBackend | None:
+        return self._backend
+
+    @property
+    def backend_fallback(self) -> str | None:
+        return self._backend_fallback
+
+    def _index_is_current(self, index: PolicyIndex) -> bool:
+        expected = index.manifest.get("source_sha256")
+        if expected and POLICY_FILE.exists() and file_sha256(POLICY_FILE) != expected:
+            print(f"[POLICY RAG] Index at {POLICY_INDEX_DIR} is stale ({POLICY_FILE} changed); refitting")
+            return False
+        return True
+
+    def index_chunks(self, chunks: List[Dict[str, Any]]):
+        """Fit the TF-IDF matrix and precompute per-chunk weights / bitmasks."""
+        vectorizer = new_vectorizer()
+        matrix = vectorizer.fit_transform([p["text"] for p in chunks])
+        # Rows are already L2-normalised by the vectorizer, so cosine
+        # similarity is a plain sparse product. Keeping the transpose in CSR
+        # makes that product walk only the postings of the query's terms.
+        self._attach(
+            chunks,
+            vectorizer,
+            matrix.T.tocsr(),
+            np.array([float(p.get("weight", 1.0)) for p in chunks], dtype=np.float64),
+        )
 
-        self._policies = data
-        texts = [p["text"] for p in self._policies]
+    def attach_index(self, index: PolicyIndex):
+        """Serve from a prebuilt (memory-mapped) index without refitting."""
+        keyword_bits = index.keyword_bits
+        if index.manifest.get("keyword_fingerprint") != keyword_fingerprint(list(self._keyword_bit)):
+            print("[POLICY RAG] Required keywords changed since the index was built; recomputing bitmasks")
+            keyword_bits = None
+        self._attach(
+            index.chunks,
+            index.vectorizer,
+            index.postings,
+            index.weights,
+            keyword_bits,
+            appended=int(index.manifest.get("appended_since_fit") or 0),
+        )
+
+    def save_index(self, out_dir: Path, source_path: Path | None = None) -> Dict[str, Any]:
+        """Write the fitted store in the on-disk format read by load() (tombstoned chunks left out)."""
+        live = np.flatnonzero(~self._tombstones) if self._removed else None
+        return write_policy_index(
+            out_dir,
+            chunks=self.chunks,
+            vectorizer=self._vectorizer,
+            postings=self._postings if live is None else self._postings[:, live].tocsr(),
+            weights=self._weights if live is None else self._weights[live],
+            keyword_bits=self._keyword_bits if live is None else self._keyword_bits[live],
+            keywords=list(self._keyword_bit),
+            source_path=source_path,
+            appended_since_fit=self._appended,
+        )
 
-        self._vectorizer = TfidfVectorizer(
-            ngram_range=(1, 2),
-            max_df=0.9,
-            min_df=2,
-            stop_words="english",
+    def with_changes(
+        self, added: List[Dict[str, Any]], removed_ids: List[str]
+    ) -> "PolicyRAGStore":
+        """
+        A new store holding this one's chunks minus `removed_ids` plus
+        `added`, without a TF-IDF refit: added chunks are transformed with
+        the fitted vocabulary / idf and appended as postings columns,
+        removed ones are tombstoned. Chunks that reuse a live id replace it.
+
+        Terms the fitted vocabulary lacks are not indexed for appended
+        chunks, so the result is refit from scratch once more than
+        settings.POLICY_INGEST_REFIT_RATIO of it was appended since the last
+        fit, or when less than settings.POLICY_INGEST_MIN_VOCAB_COVERAGE of
+        the added words are in the vocabulary; tombstones are compacted away once they exceed
+        settings.POLICY_INGEST_COMPACT_RATIO. This store is not modified.
+        """
+        removed = set(removed_ids) | {p["id"] for p in added}
+        tombstones = self._tombstones.copy()
+        for row, p in enumerate(self._policies):
+            if not tombstones[row] and p.get("id", f"policy-{row}") in removed:
+                tombstones[row] = True
+
+        fresh = PolicyRAGStore()
+        n_live = len(self._policies) - int(tombstones.sum())
+        if n_live + len(added) == 0:
+            return fresh  # nothing left to index
+        appended = self._appended + len(added)
+        if (
+            n_live == 0
+            or appended > settings.POLICY_INGEST_REFIT_RATIO * (n_live + len(added))
+            or self._vocabulary_coverage(added) < settings.POLICY_INGEST_MIN_VOCAB_COVERAGE
+        ):
+            live = [p for row, p in enumerate(self._policies) if not tombstones[row]]
+            fresh.index_chunks(live + list(added))
+            return fresh
+
+        postings, weights, keyword_bits = self._postings, self._weights, self._keyword_bits
+        if added:
+            columns = self._vectorizer.transform([p["text"] for p in added]).T
+            postings = hstack([postings, columns], format="csr")
+            weights = np.concatenate([weights, [float(p.get("weight", 1.0)) for p in added]])
+            keyword_bits = np.concatenate([keyword_bits, fresh._keyword_bits_for(added)])
+        fresh._set_index(self._policies + list(added), self._vectorizer, postings, weights, appended)
+        fresh._keyword_bits = keyword_bits
+        fresh._category_index, fresh._category_ids = dict(self._category_index), self._category_ids
+        fresh._dedup_index, fresh._dedup_ids = dict(self._dedup_index), self._dedup_ids
+        fresh._add_labels(added)
+        fresh._tombstones = np.concatenate([tombstones, np.zeros(len(added), dtype=bool)])
+        fresh._removed = int(tombstones.sum())
+
+        if fresh._removed > settings.POLICY_INGEST_COMPACT_RATIO * len(fresh._policies):
+            fresh._compact()
+        return fresh
+
+    def _vocabulary_coverage(self, chunks: List[Dict[str, Any]]) -> float:
+        """Share of the chunks' words (unigrams) that the fitted vocabulary has."""
+        if not chunks:
+            return 1.0
+        analyze = self._vectorizer.build_analyzer()
+        vocabulary = getattr(self._vectorizer, "vocabulary_", None) or self._vectorizer.vocabulary
+        words = [term for p in chunks for term in analyze(p["text"]) if " " not in term]
+        return sum(term in vocabulary for term in words) / len(words) if words else 1.0
+
+    def _compact(self):
+        """Drop tombstoned chunks from every per-chunk array (no refit)."""
+        live = np.flatnonzero(~self._tombstones)
+        self._attach(
+            [self._policies[row] for row in live],
+            self._vectorizer,
+            self._postings[:, live].tocsr(),
+            self._weights[live],
+            self._keyword_bits[live],
+            appended=self._appended,
         )
-        self._matrix = self._vectorizer.fit_transform(texts)
 
-        print(f"[POLICY RAG] Loaded {len(self._policies)} chunks from {POLICY_FILE}")
+    def _attach(self, chunks, vectorizer, postings, weights, keyword_bits=None, appended=0):
+        self._set_index(chunks, vectorizer, postings, weights, appended)
+        self._keyword_bits = keyword_bits if keyword_bits is not None else self._keyword_bits_for(chunks)
+        self._category_index, self._category_ids = {}, np.zeros(0, dtype=np.int32)
+        self._dedup_index, self._dedup_ids = {}, np.zeros(0, dtype=np.int64)
+        self._add_labels(chunks)
+
+    def _set_index(self, chunks, vectorizer, postings, weights, appended):
+        self._policies = chunks
+        self._vectorizer = vectorizer
+        self._postings = postings
+        self._matrix = postings.T  # chunk x term view, no copy
+        self._sparse_backend = SparseTfidfBackend(vectorizer, postings)
+        self._backend = self._sparse_backend
+        self._weights = weights
+        self._tombstones = np.zeros(len(chunks), dtype=bool)
+        self._removed = 0
+        self._appended = appended
+        self._generation = next(_GENERATIONS)
+
+    def _keyword_bits_for(self, chunks: List[Dict[str, Any]]) -> np.ndarray:
+        keyword_hits = np.zeros((len(chunks), max(len(self._keyword_bit), 1)), dtype=bool)
+        for idx, p in enumerate(chunks):
+            for kw in self._keyword_matcher.matched_phrases(p["text"]):
+                keyword_hits[idx, self._keyword_bit[kw]] = True
+        return np.packbits(keyword_hits, axis=1)
+
+    def _add_labels(self, chunks: List[Dict[str, Any]]):
+        """Category / dedup-group ids for `chunks`, appended to the existing ones."""
+        category_ids = np.empty(len(chunks), dtype=np.int32)
+        dedup_ids = np.empty(len(chunks), dtype=np.int64)
+        for idx, p in enumerate(chunks):
+            section, title, category = self._chunk_labels(p)
+            category_ids[idx] = self._category_index.setdefault(category, len(self._category_index))
+            dedup_ids[idx] = self._dedup_index.setdefault(
+                f"{section}|{title}|{category}", len(self._dedup_index)
+            )
+        self._category_names = list(self._category_index)
+        self._category_ids = np.concatenate([self._category_ids, category_ids])
+        self._dedup_ids = np.concatenate([self._dedup_ids, dedup_ids])
+
+    @property
+    def chunks(self) -> List[Dict[str, Any]]:
+        """Live chunks (tombstoned ones left out)."""
+        if not self._removed:
+            return self._policies
+        return [p for row, p in enumerate(self._policies) if not self._tombstones[row]]
+
+    def index_stats(self) -> Dict[str, int]:
+        return {
+            "chunks": len(self._policies) - self._removed,
+            "tombstoned": self._removed,
+            "appended_since_fit": self._appended,
+            "terms": len(self._vectorizer.idf_) if self.is_ready else 0,
+        }
 
     @property
     def is_ready(self) -> bool:
         return self._vectorizer is not None and self._matrix is not None
 
+    @staticmethod
+    def _chunk_labels(p: Dict[str, Any]) -> Tuple[str, str, str]:
+        return p.get("section") or "?", p.get("title") or "Policy", p.get("category", "UNKNOWN")
+
     # ---------- query → preferred categories + keyword filters ----------
 
     def _infer_categories_and_keywords(
@@ -64,92 +382,16 @@ class PolicyRAGStore:
           - required keywords that must appear in the policy text
         This keeps results relevant instead of random.
         """
-        q = query.lower()
+        matched_intents = self._intent_matcher.matched_groups(query)
         categories: List[str] = []
         required_keywords: List[str] = []
 
-        # Resume / portfolio / company projects / external sharing of work
-        if any(
-            k in q
-            for k in [
-                "resume",
-                "cv",
-                "portfolio",
-                "company project",
-                "project in resume",
-                "upload project",
-                "put project in",
-                "show work in resume",
-            ]
-        ):
-            categories.extend(["SECURITY_PRIVACY", "CONDUCT_ETHICS", "SOCIAL_MEDIA"])
-            # focus on policies about confidentiality / external sharing
-            required_keywords.extend(
-                [
-                    "confidential",
-                    "proprietary",
-                    "information security",
-                    "social media",
-                    "public",
-                    "external",
-                    "blog",
-                    "website",
-                    "internet",
-                    "email",
-                    "post",
-                    "publish",
-                    "share",
-                    "disclose",
-                ]
-            )
-
-        # Social media / online posting
-        if any(
-            k in q
-            for k in [
-                "social media",
-                "linkedin",
-                "facebook",
-                "twitter",
-                "instagram",
-                "blog",
-                "post on",
-                "post to",
-            ]
-        ):
-            categories.extend(["SOCIAL_MEDIA", "SECURITY_PRIVACY", "CONDUCT_ETHICS"])
-            required_keywords.extend(
-                [
-                    "social media",
-                    "blog",
-                    "website",
-                    "post",
-                    "internet",
-                    "external",
-                    "public",
-                    "email",
-                ]
-            )
-
-        # Salary / compensation
-        if any(k in q for k in ["salary", "ctc", "payroll", "pay day", "compensation", "bonus"]):
-            categories.append("COMPENSATION")
-            # we don't force extra keywords here; salary words are usually enough
-
-        # Leave / holidays / time off
-        if any(k in q for k in ["leave", "holiday", "vacation", "paid time off", "pto", "maternity"]):
-            categories.append("LEAVE_POLICY")
-
-        # Safety / security at workplace
-        if any(k in q for k in ["safety", "accident", "violence", "security", "drug", "alcohol"]):
-            categories.append("SAFETY_SECURITY")
-
-        # Behaviour / ethics / conduct
-        if any(
-            k in q
-            for k in ["behavior", "behaviour", "ethics", "code of conduct", "gift", "bribe", "conflict of interest"]
-        ):
-            categories.append("CONDUCT_ETHICS")
+        # e.g. resume / portfolio, social media, salary, leave, safety, conduct
+        # (see "policy_intents" in core/keyword_lists.py)
+        for intent in self._intents:
+            if intent["name"] in matched_intents:
+                categories.extend(intent.get("categories", []))
+                required_keywords.extend(intent.get("required_keywords", []))
 
         # Remove duplicates but preserve order
         cat_seen = set()
@@ -170,20 +412,56 @@ class PolicyRAGStore:
 
     # ---------- similarity + scoring ----------
 
-    def _similarities(self, query: str) -> List[Tuple[int, float]]:
-        if not self.is_ready:
-            return []
-
-        q_vec = self._vectorizer.transform([query])
-        sims = cosine_similarity(q_vec, self._matrix)[0]
+    def _scores(self, queries: List[str], top_k: int):
+        """(queries x chunks) sparse matrix of backend similarity * weight."""
+        # approximate backends only return a candidate pool per query
+        k = max(settings.POLICY_DENSE_CANDIDATES, top_k * 3)
+        sims = self._backend.search(queries, k)
+        sims.data *= self._weights[sims.indices]
+        return sims
+
+    def _candidates(self, scores, row: int, min_score: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(chunk indices, scores) for one query row that pass min_score."""
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        if min_score > 0:
+            # chunks that share no term with the query score 0 and never pass
+            idx = scores.indices[start:end]
+            vals = scores.data[start:end]
+        else:
+            idx = np.arange(len(self._policies))
+            vals = np.zeros(len(self._policies), dtype=np.float64)
+            vals[scores.indices[start:end]] = scores.data[start:end]
+        keep = vals >= min_score
+        if self._removed:
+            keep &= ~self._tombstones[idx]
+        return idx[keep], vals[keep]
+
+    def _top_distinct(
+        self, idx: np.ndarray, vals: np.ndarray, limit: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best `limit` candidates by score, keeping only the first chunk of each
+        section/title/category group. Ties keep chunk order, like a stable
+        sort. Only the top `m` candidates are ever sorted; `m` doubles when
+        de-duplication leaves fewer than `limit` groups.
+        """
+        n = idx.size
+        m = min(n, limit)
+        while True:
+            if m < n:
+                top = np.argpartition(-vals, m - 1)[:m]
+                # pull in every candidate tied with the cut-off score
+                top = np.flatnonzero(vals >= vals[top].min())
+            else:
+                top = np.arange(n)
 
-        weighted: List[Tuple[int, float]] = []
-        for idx, sim in enumerate(sims):
-            weight = float(self._policies[idx].get("weight", 1.0))
-            weighted.append((idx, float(sim) * weight))
+            order = top[np.lexsort((idx[top], -vals[top]))]
+            _, first = np.unique(self._dedup_ids[idx[order]], return_index=True)
+            distinct = order[np.sort(first)][:limit]
 
-        weighted.sort(key=lambda x: x[1], reverse=True)
-        return weighted
+            if distinct.size >= limit or top.size == n:
+                return idx[distinct], vals[distinct]
+            m = min(n, m * 2)
 
     def find_policies(
         self,
@@ -196,75 +474,79 @@ class PolicyRAGStore:
           - matches: list of policy chunks (max top_k), prioritized
           - alignment_score: aggregated score (0..1)
         """
-        ranked = self._similarities(query)
-        if not ranked:
-            return {"matches": [], "alignment_score": 0.0}
+        return self.find_policies_batch([query], top_k=top_k, min_score=min_score)[0]
 
-        preferred_cats, required_keywords = self._infer_categories_and_keywords(query)
-        required_keywords = [w.lower() for w in required_keywords]
-
-        matches_preferred: List[Dict[str, Any]] = []
-        matches_other: List[Dict[str, Any]] = []
-        scores_for_alignment: List[float] = []
-
-        seen_section_title = set()
-
-        for idx, score in ranked:
-            if score < min_score:
-                continue
-
-            p = self._policies[idx]
-            section = p.get("section") or "?"
-            title = p.get("title") or "Policy"
-            category = p.get("category", "UNKNOWN")
-            text_lower = p["text"].lower()
-
-            # If we have required keywords for this query, enforce them
-            if required_keywords:
-                if not any(kw in text_lower for kw in required_keywords):
-                    continue  # skip policies that don't talk about relevant concepts
-
-            key = f"{section}|{title}|{category}"
-            if key in seen_section_title:
-                # avoid multiple near-identical chunks from same section/title/category
-                continue
-            seen_section_title.add(key)
-
-            item = {
-                "id": p.get("id", f"policy-{idx}"),
-                "section": section,
-                "title": title,
-                "snippet": p["text"][:350],
-                "category": category,
-                "weight": p.get("weight", 1.0),
-                "score": float(score),
-            }
+    def find_policies_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        min_score: float = 0.05,
+    ) -> List[Dict[str, Any]]:
+        """Vectorized find_policies(): one result dict per query, in order."""
+        if not queries:
+            return []
+        if not self.is_ready:
+            return [{"matches": [], "alignment_score": 0.0} for _ in queries]
 
-            if preferred_cats and category in preferred_cats:
-                matches_preferred.append(item)
-                scores_for_alignment.append(float(score))
-            else:
-                matches_other.append(item)
-                scores_for_alignment.append(float(score))
+        scores = self._scores(queries, top_k)
+        return [
+            self._select(query, *self._candidates(scores, row, min_score), top_k)
+            for row, query in enumerate(queries)
+        ]
+
+    def _select(
+        self,
+        query: str,
+        idx: np.ndarray,
+        vals: np.ndarray,
+        top_k: int,
+    ) -> Dict[str, Any]:
+        """Keyword/category filtering + de-dup over one query's candidates."""
+        preferred_cats, required_keywords = self._infer_categories_and_keywords(query)
 
-            # Avoid scanning entire matrix; enough candidates
-            if len(matches_preferred) + len(matches_other) >= top_k * 3:
-                break
+        # If we have required keywords for this query, enforce them: skip
+        # policies that don't talk about relevant concepts
+        if required_keywords and idx.size:
+            wanted = np.zeros(self._keyword_bits.shape[1] * 8, dtype=bool)
+            for w in required_keywords:
+                wanted[self._keyword_bit[w.lower()]] = True
+            wanted = np.packbits(wanted)
+            keep = (self._keyword_bits[idx] & wanted).any(axis=1)
+            idx, vals = idx[keep], vals[keep]
+
+        if not idx.size:
+            return {"matches": [], "alignment_score": 0.0}
 
-        # If we have preferred category matches, use them first
-        ordered_matches: List[Dict[str, Any]] = []
-        ordered_matches.extend(matches_preferred)
+        # avoid multiple near-identical chunks from same section/title/category;
+        # top_k * 3 candidates is enough to fill top_k after category preference
+        idx, vals = self._top_distinct(idx, vals, top_k * 3)
 
-        # If not enough, fill with "other" that survived keyword filter
-        if len(ordered_matches) < top_k:
-            needed = top_k - len(ordered_matches)
-            ordered_matches.extend(matches_other[:needed])
+        preferred_ids = [
+            i for i, name in enumerate(self._category_names) if name in preferred_cats
+        ]
+        is_preferred = np.isin(self._category_ids[idx], preferred_ids)
 
-        # Trim to top_k
-        ordered_matches = ordered_matches[:top_k]
+        # If we have preferred category matches, use them first; if not
+        # enough, fill with "other" that survived keyword filter
+        picked = np.concatenate([np.flatnonzero(is_preferred), np.flatnonzero(~is_preferred)])
+        picked = picked[:top_k]
 
-        if not ordered_matches:
-            return {"matches": [], "alignment_score": 0.0}
+        ordered_matches: List[Dict[str, Any]] = []
+        for pos in picked:
+            chunk_idx = int(idx[pos])
+            p = self._policies[chunk_idx]
+            section, title, category = self._chunk_labels(p)
+            ordered_matches.append(
+                {
+                    "id": p.get("id", f"policy-{chunk_idx}"),
+                    "section": section,
+                    "title": title,
+                    "snippet": p["text"][:350],
+                    "category": category,
+                    "weight": p.get("weight", 1.0),
+                    "score": float(vals[pos]),
+                }
+            )
 
         # Alignment score based on matches actually returned
         score_vals = [m["score"] for m in ordered_matches]
@@ -280,12 +562,27 @@ class PolicyRAGStore:
 
 # Singleton + helper for other modules
 
-policy_rag_store = PolicyRAGStore()
+def _describe(store: PolicyRAGStore) -> Dict[str, Any]:
+    return {
+        **store.index_stats(),
+        "backend": type(store.backend).__name__ if store.backend is not None else None,
+        "backend_fallback": store.backend_fallback,
+        "sources": [str(POLICY_FILE), str(POLICY_INDEX_DIR)],
+    }
+
+
+# Reloadable handle (see core/hot_reload.py); attribute access goes to the
+# live PolicyRAGStore
+policy_rag_store = HotSwap("policy_rag", PolicyRAGStore, _describe)
+
+# Files whose change triggers a reload when the watcher is enabled
+POLICY_WATCH_PATHS = [POLICY_FILE, POLICY_INDEX_DIR / "manifest.json"]
 
 
 def init_policy_rag():
     """Called from app.main startup event."""
-    policy_rag_store.load()
+    policy_rag_store.reload()
+    reload_watcher.watch(policy_rag_store, POLICY_WATCH_PATHS)
 
 
 def get_policy_matches(query: str, top_k: int = 5) -> Tuple[float, List[Dict[str, Any]]]:
@@ -296,3 +593,11 @@ def get_policy_matches(query: str, top_k: int = 5) -> Tuple[float, List[Dict[str
     """
     res = policy_rag_store.find_policies(query, top_k=top_k)
     return res["alignment_score"], res["matches"]
+
+
+def get_policy_matches_batch(
+    queries: List[str], top_k: int = 5
+) -> List[Tuple[float, List[Dict[str, Any]]]]:
+    """Batch version of get_policy_matches, used by POST /analyze/batch."""
+    results = policy_rag_store.find_policies_batch(queries, top_k=top_k)
+    return [(res["alignment_score"], res["matches"]) for res in results]
@@ -0,0 +1,207 @@
+# backend/app/policy/retrieval.py
+
+"""
+Retrieval backends for PolicyRAGStore.
+
+A backend turns a batch of queries into a (queries x chunks) sparse matrix
+of raw similarities; the store then applies chunk weights, keyword /
+category filters and de-duplication the same way for every backend.
+
+  - SparseTfidfBackend: exact TF-IDF cosine (the default)
+  - DenseAnnBackend:    approximate nearest neighbours (FAISS HNSW / IVF)
+                        over EmbeddingModel vectors, top-k per query
+  - HybridBackend:      alpha * sparse + (1 - alpha) * dense
+
+The dense index is built offline by scripts/build_vector_store.py into
+settings.POLICY_DENSE_INDEX_PATH:
+
+    manifest.json   format version, index type, dim, n_chunks,
+                    chunk-id fingerprint, embedding model_id, search params
+    index.faiss     FAISS index, row i = chunk i of the policy index
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from ..core.embeddings import EmbeddingModel
+
+
+DENSE_INDEX_FORMAT_VERSION = 1
+
+
+def chunk_fingerprint(chunks: List[Dict[str, Any]]) -> str:
+    """Identifies the chunk order a dense index was built against."""
+    ids = [str(p.get("id", f"policy-{idx}")) for idx, p in enumerate(chunks)]
+    return hashlib.sha256(json.dumps(ids).encode("utf-8")).hexdigest()
+
+
+class RetrievalBackend:
+    name = "base"
+
+    def search(self, queries: List[str], k: int) -> csr_matrix:
+        """
+        Similarities for each query (rows) against every chunk (columns).
+        Chunks left out are treated as similarity 0. `k` is how many
+        candidates per query an approximate backend should return; exact
+        backends may return more.
+        """
+        raise NotImplementedError
+
+
+class SparseTfidfBackend(RetrievalBackend):
+    name = "sparse"
+
+    def __init__(self, vectorizer, postings: csr_matrix):
+        self._vectorizer = vectorizer
+        self._postings = postings  # term x chunk, rows L2-normalised per chunk
+
+    def search(self, queries: List[str], k: int) -> csr_matrix:
+        return (self._vectorizer.transform(queries) @ self._postings).tocsr()
+
+
+class DenseAnnBackend(RetrievalBackend):
+    name = "dense"
+
+    def __init__(self, embedder: EmbeddingModel, index, n_chunks: int):
+        self._embedder = embedder
+        self._index = index
+        self._n_chunks = n_chunks
+
+    def search(self, queries: List[str], k: int) -> csr_matrix:
+        vectors = self._embedder.encode(queries)
+        sims, ids = self._index.search(vectors, min(k, self._n_chunks))
+
+        # -1 ids pad short result lists; negative cosine counts as no match
+        keep = (ids >= 0) & (sims > 0)
+        rows = np.nonzero(keep)[0]
+        return csr_matrix(
+            (sims[keep].astype(np.float64), (rows, ids[keep])),
+            shape=(len(queries), self._n_chunks),
+        )
+
+
+class HybridBackend(RetrievalBackend):
+    name = "hybrid"
+
+    def __init__(self, sparse: RetrievalBackend, dense: RetrievalBackend, alpha: float = 0.5):
+        self._sparse = sparse
+        self._dense = dense
+        self._alpha = alpha  # weight of the sparse score
+
+    def search(self, queries: List[str], k: int) -> csr_matrix:
+        sparse = self._sparse.search(queries, k)
+        dense = self._dense.search(queries, k)
+        return (sparse * self._alpha + dense * (1.0 - self._alpha)).tocsr()
+
+
+# ---------- dense index build / IO ----------
+
+
+def build_ann_index(vectors: np.ndarray, index_type: str = "hnsw", **params):
+    """
+    FAISS inner-product index over L2-normalised `vectors`.
+
+      - "hnsw": HNSW graph, params m (links per node), ef_construction
+      - "ivf":  inverted lists over k-means cells, params nlist
+      - "flat": exact brute force (reference / tiny corpora)
+    """
+    import faiss
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, params.get("m", 32), faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = params.get("ef_construction", 80)
+    elif index_type == "ivf":
+        nlist = params.get("nlist") or max(1, min(int(4 * np.sqrt(n)), n // 39 or 1))
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+    elif index_type == "flat":
+        index = faiss.IndexFlatIP(dim)
+    else:
+        raise ValueError(f"Unknown ANN index type '{index_type}'")
+
+    index.add(vectors)
+    return index
+
+
+def set_search_params(index, ef_search: Optional[int] = None, nprobe: Optional[int] = None):
+    """Recall / latency knobs: efSearch for HNSW, nprobe for IVF."""
+    if ef_search is not None and hasattr(index, "hnsw"):
+        index.hnsw.efSearch = ef_search
+    if nprobe is not None and hasattr(index, "nprobe"):
+        index.nprobe = nprobe
+
+
+def write_dense_index(
+    out_dir: Path,
+    index,
+    *,
+    index_type: str,
+    chunks: List[Dict[str, Any]],
+    embedder: EmbeddingModel,
+    search_params: Dict[str, Any],
+) -> Dict[str, Any]:
+    import faiss
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    faiss.write_index(index, str(out_dir / "index.faiss"))
+
+    manifest = {
+        "format_version": DENSE_INDEX_FORMAT_VERSION,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "index_type": index_type,
+        "dim": embedder.dim,
+        "n_chunks": len(chunks),
+        "chunk_fingerprint": chunk_fingerprint(chunks),
+        "embedding_model_id": embedder.model_id,
+        "search_params": search_params,
+    }
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def load_dense_backend(
+    index_dir: Path,
+    model_dir: Path,
+    chunks: List[Dict[str, Any]],
+) -> Optional[DenseAnnBackend]:
+    """Dense backend for `chunks`, or None (with a log line) if unusable."""
+    index_dir, model_dir = Path(index_dir), Path(model_dir)
+    manifest_path = index_dir / "manifest.json"
+    if not manifest_path.exists():
+        print(f"[POLICY RAG] No dense index found at {index_dir}")
+        return None
+
+    try:
+        import faiss
+
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("format_version") != DENSE_INDEX_FORMAT_VERSION:
+            print(f"[POLICY RAG] Dense index format {manifest.get('format_version')} is not supported; rebuild it")
+            return None
+        if manifest.get("chunk_fingerprint") != chunk_fingerprint(chunks):
+            print(f"[POLICY RAG] Dense index at {index_dir} was built for other chunks; rebuild it")
+            return None
+
+        embedder = EmbeddingModel.load(model_dir)
+        if embedder.model_id != manifest.get("embedding_model_id"):
+            print(f"[POLICY RAG] Embedding model at {model_dir} does not match the dense index; rebuild it")
+            return None
+
+        index = faiss.read_index(str(index_dir / "index.faiss"))
+    except Exception as e:
+        print(f"[POLICY RAG] Failed to load dense index from {index_dir}: {e}")
+        return None
+
+    set_search_params(index, **manifest.get("search_params", {}))
+    return DenseAnnBackend(embedder, index, len(chunks))
@@ -1,6 +1,6 @@
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+from ..detectors.findings import Finding
 from ..models.schemas import (
-    Detection,
     DetectionType,
     DecisionAction,
     PolicyReference,
@@ -8,15 +8,16 @@ from ..models.schemas import (
 from ..models.schemas import RiskAssessment
 
 
-def evaluate_rules(detections: List[Detection], risk: RiskAssessment) -> Tuple[DecisionAction, List[PolicyReference]]:
+def evaluate_rules(detections: Sequence[Finding], risk: RiskAssessment) -> Tuple[DecisionAction, List[PolicyReference]]:
     """
     Phase 1: rule-of-thumb logic.
     Later, we will integrate real RAG-based policy lookup.
     """
 
-    has_secret = any(d.type in (DetectionType.SECRET_API_KEY, DetectionType.SECRET_GENERIC) for d in detections)
-    has_pii = any(d.type in (DetectionType.PII_EMAIL, DetectionType.PII_PHONE) for d in detections)
-    has_financial = any(d.type == DetectionType.FINANCIAL_DATA for d in detections)
+    types = {d.type for d in detections}
+    has_secret = not types.isdisjoint((DetectionType.SECRET_API_KEY, DetectionType.SECRET_GENERIC))
+    has_pii = not types.isdisjoint((DetectionType.PII_EMAIL, DetectionType.PII_PHONE))
+    has_financial = DetectionType.FINANCIAL_DATA in types
 
     policy_refs: List[PolicyReference] = []
 
@@ -1,14 +1,13 @@
-from typing import List
+from typing import Sequence
+from ..detectors.findings import Finding
 from ..models.schemas import (
-    Detection,
     ConfidenceAssessment,
     ConfidenceFactors,
 )
-from ..models.schemas import DetectionType
 
 
 def compute_confidence(
-    detections: List[Detection],
+    detections: Sequence[Finding],
     policy_match_strength: float = 0.7,
     model_confidence_raw: float = 0.8,
 ) -> ConfidenceAssessment:
@@ -1,13 +1,13 @@
-from typing import List
+from typing import Sequence
+from ..detectors.findings import Finding
 from ..models.schemas import (
-    Detection,
     RiskAssessment,
     RiskLevel,
 )
 from ..core.config import settings
 
 
-def compute_risk(detections: List[Detection]) -> RiskAssessment:
+def compute_risk(detections: Sequence[Finding]) -> RiskAssessment:
     """
     Simple heuristic for Phase 1:
     - Each detection adds to risk score based on severity.
@@ -25,6 +25,8 @@ def compute_risk(detections: List[Detection]) -> RiskAssessment:
     for det in detections:
         w = severity_weights.get(det.severity.value, 10)
         base_score += w
+        if base_score >= 100:
+            break  # clamped below anyway
 
     # Clamp
     base_score = max(0, min(100, base_score))
@@ -1,5 +1,8 @@
-from typing import List
-from ..models.schemas import Detection, DetectionType, TextSpan
+import bisect
+import heapq
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from ..detectors.findings import Finding
+from ..models.schemas import DetectionType, SeverityLevel
 
 
 REDACTION_MAP = {
@@ -10,30 +13,175 @@ REDACTION_MAP = {
     DetectionType.FINANCIAL_DATA: "[REDACTED_AMOUNT]",
 }
 
+_SEVERITY_RANK = {
+    SeverityLevel.LOW: 0,
+    SeverityLevel.MEDIUM: 1,
+    SeverityLevel.HIGH: 2,
+    SeverityLevel.CRITICAL: 3,
+}
+
 
-def apply_redactions(text: str, detections: List[Detection]) -> str:
+def _priority(d: Finding, index: int) -> Tuple[int, int, int]:
+    """
+    Which detection names a merged span: highest severity, then the longest
+    span, then the one reported first.
     """
-    Apply redaction tokens to the text based on detection spans.
-    For simplicity, we assume no overlapping spans.
+    return (_SEVERITY_RANK.get(d.severity, 0), d.end - d.start, -index)
+
+
+class RedactedSpan(NamedTuple):
+    start: int  # original text
+    end: int
+    sanitized_start: int  # the token in the sanitized text
+    sanitized_end: int
+    type: DetectionType
+
+
+class OffsetMap:
+    """
+    Position mapping between the original and the sanitized text.
+
+    Outside redacted spans positions shift by the length difference of the
+    tokens before them; a position inside a redacted span maps to the
+    start of its token (and back to the start of the span).
     """
 
-    # Sort by span start descending so indexes don't shift
-    spans = [d.span for d in detections if d.span is not None]
-    spans = sorted(spans, key=lambda s: s.start, reverse=True)
+    def __init__(self, spans: List[RedactedSpan]):
+        self.spans = spans
+        self._starts = [s.start for s in spans]
+        self._sanitized_starts = [s.sanitized_start for s in spans]
 
-    redacted_text = text
-    for span in spans:
-        # Find matching detection type
-        dtype = None
+    def to_sanitized(self, pos: int) -> int:
+        i = bisect.bisect_right(self._starts, pos) - 1
+        if i < 0:
+            return pos
+        span = self.spans[i]
+        if pos < span.end:
+            return span.sanitized_start
+        return pos + span.sanitized_end - span.end
+
+    def to_original(self, pos: int) -> int:
+        i = bisect.bisect_right(self._sanitized_starts, pos) - 1
+        if i < 0:
+            return pos
+        span = self.spans[i]
+        if pos < span.sanitized_end:
+            return span.start
+        return pos - span.sanitized_end + span.end
+
+
+class RedactionResult(NamedTuple):
+    text: str
+    offset_map: OffsetMap
+
+
+def redact(text: str, detections: Sequence[Finding]) -> RedactionResult:
+    """
+    Replace every detection span with its redaction token in one pass.
+
+    Overlapping spans (e.g. a context-key secret that is also a
+    SECRET_TOKEN_LONG) are merged into one span covering all of them and
+    get a single token, from the most severe detection (see _priority).
+    Spans that only touch are kept apart; empty spans are ignored.
+    O(n + k log k).
+    """
+    spans = sorted((d.start, i, d) for i, d in enumerate(detections) if d.end > d.start)
+
+    parts: List[str] = []
+    redacted: List[RedactedSpan] = []
+    pos = 0  # original text before this offset is already in `parts`
+    out_len = 0
+
+    def flush(start: int, end: int, best: Finding):
+        nonlocal pos, out_len
+        parts.append(text[pos:start])
+        out_len += start - pos
+        token = REDACTION_MAP.get(best.type, "[REDACTED]")
+        parts.append(token)
+        redacted.append(RedactedSpan(start, end, out_len, out_len + len(token), best.type))
+        out_len += len(token)
+        pos = end
+
+    cluster: Optional[List] = None  # [start, end, priority, detection]
+    for start, i, d in spans:
+        if cluster is not None and start < cluster[1]:
+            cluster[1] = max(cluster[1], d.end)
+            priority = _priority(d, i)
+            if priority > cluster[2]:
+                cluster[2], cluster[3] = priority, d
+            continue
+        if cluster is not None:
+            flush(cluster[0], cluster[1], cluster[3])
+        cluster = [start, d.end, _priority(d, i), d]
+    if cluster is not None:
+        flush(cluster[0], cluster[1], cluster[3])
+    parts.append(text[pos:])
+
+    return RedactionResult("".join(parts), OffsetMap(redacted))
+
+
+def apply_redactions(text: str, detections: Sequence[Finding]) -> str:
+    """
+    Apply redaction tokens to the text based on detection spans
+    (overlapping spans are merged, see redact()).
+    """
+    return redact(text, detections).text
+
+
+class StreamRedactor:
+    """
+    redact() for text that arrives in order, piece by piece.
+
+    Detections (absolute offsets) must be added before the text they start
+    in is pushed; push() then returns the redacted form of that piece.
+    Overlapping spans are merged and named the same way as in redact(). A
+    merged span's token is emitted once text past its end has been pushed,
+    since until then a later detection may still overlap it.
+    """
+
+    def __init__(self):
+        self._spans: List[Tuple[int, int, Finding]] = []  # heap of (start, seq, finding)
+        self._seq = 0
+        self._pos = 0  # everything before this offset has been emitted or dropped
+        self._cluster: Optional[List] = None  # [start, end, priority, detection]
+
+    def add(self, detections: Iterable[Finding]):
         for d in detections:
-            if d.span == span:
-                dtype = d.type
-                break
-        replacement = REDACTION_MAP.get(dtype, "[REDACTED]")
-        redacted_text = (
-            redacted_text[:span.start]
-            + replacement
-            + redacted_text[span.end:]
-        )
-
-    return redacted_text
+            if d.end <= d.start:
+                continue
+            self._seq += 1
+            heapq.heappush(self._spans, (d.start, self._seq, d))
+
+    def push(self, offset: int, text: str) -> str:
+        """Redacted form of `text`, the piece of the input starting at `offset`."""
+        end = offset + len(text)
+        cur = max(self._pos, offset)
+        out: List[str] = []
+        spans = self._spans
+        cluster = self._cluster
+        while spans and spans[0][0] < end:
+            start, seq, d = heapq.heappop(spans)
+            if cluster is not None and start < cluster[1]:
+                cluster[1] = max(cluster[1], d.end)
+                priority = _priority(d, seq)
+                if priority > cluster[2]:
+                    cluster[2], cluster[3] = priority, d
+                continue
+            if cluster is not None:
+                out.append(REDACTION_MAP.get(cluster[3].type, "[REDACTED]"))
+                cur = cluster[1]
+            if start > cur:
+                out.append(text[cur - offset:start - offset])
+            cluster = [start, d.end, _priority(d, seq), d]
+            cur = max(cur, start)
+        if cluster is not None and cluster[1] <= end:
+            # nothing pushed later can start before `end`
+            out.append(REDACTION_MAP.get(cluster[3].type, "[REDACTED]"))
+            cur = cluster[1]
+            cluster = None
+        if cluster is None and cur < end:
+            out.append(text[cur - offset:])
+            cur = end
+        self._cluster = cluster
+        self._pos = cluster[1] if cluster is not None else cur
+        return "".join(out)
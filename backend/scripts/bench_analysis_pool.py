@@ -0,0 +1,80 @@
+"""
+Load test: /analyze requests/sec with the analysis process pool at 1..N
+worker processes vs the in-process stage graph (0), in-process (no HTTP),
+with enough requests in flight to keep every worker busy. The decision
+cache is off and audit entries go to a temp store.
+
+    python scripts/bench_analysis_pool.py [--max-workers 8] [--requests 400] [--chars 4000]
+
+Scaling tops out at the number of cores (printed first).
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import Response
+
+from bench_corpus import make_log_prompt, run_sync
+
+import app.api.analyze as analyze_module
+from app.api.analyze import analyze_prompt
+from app.audit import audit_logger
+from app.audit.audit_store import AuditStore
+from app.core.analysis_pool import analysis_pool
+from app.core.decision_cache import DecisionCache
+from app.ml.safety_classifier import init_safety_classifier
+from app.models.schemas import AnalyzeRequest
+from app.policy.rag_store import init_policy_rag
+
+
+async def _load(requests, in_flight):
+    sem = asyncio.Semaphore(in_flight)
+
+    async def one(r):
+        async with sem:
+            await analyze_prompt(r, Response())
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(r) for r in requests))
+    return len(requests) / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--chars", type=int, default=4000)
+    args = parser.parse_args()
+
+    init_policy_rag()
+    init_safety_classifier()
+    analyze_module.decision_cache = DecisionCache(max_entries=0)
+    requests = [
+        AnalyzeRequest(user_id="bench", role="analyst", prompt=make_log_prompt(args.chars, seed=i))
+        for i in range(args.requests)
+    ]
+
+    print(f"cores: {os.cpu_count()}, prompt size: {args.chars} chars")
+    print(f"{'workers':>8} {'req/s':>10} {'vs in-process':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        audit_logger.audit_store = AuditStore(Path(tmp))
+
+        run_sync(_load(requests[:20], 4))  # warm up
+        base = run_sync(_load(requests, 4))
+        print(f"{0:>8} {base:>10.0f} {1.0:>13.2f}x")
+
+        counts = sorted({1, args.max_workers} | {2**i for i in range(1, 8) if 2**i < args.max_workers})
+        for workers in counts:
+            analysis_pool.start(analyze_module._init_analysis_worker, workers=workers)
+            run_sync(_load(requests[:20], 2 * workers))
+            rate = run_sync(_load(requests, 2 * workers))
+            print(f"{workers:>8} {rate:>10.0f} {rate / base:>13.2f}x")
+            analysis_pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: POST /analyze/batch vs N separate /analyze calls (in-process,
+no HTTP), for N = 1, 32, 256. Audit entries go to a temp store.
+
+    python scripts/bench_analyze_batch.py [--repeat 5]
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from fastapi import Response
+
+from bench_corpus import make_chat_prompts, run_sync, time_call
+
+import app.api.analyze as analyze_module
+from app.api.analyze import analyze_prompt, analyze_batch
+from app.audit import audit_logger
+from app.audit.audit_store import AuditStore
+from app.core.decision_cache import DecisionCache
+from app.models.schemas import AnalyzeRequest, AnalyzeBatchRequest
+from app.ml.safety_classifier import init_safety_classifier
+from app.policy.rag_store import init_policy_rag
+
+
+BATCH_SIZES = [1, 32, 256]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    init_policy_rag()
+    init_safety_classifier()
+    # measure the pipeline itself, not repeat-prompt cache hits
+    analyze_module.decision_cache = DecisionCache(max_entries=0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        audit_logger.audit_store = AuditStore(Path(tmp))
+
+        print(f"{'N':>5} {'single prompts/s':>17} {'batch prompts/s':>16} {'speedup':>8}")
+        for n in BATCH_SIZES:
+            requests = [
+                AnalyzeRequest(user_id="bench", role="analyst", prompt=p)
+                for p in make_chat_prompts(n)
+            ]
+            batch = AnalyzeBatchRequest(requests=requests)
+
+            singles = [run_sync(analyze_prompt(r, Response())) for r in requests]
+            batched = analyze_batch(batch).results
+            assert [s.model_dump() for s in singles] == [b.model_dump() for b in batched]
+
+            t_single = time_call(lambda: [run_sync(analyze_prompt(r, Response())) for r in requests], repeat=args.repeat, warmup=1)
+            t_batch = time_call(lambda: analyze_batch(batch), repeat=args.repeat, warmup=1)
+
+            single_rate = n / (t_single["min_ms"] / 1000.0)
+            batch_rate = n / (t_batch["min_ms"] / 1000.0)
+            print(f"{n:>5} {single_rate:>17.0f} {batch_rate:>16.0f} {batch_rate / single_rate:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark: POST /analyze decision cascade vs "full" mode on a realistic
+prompt mix (short chat prompts plus pasted logs of a few KB).
+
+    cpu       CPU time for the whole mix in each mode, run as in an analysis
+              pool worker (stages back to back), the per-stage skip rate of
+              the cascade and how many decisions differ (action or
+              forwarded prompt; expected 0)
+    latency   wall-clock p50 / p95 per request of the in-process stage
+              graph (what POST /analyze waits for), on the mix and on
+              pasted logs of 20k / 100k characters
+    parity    prompts with a secret and harmful intent (the safety
+              classifier's own HARMFUL prompts plus the harmful-intent
+              phrases): action, forwarded prompt and the harmful-intent note
+              in the explanation / timeline must match "full" mode
+
+No decision cache is involved.
+
+    python scripts/bench_analyze_cascade.py [--chat 400] [--logs 40] [--repeat 3]
+"""
+
+import argparse
+import csv
+import json
+import random
+import time
+import warnings
+from collections import Counter
+
+from bench_corpus import BASE_DIR, make_chat_prompts, make_corpus, make_log_prompt, percentiles, run_sync
+
+from app.api.analyze import _run_pipeline, _stages, analyze_in_worker
+from app.core.config import settings
+from app.ml.safety_classifier import init_safety_classifier
+from app.models.schemas import AnalyzeRequest
+from app.policy.rag_store import init_policy_rag
+
+SAFETY_PROMPTS = BASE_DIR / "app" / "ml" / "data" / "safety_prompts.csv"
+HARMFUL_NOTE = "harmful or illegal intent"
+
+
+def run_mix(prompts, mode: str):
+    settings.ANALYZE_CASCADE_MODE = mode
+    outcomes, skipped = [], Counter()
+    t0 = time.process_time()
+    for prompt in prompts:
+        data, _, names, _ = analyze_in_worker(prompt, None)
+        skipped.update(names)
+        response = json.loads(data)
+        action = response["decision"]["action"]
+        outcomes.append((action, None if action == "BLOCK" else response["sanitized_prompt"]))
+    return time.process_time() - t0, outcomes, skipped
+
+
+def latency(prompts, mode: str):
+    """Wall-clock ms per request through the in-process stage graph."""
+    settings.ANALYZE_CASCADE_MODE = mode
+    samples = []
+    for prompt in prompts:
+        payload = AnalyzeRequest(user_id="bench", prompt=prompt)
+        t0 = time.perf_counter()
+        run_sync(_run_pipeline(payload))
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return percentiles(samples, (50, 95))
+
+
+def secret_harmful_prompts():
+    """Harmful prompts with a Stripe or AWS key before or after them."""
+    rng = random.Random(5)
+    with open(SAFETY_PROMPTS, newline="", encoding="utf-8") as f:
+        harmful = [row["text"] for row in csv.DictReader(f) if row["label"] == "HARMFUL"]
+    harmful += make_corpus("harmful", 20)
+    prompts = []
+    for text in harmful:
+        key = rng.choice([
+            f"The api key is sk_live_{rng.getrandbits(80):020x}",
+            f"token AKIA{rng.getrandbits(64):016X}",
+        ])
+        prompts.append(f"{text} {key}" if rng.random() < 0.5 else f"{key} {text}")
+    return prompts
+
+
+def outcome(response):
+    return (
+        response.decision.action.value,
+        response.sanitized_prompt,
+        HARMFUL_NOTE in response.decision.explanation.lower(),
+        any(HARMFUL_NOTE in line.lower() for line in response.safety_timeline),
+    )
+
+
+def parity(prompts):
+    """Prompts whose (action, sanitized_prompt, explanation / timeline note) differ between the modes."""
+    results = {}
+    for mode in ("full", "cascade"):
+        settings.ANALYZE_CASCADE_MODE = mode
+        results[mode] = [
+            outcome(run_sync(_run_pipeline(AnalyzeRequest(user_id="bench", prompt=p)))[0]) for p in prompts
+        ]
+    return [
+        (prompt, full, cascade)
+        for prompt, full, cascade in zip(prompts, results["full"], results["cascade"])
+        if full != cascade
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chat", type=int, default=400)
+    parser.add_argument("--logs", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")  # sklearn version mismatch on unpickle
+    init_safety_classifier()
+    init_policy_rag()
+
+    prompts = make_chat_prompts(args.chat) + [
+        make_log_prompt(2_000 + 500 * (i % 20), seed=i) for i in range(args.logs)
+    ]
+    print(f"{len(prompts)} prompts ({args.chat} chat, {args.logs} pasted logs)")
+
+    best = {}
+    for mode in ("full", "cascade"):
+        runs = [run_mix(prompts, mode) for _ in range(args.repeat)]
+        best[mode] = min(runs, key=lambda r: r[0])
+    (t_full, full, _), (t_cascade, cascade, skipped) = best["full"], best["cascade"]
+
+    print(f"{'mode':<8} {'cpu s':>7} {'ms/prompt':>10}")
+    for mode, t in (("full", t_full), ("cascade", t_cascade)):
+        print(f"{mode:<8} {t:>7.2f} {t * 1000 / len(prompts):>10.2f}")
+    print(f"saved {1 - t_cascade / t_full:.0%} CPU")
+    for spec, _, _ in _stages():
+        print(f"  {spec.name:<10} skip rate {skipped[spec.name] / len(prompts):.0%}")
+    print(f"decisions differing: {sum(a != b for a, b in zip(full, cascade))}")
+
+    print(f"\n{'latency ms':<22} {'full p50':>9} {'p95':>7} {'cascade p50':>12} {'p95':>7}")
+    for name, subset in (
+        ("mix", prompts),
+        ("logs 20k", [make_log_prompt(20_000, seed=i) for i in range(10)]),
+        ("logs 100k", [make_log_prompt(100_000, seed=i) for i in range(5)]),
+    ):
+        latency(subset[:5], "full")  # warm up the stage pool
+        t = {mode: latency(subset, mode) for mode in ("full", "cascade")}
+        print(
+            f"{name:<22} {t['full']['p50']:>9.1f} {t['full']['p95']:>7.1f} "
+            f"{t['cascade']['p50']:>12.1f} {t['cascade']['p95']:>7.1f}"
+        )
+
+    checked = secret_harmful_prompts()
+    differing = parity(checked)
+    print(f"\nsecret + harmful prompts: {len(checked)}, differing from full mode: {len(differing)}")
+    for prompt, full, cascade in differing[:5]:
+        print(f"  {prompt[:70]!r}\n    full {full}\n    cascade {cascade}")
+
+
+if __name__ == "__main__":
+    main()
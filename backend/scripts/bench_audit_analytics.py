@@ -0,0 +1,101 @@
+"""
+Benchmark: dashboard stats from the SQLite rollups vs re-parsing every
+audit line (the only option before AuditAnalytics). Entries are cloned
+from data/audit_logs.jsonl across --hours hours and --users users.
+
+    python scripts/bench_audit_analytics.py [--entries 200000] [--hours 720]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+
+from bench_corpus import BASE_DIR
+
+from app.audit.audit_analytics import AuditAnalytics
+from app.audit.audit_models import AuditLogEntry
+
+
+ACTIONS = ["ALLOW", "REDACT", "REWRITE", "BLOCK"]
+
+
+def full_scan_stats(path: Path):
+    by_action, by_type, by_user = Counter(), Counter(), Counter()
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            entry = AuditLogEntry(**json.loads(line))
+            action = entry.decision["action"]
+            by_action[action] += 1
+            if action != "ALLOW":
+                by_user[entry.user_id] += 1
+            for t, n in entry.detection_summary.get("detection_counts", {}).items():
+                by_type[t] += n
+    return by_action, by_type.most_common(10), by_user.most_common(10)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--hours", type=int, default=720)
+    parser.add_argument("--users", type=int, default=500)
+    args = parser.parse_args()
+
+    templates = [
+        AuditLogEntry(**json.loads(line))
+        for line in (BASE_DIR / "data" / "audit_logs.jsonl").read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    start = min(t.timestamp for t in templates)
+    step = timedelta(hours=args.hours) / args.entries
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl = Path(tmp) / "audit_logs.jsonl"
+        analytics = AuditAnalytics(Path(tmp) / "analytics.db")
+        analytics.open()
+
+        insert_s = 0.0
+        with jsonl.open("w", encoding="utf-8") as f:
+            for base in range(0, args.entries, 512):  # sink-sized batches
+                batch = []
+                for i in range(base, min(base + 512, args.entries)):
+                    t = templates[i % len(templates)]
+                    batch.append(t.model_copy(update={
+                        "timestamp": start + step * i,
+                        "user_id": f"user-{i % args.users}",
+                        "decision": dict(t.decision, action=ACTIONS[i % 7 % 4]),
+                    }))
+                f.write("".join(e.model_dump_json() + "\n" for e in batch))
+                t0 = time.perf_counter()
+                analytics.record(batch)
+                insert_s += time.perf_counter() - t0
+        print(
+            f"recorded {args.entries} entries in {insert_s:.1f}s "
+            f"({args.entries / insert_s:,.0f} entries/s, batches of 512)"
+        )
+
+        mid = start + timedelta(hours=args.hours // 2)
+        cases = [
+            ("full scan", lambda: full_scan_stats(jsonl)),
+            ("by action", lambda: analytics.counts_by_action()),
+            ("by detection", lambda: analytics.counts_by_detection()),
+            ("top users", lambda: analytics.counts_by_user(limit=10)),
+            ("hourly", lambda: analytics.counts_by_hour()),
+            ("by action, 1 day", lambda: analytics.counts_by_action(mid, mid + timedelta(days=1))),
+        ]
+        print(f"{'query':<18} {'best ms':>10}")
+        for name, fn in cases:
+            best = float("inf")
+            for _ in range(1 if name == "full scan" else 5):
+                t0 = time.perf_counter()
+                fn()
+                best = min(best, (time.perf_counter() - t0) * 1000.0)
+            print(f"{name:<18} {best:>10.2f}")
+        analytics.close()
+
+
+if __name__ == "__main__":
+    main()
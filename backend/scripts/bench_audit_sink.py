@@ -0,0 +1,105 @@
+"""
+Benchmark: /analyze latency with the synchronous audit append vs the
+background AuditSink. Audit entries go to a temp file.
+
+    python scripts/bench_audit_sink.py [--requests 2000] [--fsync] [--disk-latency-ms 5]
+
+--fsync makes the synchronous path fsync every entry (durable writes on the
+request path) and runs the sink with fsync_policy="always" (one fsync per
+batch). --disk-latency-ms adds a sleep to every write on both paths to
+emulate a slow or contended disk.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import Response
+
+from bench_corpus import make_chat_prompts, run_sync
+
+import app.api.analyze as analyze_module
+from app.api.analyze import analyze_prompt
+from app.audit.audit_sink import AuditSink
+from app.audit.audit_store import AuditStore
+from app.core.decision_cache import DecisionCache
+from app.ml.safety_classifier import init_safety_classifier
+from app.models.schemas import AnalyzeRequest
+from app.policy.rag_store import init_policy_rag
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return (
+        statistics.median(samples),
+        samples[int(len(samples) * 0.99) - 1],
+        samples[-1],
+    )
+
+
+class SlowDiskStore(AuditStore):
+    delay = 0.0
+
+    def append(self, entries, lines=None):
+        time.sleep(self.delay)
+        super().append(entries, lines)
+
+
+def run(requests, writer):
+    # analyze_prompt looks write_audit_log up in its module at call time
+    analyze_module.write_audit_log = writer
+    samples = []
+    for r in requests:
+        t0 = time.perf_counter()
+        run_sync(analyze_prompt(r, Response()))
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return _percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--fsync", action="store_true")
+    parser.add_argument("--disk-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    SlowDiskStore.delay = args.disk_latency_ms / 1000.0
+
+    init_policy_rag()
+    init_safety_classifier()
+    # both runs analyze the same prompts; keep the second from hitting the cache
+    analyze_module.decision_cache = DecisionCache(max_entries=0)
+    requests = [
+        AnalyzeRequest(user_id="bench", role="analyst", prompt=p)
+        for p in make_chat_prompts(args.requests)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_file = Path(tmp) / "sync.jsonl"
+
+        def sync_writer(entry):
+            time.sleep(SlowDiskStore.delay)
+            with sync_file.open("a", encoding="utf-8") as f:
+                f.write(entry.model_dump_json() + "\n")
+                if args.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+        run(requests[:100], sync_writer)  # warm up caches / allocator
+        sync = run(requests, sync_writer)
+
+        sink = AuditSink(fsync_policy="always" if args.fsync else "interval")
+        sink.start(SlowDiskStore(Path(tmp) / "store"))
+        queued = run(requests, sink.submit)
+        sink.stop()
+
+    print(f"{'writer':<10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    print(f"{'sync':<10} {sync[0]:>8.2f} {sync[1]:>8.2f} {sync[2]:>8.2f}")
+    print(f"{'sink':<10} {queued[0]:>8.2f} {queued[1]:>8.2f} {queued[2]:>8.2f}")
+    print(f"sink stats: {sink.stats()}")
+
+
+if __name__ == "__main__":
+    main()
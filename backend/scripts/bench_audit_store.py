@@ -0,0 +1,103 @@
+"""
+Benchmark: admin log reads on a large audit history, legacy single-file
+readlines() vs the segmented AuditStore. Entries are cloned from
+data/audit_logs.jsonl with shifted timestamps / users / actions.
+
+    python scripts/bench_audit_store.py [--entries 500000] [--segment-mb 64]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from bench_corpus import BASE_DIR
+
+from app.audit.audit_models import AuditLogEntry
+from app.audit.audit_store import AuditStore
+
+
+ACTIONS = ["ALLOW", "REDACT", "REWRITE", "BLOCK"]
+
+
+def legacy_tail(path: Path, limit: int):
+    """What read_audit_logs used to do."""
+    with path.open("r", encoding="utf-8") as f:
+        lines = f.readlines()
+    return [AuditLogEntry(**json.loads(line)) for line in reversed(lines[-limit:])]
+
+
+def _ms(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - t0) * 1000.0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=500_000)
+    parser.add_argument("--segment-mb", type=int, default=64)
+    args = parser.parse_args()
+
+    source = BASE_DIR / "data" / "audit_logs.jsonl"
+    templates = [
+        AuditLogEntry(**json.loads(line))
+        for line in source.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    start = min(t.timestamp for t in templates)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = Path(tmp) / "audit_logs.jsonl"
+        store = AuditStore(Path(tmp) / "audit", max_segment_bytes=args.segment_mb * 1024 * 1024)
+
+        t0 = time.perf_counter()
+        with legacy.open("wb") as f:
+            for base in range(0, args.entries, 5000):
+                batch, lines = [], []
+                for i in range(base, min(base + 5000, args.entries)):
+                    t = templates[i % len(templates)]
+                    decision = dict(t.decision, action=ACTIONS[i % 7 % 4])
+                    entry = t.model_copy(update={
+                        "timestamp": start + timedelta(seconds=i),
+                        "user_id": f"user-{i % 500}",
+                        "decision": decision,
+                    })
+                    batch.append(entry)
+                    lines.append((entry.model_dump_json() + "\n").encode("utf-8"))
+                store.append(batch, lines)
+                f.write(b"".join(lines))
+        size_mb = legacy.stat().st_size / 1e6
+        print(
+            f"wrote {args.entries} entries ({size_mb:.0f} MB, {len(store.segments())} segments) "
+            f"in {time.perf_counter() - t0:.1f}s"
+        )
+
+        mid = start + timedelta(seconds=args.entries // 2)
+        page = store.query(limit=50)
+        deep = page
+        for _ in range(20):
+            deep = store.query(limit=50, cursor=deep.next_cursor)
+
+        cases = [
+            ("legacy tail 50", lambda: legacy_tail(legacy, 50)),
+            ("store tail 50", lambda: store.query(limit=50)),
+            ("store page 21", lambda: store.query(limit=50, cursor=deep.next_cursor)),
+            ("store user", lambda: store.query(limit=50, user_id="user-7")),
+            ("store action", lambda: store.query(limit=50, action="BLOCK")),
+            ("store 1h window", lambda: store.query(
+                limit=50, since=mid, until=mid + timedelta(hours=1))),
+        ]
+        print(f"{'query':<18} {'best ms':>10}")
+        for name, fn in cases:
+            print(f"{name:<18} {_ms(fn, repeat=3 if name.startswith('legacy') else 5):>10.2f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark: time to first token of POST /complete/stream against the model
+backend's own, with a stand-in OpenAI-compatible server
+(fake_llm_server.py) in place of the model.
+
+    backend      streaming /v1/chat/completions straight from the stand-in
+    stream       POST /api/complete/stream (outbound scan + redaction)
+
+TTFT is the first answer text received (for the proxy: the first "token"
+event), total the whole answer. The second table replays the answer token
+by token through the outbound scanner: tokens received before the first
+text is released and mean text held back, with the word hold used by
+/complete/stream vs a fixed overlap as used by POST /analyze/stream, and
+the scan cost per token.
+
+Last, a regression check for the word hold: answers with a key-phrase
+secret (the configured phrases plus longer ones such as "private key")
+are fed one token at a time, split inside the phrase; the findings must
+match DetectorEngine.detect() on the whole answer and no secret may be
+released.
+
+    python scripts/bench_complete_stream.py [--requests 20] [--ttft-ms 80] [--token-ms 10] [--tokens 200]
+"""
+
+import argparse
+import random
+import re
+import time
+
+import httpx
+
+from bench_corpus import percentiles
+from fake_llm_server import answer_tokens, create_app, start_server
+
+from fastapi import FastAPI
+
+from app.api import complete
+from app.core.config import settings
+from app.detectors.engine import DetectorEngine, _case_insensitive, default_pattern_specs
+from app.detectors.stream_scanner import StreamScanner
+from app.llm.outbound import OutboundScan
+
+
+def _timed_stream(client: httpx.Client, url: str, body: dict, first_marker: bytes):
+    started = time.perf_counter()
+    ttft = None
+    with client.stream("POST", url, json=body) as response:
+        for line in response.iter_lines():
+            if ttft is None and line.encode("utf-8").startswith(first_marker):
+                ttft = time.perf_counter() - started
+    return ttft * 1000, (time.perf_counter() - started) * 1000
+
+
+def replay(tokens, scanner_factory):
+    scan = OutboundScan(secret_action="redact")
+    scan.scanner = scanner_factory()
+    first, held, released = None, 0, 0
+    started = time.perf_counter()
+    for i, token in enumerate(tokens, 1):
+        released += len(scan.feed(token))
+        if first is None and released:
+            first = i
+        held += scan.scanner.chars - scan.scanner._emitted
+    per_token_us = (time.perf_counter() - started) / len(tokens) * 1e6
+    scan.finish()
+    return first, held / len(tokens), per_token_us
+
+
+SPLIT_PHRASES = ("private key", "aws secret access key")
+SPLIT_SECRET = "Zx9QwErTyUiOp1234"
+
+
+def phrase_engine(phrases) -> DetectorEngine:
+    """The default detectors plus key phrases, as if added to keyword_lists.json."""
+    specs = default_pattern_specs()
+    context = next(spec for spec in specs if spec.context)
+    for phrase in phrases:
+        specs.insert(2, context._replace(
+            name=f"CONTEXT_{phrase.upper().replace(' ', '_')}",
+            regex=re.compile(_case_insensitive(phrase)),
+            extra={**context.extra, "phrase": phrase},
+        ))
+    return DetectorEngine(specs)
+
+
+def split_phrase_check(samples: int = 200):
+    """Answers (phrase-split secret, phone, amount) fed token by token: (answers, failures)."""
+    engine = phrase_engine(SPLIT_PHRASES)
+    phrases = SPLIT_PHRASES + tuple(spec.extra["phrase"] for spec in default_pattern_specs() if spec.context)
+    rng = random.Random(7)
+    cases = [[" Use the", " private", " ke", f"y: {SPLIT_SECRET} now."]]
+    for phrase in phrases:
+        text = f"Here is the {phrase}: {SPLIT_SECRET} for staging, call +91 9812345678 about $ 1,200."
+        for _ in range(samples):
+            cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, 25)))
+            cases.append([text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])])
+
+    failures = 0
+    for tokens in cases:
+        text = "".join(tokens)
+        scan = OutboundScan(secret_action="redact")
+        scan.scanner = StreamScanner(engine=engine, window_chars=1, overlap_chars=0, word_hold=True)
+        out = "".join(scan.feed(token) for token in tokens) + scan.finish()
+        found = sorted((d.start, d.end, d.type.value) for d in scan.sample)
+        expected = sorted((d.start, d.end, d.type.value) for d in engine.detect(text))
+        if found != expected or SPLIT_SECRET in out:
+            failures += 1
+    return len(cases), failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--ttft-ms", type=float, default=80.0)
+    parser.add_argument("--token-ms", type=float, default=10.0)
+    parser.add_argument("--tokens", type=int, default=200)
+    args = parser.parse_args()
+
+    backend_url = start_server(create_app(args.ttft_ms, args.token_ms, args.tokens))
+    settings.LLM_BASE_URL = backend_url
+    proxy = FastAPI()
+    proxy.include_router(complete.router, prefix=settings.API_V1_PREFIX)
+    proxy_url = start_server(proxy)
+
+    backend_body = {"model": "local", "messages": [{"role": "user", "content": "plan?"}], "stream": True}
+    decision = {
+        "action": "ALLOW",
+        "risk": {"score": 0, "level": "LOW", "explanation": ""},
+        "confidence": {"score": 90, "factors": {"model_confidence": 0.9, "detector_agreement": 1.0, "policy_alignment": 0.0}},
+        "policy_refs": [],
+        "explanation": "",
+    }
+    proxy_body = {"user_id": "bench", "sanitized_prompt": "plan?", "decision": decision}
+
+    cases = [
+        ("backend", f"{backend_url}/v1/chat/completions", backend_body, b'data: {"object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {"content"'),
+        ("stream", f"{proxy_url}{settings.API_V1_PREFIX}/complete/stream", proxy_body, b"event: token"),
+    ]
+    print(f"stand-in: ttft {args.ttft_ms:.0f} ms, {args.token_ms:.0f} ms/token, {args.tokens} tokens")
+    print(f"{'case':<8} {'ttft p50 ms':>12} {'ttft max ms':>12} {'total p50 ms':>13}")
+    with httpx.Client(timeout=60) as client:
+        for name, url, body, marker in cases:
+            _timed_stream(client, url, body, marker)  # warm-up
+            runs = [_timed_stream(client, url, body, marker) for _ in range(args.requests)]
+            ttft = percentiles([r[0] for r in runs], (50, 100))
+            total = percentiles([r[1] for r in runs], (50,))
+            print(f"{name:<8} {ttft['p50']:>12.1f} {ttft['p100']:>12.1f} {total['p50']:>13.1f}")
+
+    tokens = answer_tokens(args.tokens, secret=True)
+    print(f"\n{'hold':<22} {'first text after':>17} {'mean held chars':>16} {'scan us/token':>14}")
+    for name, factory in [
+        ("word (/complete)", lambda: StreamScanner(window_chars=1, overlap_chars=0, word_hold=True)),
+        ("64 chars", lambda: StreamScanner(window_chars=1, overlap_chars=64)),
+        (f"{settings.STREAM_OVERLAP_CHARS} chars (/analyze)", lambda: StreamScanner(window_chars=1, overlap_chars=settings.STREAM_OVERLAP_CHARS)),
+    ]:
+        first, held, us = replay(tokens, factory)
+        first = f"{first} tokens" if first is not None else "end of answer"
+        print(f"{name:<22} {first:>17} {held:>16.1f} {us:>14.1f}")
+
+    answers, failures = split_phrase_check()
+    print(f"\nphrase-split secrets: {answers} answers fed token by token, {failures} differing from detect() or leaked")
+
+
+if __name__ == "__main__":
+    main()
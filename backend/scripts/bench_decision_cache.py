@@ -0,0 +1,74 @@
+"""
+Benchmark: /analyze throughput on repetitive traffic with the decision
+cache off vs on (in-process, no HTTP). Traffic mixes --repeat-share
+prompts drawn from a small pool of canned prompts with unique ones.
+Audit entries go to a temp store.
+
+    python scripts/bench_decision_cache.py [--requests 3000] [--repeat-share 0.6]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import Response
+
+from bench_corpus import make_chat_prompts, make_log_prompt, run_sync
+
+import app.api.analyze as analyze_module
+from app.api.analyze import analyze_prompt
+from app.audit import audit_logger
+from app.audit.audit_store import AuditStore
+from app.core.decision_cache import DecisionCache
+from app.ml.safety_classifier import init_safety_classifier
+from app.models.schemas import AnalyzeRequest
+from app.policy.rag_store import init_policy_rag
+
+
+def run(requests):
+    t0 = time.perf_counter()
+    responses = [run_sync(analyze_prompt(r, Response())) for r in requests]
+    return len(requests) / (time.perf_counter() - t0), responses
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--repeat-share", type=float, default=0.6)
+    parser.add_argument("--pool", type=int, default=50)
+    args = parser.parse_args()
+
+    init_policy_rag()
+    init_safety_classifier()
+
+    rng = random.Random(3)
+    # canned prompts: a pasted system prompt / log block + short suffixes
+    pool = [make_log_prompt(2000, seed=s) + "\n" + p for s, p in enumerate(make_chat_prompts(args.pool, seed=5))]
+    unique = make_chat_prompts(args.requests, seed=9)
+    prompts = [
+        rng.choice(pool) if rng.random() < args.repeat_share else unique[i]
+        for i in range(args.requests)
+    ]
+    requests = [AnalyzeRequest(user_id=f"user-{i % 20}", role="analyst", prompt=p) for i, p in enumerate(prompts)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        audit_logger.audit_store = AuditStore(Path(tmp))
+
+        analyze_module.decision_cache = DecisionCache(max_entries=0)
+        run(requests[:100])  # warm up
+        off_rate, off = run(requests)
+
+        cache = analyze_module.decision_cache = DecisionCache()
+        on_rate, on = run(requests)
+
+    assert [a.model_dump() for a in off] == [b.model_dump() for b in on]
+    print(f"{'cache':<6} {'req/s':>10}")
+    print(f"{'off':<6} {off_rate:>10.0f}")
+    print(f"{'on':<6} {on_rate:>10.0f}   ({on_rate / off_rate:.2f}x)")
+    print(f"cache stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
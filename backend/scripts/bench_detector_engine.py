@@ -0,0 +1,56 @@
+"""
+Benchmark: single-pass DetectorEngine vs the per-detector path
+(detect_pii + detect_secrets + detect_financial).
+
+    python scripts/bench_detector_engine.py [--repeat 20]
+"""
+
+import argparse
+
+from bench_corpus import make_log_prompt, time_call
+
+from app.detectors.engine import detector_engine
+from app.detectors.pii_detector import detect_pii
+from app.detectors.secret_detector import detect_secrets
+from app.detectors.financial_detector import detect_financial
+
+
+SIZES = [1_000, 5_000, 20_000, 50_000]
+
+
+def per_detector_path(text: str):
+    detections = []
+    detections.extend(detect_pii(text))
+    detections.extend(detect_secrets(text))
+    detections.extend(detect_financial(text))
+    return detections
+
+
+def _keys(detections):
+    return [(d.type, d.start, d.end) for d in detections]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'findings':>9} {'per-detector ms':>16} {'engine ms':>10} {'speedup':>8} {'same':>5}")
+    for size in SIZES:
+        text = make_log_prompt(size)
+
+        legacy = per_detector_path(text)
+        engine = detector_engine.detect(text)
+        same = _keys(legacy) == _keys(engine)
+
+        t_legacy = time_call(lambda: per_detector_path(text), repeat=args.repeat)
+        t_engine = time_call(lambda: detector_engine.detect(text), repeat=args.repeat)
+
+        print(
+            f"{len(text):>8} {len(engine):>9} {t_legacy['min_ms']:>16.2f} "
+            f"{t_engine['min_ms']:>10.2f} {t_legacy['min_ms'] / t_engine['min_ms']:>7.2f}x {str(same):>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
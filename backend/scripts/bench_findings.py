@@ -0,0 +1,98 @@
+"""
+Benchmark: detector hits as compact Finding records (converted to the
+public Detection schema once, when the response is built) vs one validated
+Detection + TextSpan model per hit, the previous representation, on
+high-finding prompts (secret-heavy log pastes).
+
+For each prompt size it reports the detector pass with either
+representation (time, and memory allocated for the hit list, measured with
+tracemalloc in a separate run), and the whole request as it is now:
+detectors, decision (risk, rules, redaction, response models) and
+model_dump_json().
+
+    python scripts/bench_findings.py [--lines 200 1000 4000] [--repeat 10]
+"""
+
+import argparse
+import random
+import tracemalloc
+import warnings
+
+from bench_corpus import _token, time_call
+
+from app.api.analyze import build_analyze_response
+from app.detectors.engine import detector_engine
+from app.models.schemas import AnalyzeRequest, Detection, TextSpan
+
+
+def make_secret_paste(lines: int, seed: int = 3) -> str:
+    """Log lines with a long token, a Stripe key, an e-mail and an amount each (5 hits per line)."""
+    rng = random.Random(seed)
+    return "\n".join(
+        f"token={_token(rng, 32)} api key: sk_live_{_token(rng, 20)} "
+        f"notify ops{i}@corp.example.com refund ${rng.randint(1, 9999)}.50"
+        for i in range(lines)
+    )
+
+
+def detect_as_models(text: str):
+    """The previous detector output: a validated Detection (and TextSpan) per hit."""
+    return [
+        Detection(
+            type=f.type,
+            severity=f.severity,
+            span=TextSpan(start=f.start, end=f.end, text=text[f.start:f.end]),
+            extra=dict(f.extra),
+        )
+        for f in detector_engine.detect(text)
+    ]
+
+
+def allocated_kb(fn) -> float:
+    """Memory still held by fn()'s result."""
+    tracemalloc.start()
+    result = fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, nargs="+", default=[200, 1000, 4000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    print(
+        f"{'chars':>8} {'findings':>9} {'models ms':>10} {'models KB':>10} {'findings ms':>12} "
+        f"{'findings KB':>12} {'decision ms':>12} {'dump ms':>8} {'request ms':>11}"
+    )
+    for lines in args.lines:
+        text = make_secret_paste(lines)
+        payload = AnalyzeRequest(user_id="bench", prompt=text)
+        findings = detector_engine.detect(text)
+
+        def request():
+            response = build_analyze_response(payload, None, 0.0, 0.0, [], detector_engine.detect(text), False, {})
+            return response.model_dump_json()
+
+        t_models = time_call(lambda: detect_as_models(text), repeat=args.repeat)["min_ms"]
+        t_findings = time_call(lambda: detector_engine.detect(text), repeat=args.repeat)["min_ms"]
+        t_decision = time_call(
+            lambda: build_analyze_response(payload, None, 0.0, 0.0, [], findings, False, {}), repeat=args.repeat
+        )["min_ms"]
+        response = build_analyze_response(payload, None, 0.0, 0.0, [], findings, False, {})
+        t_dump = time_call(response.model_dump_json, repeat=args.repeat)["min_ms"]
+        t_request = time_call(request, repeat=args.repeat)["min_ms"]
+
+        print(
+            f"{len(text):>8} {len(findings):>9} {t_models:>10.2f} {allocated_kb(lambda: detect_as_models(text)):>10.0f} "
+            f"{t_findings:>12.2f} {allocated_kb(lambda: detector_engine.detect(text)):>12.0f} "
+            f"{t_decision:>12.2f} {t_dump:>8.2f} {t_request:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: /analyze pipeline latency while the policy index and safety model
+are hot-reloaded every --interval-ms, vs no reloads. Calls that straddle a
+swap finish on the old instance, so the tail should only grow by the CPU
+the reload itself takes.
+
+    python scripts/bench_hot_reload.py [--seconds 5] [--interval-ms 250]
+"""
+
+import argparse
+import threading
+import time
+import warnings
+
+from bench_corpus import make_chat_prompts, percentiles
+
+from app.api.analyze import analyze_in_worker
+from app.ml.safety_classifier import init_safety_classifier, safety_classifier
+from app.policy.rag_store import init_policy_rag, policy_rag_store
+
+
+def run(prompts, seconds: float, interval_ms: float):
+    latencies, reloads, stop = [], 0, threading.Event()
+
+    def reloader():
+        nonlocal reloads
+        while not stop.wait(interval_ms / 1000.0):
+            policy_rag_store.reload()
+            safety_classifier.reload()
+            reloads += 1
+
+    thread = threading.Thread(target=reloader) if interval_ms > 0 else None
+    if thread:
+        thread.start()
+    deadline = time.perf_counter() + seconds
+    i = 0
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        analyze_in_worker(prompts[i % len(prompts)], None)
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        i += 1
+    stop.set()
+    if thread:
+        thread.join()
+    return latencies, reloads
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--interval-ms", type=float, default=250.0)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")  # sklearn version mismatch on unpickle
+    init_policy_rag()
+    init_safety_classifier()
+    prompts = make_chat_prompts(200)
+
+    print(f"{'case':<16} {'calls':>6} {'reloads':>8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7}")
+    for name, interval in (("no reloads", 0.0), (f"every {args.interval_ms:g} ms", args.interval_ms)):
+        latencies, reloads = run(prompts, args.seconds, interval)
+        p = percentiles(latencies)
+        print(f"{name:<16} {len(latencies):>6} {reloads:>8} {p['p50']:>7.2f} {p['p99']:>7.2f} {max(latencies):>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: per-request serialization cost for large analyze responses
+(secret-heavy pastes, hundreds to thousands of detections).
+
+    response     POST /analyze body: FastAPI's response_model path
+                 (validate the returned model, then pydantic's JSON
+                 serializer) vs json_codec.model_json
+    audit write  build_audit_entry + one log line: model_dump_json() vs
+                 encode_audit_entry (json_codec)
+    audit read   one log line back to an AuditLogEntry: model_validate_json
+                 vs decode_audit_entry
+    admin logs   GET /admin/logs body for a page of 50 such entries:
+                 response_model=list[AuditLogEntry] vs ModelJSONResponse
+
+"same" checks that both sides produce the same bytes / entries.
+
+    python scripts/bench_json_codec.py [--lines 20 200 1000] [--repeat 20]
+"""
+
+import argparse
+import warnings
+from typing import List
+
+from bench_findings import make_secret_paste
+from bench_corpus import time_call
+
+from fastapi import FastAPI
+
+from app.api.analyze import build_analyze_response, router as analyze_router
+from app.audit.audit_models import AuditLogEntry, build_audit_entry, decode_audit_entry, encode_audit_entry
+from app.core.json_codec import ModelJSONResponse, model_json, orjson
+from app.detectors.engine import detector_engine
+from app.models.schemas import AnalyzeRequest
+
+_app = FastAPI()
+
+
+@_app.get("/logs", response_model=List[AuditLogEntry])
+def _logs():  # only here for its response field
+    return []
+
+
+def response_field(app_router, path: str):
+    return next(route for route in app_router.routes if route.path == path).response_field
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, nargs="+", default=[20, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    analyze_field = response_field(analyze_router, "/analyze")
+    logs_field = response_field(_app.router, "/logs")
+    print(f"encoder: {'orjson' if orjson is not None else 'json (orjson not installed)'}")
+    print(f"{'detections':>10} {'case':<12} {'previous ms':>12} {'json_codec ms':>14} {'speedup':>8} {'same':>5}")
+
+    for lines in args.lines:
+        text = make_secret_paste(lines)
+        payload = AnalyzeRequest(user_id="bench", prompt=text)
+        response = build_analyze_response(payload, None, 0.0, 0.0, [], detector_engine.detect(text), False, {})
+        entry = build_audit_entry(payload, response)
+        line = encode_audit_entry(entry)
+        page = [entry] * 50
+
+        def fastapi_response():
+            value, _ = analyze_field.validate(response, {}, loc=("response",))
+            return analyze_field.serialize_json(value)
+
+        def fastapi_logs():
+            value, _ = logs_field.validate(page, {}, loc=("response",))
+            return logs_field.serialize_json(value)
+
+        cases = [
+            ("response", fastapi_response, lambda: model_json(response), None),
+            (
+                "audit write",
+                lambda: (build_audit_entry(payload, response).model_dump_json() + "\n").encode("utf-8"),
+                lambda: encode_audit_entry(build_audit_entry(payload, response)),
+                lambda: (entry.model_dump_json() + "\n").encode("utf-8") == line,
+            ),
+            (
+                "audit read",
+                lambda: AuditLogEntry.model_validate_json(line),
+                lambda: decode_audit_entry(line),
+                lambda: AuditLogEntry.model_validate_json(line) == decode_audit_entry(line),
+            ),
+            ("admin logs", fastapi_logs, lambda: ModelJSONResponse(page).body, None),
+        ]
+        for name, previous, codec, same in cases:
+            same = same() if same is not None else previous() == codec()
+            t_prev = time_call(previous, repeat=args.repeat)["min_ms"]
+            t_codec = time_call(codec, repeat=args.repeat)["min_ms"]
+            print(
+                f"{len(response.detection_summary.detections):>10} {name:<12} {t_prev:>12.2f} "
+                f"{t_codec:>14.2f} {t_prev / t_codec:>7.1f}x {str(same):>5}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark: the pooled, concurrency-limited model backend client
+(app/llm/backend_client.py) against a stand-in OpenAI-compatible server
+(fake_llm_server.py).
+
+    sequential   N answers one after the other: a new httpx client per
+                 request vs the shared keep-alive pool (TTFT, total time,
+                 TCP connections the server saw)
+    burst        C answers started at once, without an effective cap
+                 (cap = C) and with the in-flight cap: TTFT percentiles,
+                 mean queue wait, wall time and the most streams the
+                 server ran at once; then with a small queue (how many
+                 are turned away)
+    cancel       streams abandoned halfway: aborted on the server, slots freed
+    timeout      a server slower than the read timeout
+
+    python scripts/bench_llm_client.py [--requests 20] [--burst 32] [--cap 4]
+"""
+
+import argparse
+import asyncio
+import time
+from contextlib import aclosing
+
+import httpx
+
+from bench_corpus import percentiles
+from fake_llm_server import create_app, start_server
+
+from app.core.json_codec import dumps
+from app.llm.backend_client import LLMBackendBusy, LLMBackendClient, LLMBackendError
+
+BODY = {"model": "local", "messages": [{"role": "user", "content": "plan?"}], "max_tokens": 512, "stream": True}
+
+
+async def unpooled_answer(base_url: str):
+    """Previous style: a client (and connection) per request."""
+    started = time.perf_counter()
+    ttft = None
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        async with client.stream("POST", "/v1/chat/completions", content=dumps(BODY)) as response:
+            async for line in response.aiter_lines():
+                if ttft is None and '"content"' in line:
+                    ttft = time.perf_counter() - started
+    return ttft * 1000, (time.perf_counter() - started) * 1000
+
+
+async def pooled_answer(client: LLMBackendClient):
+    started = time.perf_counter()
+    ttft = None
+    async for _ in client.stream_chat("plan?"):
+        if ttft is None:
+            ttft = time.perf_counter() - started
+    return ttft * 1000, (time.perf_counter() - started) * 1000
+
+
+async def sequential(args):
+    print(f"{'sequential':<12} {'ttft p50 ms':>12} {'total p50 ms':>13} {'connections':>12}")
+    for name in ("per-request", "pooled"):
+        app = create_app(args.ttft_ms, args.token_ms, args.tokens)
+        url = start_server(app)
+        client = LLMBackendClient(max_in_flight=args.cap)
+        client.start(url)
+        runs = []
+        for _ in range(args.requests):
+            runs.append(await (unpooled_answer(url) if name == "per-request" else pooled_answer(client)))
+        await client.stop()
+        ttft = percentiles([r[0] for r in runs], (50,))["p50"]
+        total = percentiles([r[1] for r in runs], (50,))["p50"]
+        print(f"{name:<12} {ttft:>12.1f} {total:>13.1f} {len(app.state.peers):>12}")
+
+
+async def burst(args):
+    print(
+        f"\n{'burst':<12} {'ttft p50 ms':>12} {'ttft p95 ms':>12} {'queue mean ms':>14} "
+        f"{'wall ms':>8} {'server max':>11} {'rejected':>9}"
+    )
+    for name, cap, queued in (
+        (f"cap {args.burst}", args.burst, args.burst),
+        (f"cap {args.cap}", args.cap, args.burst),
+        (f"cap {args.cap} q {args.cap}", args.cap, args.cap),
+    ):
+        app = create_app(args.ttft_ms, args.token_ms, args.tokens)
+        client = LLMBackendClient(max_in_flight=cap, max_queued=queued)
+        client.start(start_server(app))
+
+        async def one():
+            try:
+                return await pooled_answer(client)
+            except LLMBackendBusy:
+                return None
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one() for _ in range(args.burst)))
+        wall = (time.perf_counter() - started) * 1000
+        done = [r for r in results if r is not None]
+        ttft = percentiles([r[0] for r in done], (50, 95))
+        stats = client.stats()
+        print(
+            f"{name:<12} {ttft['p50']:>12.1f} {ttft['p95']:>12.1f} {stats['mean_queue_wait_ms']:>14.1f} "
+            f"{wall:>8.0f} {app.state.max_active:>11} {stats['rejected']:>9}"
+        )
+        await client.stop()
+
+
+async def cancel(args):
+    app = create_app(args.ttft_ms, args.token_ms, args.tokens)
+    client = LLMBackendClient(max_in_flight=args.cap)
+    client.start(start_server(app))
+
+    async def half():
+        async with aclosing(client.stream_chat("plan?")) as tokens:
+            n = 0
+            async for _ in tokens:
+                n += 1
+                if n == args.tokens // 2:
+                    await asyncio.sleep(3600)  # a client that stopped reading
+
+    tasks = [asyncio.ensure_future(half()) for _ in range(args.cap)]
+    await asyncio.sleep((args.ttft_ms + args.token_ms * args.tokens) / 1000)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.sleep(0.2)
+    stats = client.stats()
+    print(
+        f"\ncancel: {len(tasks)} streams cancelled halfway -> server aborted {app.state.aborted}, "
+        f"client cancelled {stats['cancelled']}, in flight {stats['in_flight']}"
+    )
+    ttft, _ = await pooled_answer(client)  # slots are free again
+    print(f"        next request ttft {ttft:.1f} ms")
+    await client.stop()
+
+
+async def timeout(args):
+    app = create_app(ttft_ms=500, token_ms=args.token_ms, tokens=args.tokens)
+    client = LLMBackendClient(read_timeout_s=0.1)
+    client.start(start_server(app))
+    started = time.perf_counter()
+    try:
+        await pooled_answer(client)
+        outcome = "no timeout"
+    except LLMBackendError as e:
+        outcome = str(e)
+    print(f"\ntimeout: read timeout 100 ms, server ttft 500 ms -> {outcome} after {(time.perf_counter() - started) * 1000:.0f} ms")
+    await client.stop()
+
+
+async def run(args):
+    await sequential(args)
+    await burst(args)
+    await cancel(args)
+    await timeout(args)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--burst", type=int, default=32)
+    parser.add_argument("--cap", type=int, default=4)
+    parser.add_argument("--ttft-ms", type=float, default=50.0)
+    parser.add_argument("--token-ms", type=float, default=2.0)
+    parser.add_argument("--tokens", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: PhraseMatcher vs per-phrase substring scans as the phrase list grows.
+
+    python scripts/bench_phrase_matcher.py [--repeat 20]
+"""
+
+import argparse
+import random
+import string
+
+from bench_corpus import make_log_prompt, time_call
+
+from app.core.keyword_lists import keyword_lists
+from app.core.phrase_matcher import PhraseMatcher
+
+
+def _phrases(extra: int, seed: int = 1):
+    base = [p for group in keyword_lists["harmful_intent"].values() for p in group]
+    rng = random.Random(seed)
+    for _ in range(extra):
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))) for _ in range(2)]
+        base.append(" ".join(words))
+    return base
+
+
+def substring_scan(text: str, phrases):
+    lower_text = text.lower()
+    return [p for p in phrases if p in lower_text]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    text = make_log_prompt(50_000)
+    print(f"{'phrases':>8} {'substring ms':>13} {'matcher ms':>11} {'speedup':>8}")
+    for extra in (0, 200, 500, 1000):
+        phrases = _phrases(extra)
+        matcher = PhraseMatcher({"all": phrases})
+
+        assert sorted(set(substring_scan(text, phrases))) == sorted(matcher.matched_phrases(text))
+
+        t_sub = time_call(lambda: substring_scan(text, phrases), repeat=args.repeat)
+        t_match = time_call(lambda: matcher.find_all(text), repeat=args.repeat)
+        print(
+            f"{len(phrases):>8} {t_sub['min_ms']:>13.2f} {t_match['min_ms']:>11.2f} "
+            f"{t_sub['min_ms'] / t_match['min_ms']:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: dense ANN / hybrid policy retrieval vs the exact TF-IDF path on a
+synthetic corpus (default 1M chunks; needs several GB of RAM at that size).
+
+    python scripts/bench_policy_ann.py [--chunks 1000000] [--index hnsw|ivf] [--queries 200]
+
+Reports per-query find_policies latency for each backend and
+  - ann recall@10: ANN top-10 vs exact brute-force search over the same
+    embeddings (how much the approximation loses)
+  - tfidf overlap@5: share of the exact TF-IDF top-5 policies that the
+    backend also returns (how close it stays to the current path)
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from bench_policy_topk import QUERIES, make_chunks
+
+from app.core.embeddings import EmbeddingModel
+from app.policy.rag_store import PolicyRAGStore
+from app.policy.retrieval import (
+    DenseAnnBackend,
+    HybridBackend,
+    build_ann_index,
+    set_search_params,
+)
+
+
+def make_queries(chunks, n: int, seed: int = 5):
+    rng = random.Random(seed)
+    queries = list(QUERIES)
+    while len(queries) < n:
+        words = rng.choice(chunks)["text"].split()
+        start = rng.randrange(max(1, len(words) - 10))
+        queries.append(" ".join(words[start : start + rng.randint(4, 10)]))
+    return queries[:n]
+
+
+def top_ids(backend, query: str, k: int):
+    row = backend.search([query], k)
+    order = np.argsort(-row.data, kind="stable")[:k]
+    return set(row.indices[order].tolist())
+
+
+def time_queries(store: PolicyRAGStore, queries):
+    samples = []
+    results = []
+    for q in queries:
+        t0 = time.perf_counter()
+        results.append(store.find_policies(q))
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples), results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=1_000_000)
+    parser.add_argument("--index", choices=["hnsw", "ivf"], default="hnsw")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--fit-sample", type=int, default=20_000, help="chunks used to fit the embedding model")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    chunks = make_chunks(args.chunks)
+    store = PolicyRAGStore()
+    store.index_chunks(chunks)
+    sparse = store.backend
+    print(f"corpus: {len(chunks)} chunks, TF-IDF fit {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    texts = [p["text"] for p in chunks]
+    sample = random.Random(1).sample(texts, min(args.fit_sample, len(texts)))
+    embedder = EmbeddingModel.fit(sample, dim=args.dim)
+    vectors = embedder.encode(texts)
+    print(f"embeddings: dim={embedder.dim}, {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    ann_index = build_ann_index(vectors, args.index)
+    exact_index = build_ann_index(vectors, "flat")
+    print(f"{args.index} index build: {time.perf_counter() - t0:.1f}s")
+    del vectors
+
+    dense = DenseAnnBackend(embedder, ann_index, len(chunks))
+    exact_dense = DenseAnnBackend(embedder, exact_index, len(chunks))
+    queries = make_queries(chunks, args.queries)
+
+    store.set_backend(sparse)
+    sparse_ms, sparse_results = time_queries(store, queries)
+    print()
+    print(f"{'backend':<24} {'p50 ms':>8} {'ann recall@10':>14} {'tfidf overlap@5':>16}")
+    print(f"{'sparse (exact tf-idf)':<24} {sparse_ms:>8.2f} {'-':>14} {1.0:>16.3f}")
+
+    knobs = [{"ef_search": ef} for ef in (16, 64, 256)] if args.index == "hnsw" else [
+        {"nprobe": p} for p in (4, 16, 64)
+    ]
+    for knob in knobs:
+        set_search_params(ann_index, **knob)
+        recalls = [
+            len(top_ids(dense, q, 10) & top_ids(exact_dense, q, 10)) / max(1, len(top_ids(exact_dense, q, 10)))
+            for q in queries
+        ]
+        label = ",".join(f"{k}={v}" for k, v in knob.items())
+        for name, backend in (("dense", dense), ("hybrid", HybridBackend(sparse, dense))):
+            store.set_backend(backend)
+            ms, results = time_queries(store, queries)
+            overlaps = []
+            for exact, got in zip(sparse_results, results):
+                want = {m["id"] for m in exact["matches"]}
+                if want:
+                    overlaps.append(len(want & {m["id"] for m in got["matches"]}) / len(want))
+            print(
+                f"{name + ' ' + label:<24} {ms:>8.2f} {statistics.fmean(recalls):>14.3f} "
+                f"{statistics.fmean(overlaps) if overlaps else 0.0:>16.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark: building policy chunks for a corpus of PDFs + text files with
+the chunk pipeline (process pool, page-range tasks, chunks streamed to a
+JSON Lines file) at several worker counts, vs the previous path (one
+process reads every document whole, keeps all chunks in a list, writes
+one JSON array). Reports throughput and the peak RSS of the process that
+collects the chunks (each case runs in a fresh child process; pool workers
+are not included), which should stay flat as --pdfs grows for the pipeline.
+
+    python scripts/bench_policy_chunking.py [--pdfs 8] [--txt 200] [--workers 1 2 4]
+
+The corpus is copies of the PDFs in policies/source plus synthetic .txt
+documents, in a temp directory.
+"""
+
+import argparse
+import json
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+from bench_corpus import BASE_DIR
+
+from app.policy.chunk_pipeline import (
+    DOCUMENT_SUFFIXES,
+    MIN_CHUNK_CHARS,
+    PipelineStats,
+    chunk_text_by_paragraphs,
+    iter_document_chunks,
+)
+from app.policy.ingest import SOURCE_DIR
+from app.policy.policy_loader import ChunksFileWriter
+
+
+def make_corpus(root: Path, pdfs: int, txt: int) -> list:
+    source = json.loads((BASE_DIR / "policies" / "chunked_policies.json").read_text(encoding="utf-8"))
+    words = " ".join(p["text"] for p in source).split()
+    rng = random.Random(9)
+    originals = sorted(SOURCE_DIR.glob("*.pdf"))
+    for i in range(pdfs if originals else 0):
+        shutil.copy(originals[i % len(originals)], root / f"policy-{i:04d}.pdf")
+    for i in range(txt):
+        paras = []
+        for j in range(40):
+            start = rng.randrange(len(words) - 120)
+            paras.append(f"{j + 1}.{rng.randint(1, 9)} " + " ".join(words[start : start + rng.randint(40, 120)]))
+        (root / f"policy-{i:04d}.txt").write_text("\n\n".join(paras), encoding="utf-8")
+    return sorted(p for p in root.iterdir() if p.suffix.lower() in DOCUMENT_SUFFIXES)
+
+
+def previous_path(paths, out: Path) -> int:
+    """Serial: whole-document text, every chunk kept in one list, one json.dumps."""
+    from PyPDF2 import PdfReader
+
+    all_chunks = []
+    for path in paths:
+        if path.suffix == ".txt":
+            text = path.read_text(encoding="utf-8", errors="ignore")
+        else:
+            pages_text = []
+            for page in PdfReader(str(path)).pages:
+                try:
+                    pages_text.append(page.extract_text() or "")
+                except Exception:
+                    continue
+            text = "\n\n".join(pages_text)
+        all_chunks.extend(chunk_text_by_paragraphs(text, path.name))
+    filtered = [ch for ch in all_chunks if len(ch["text"]) > MIN_CHUNK_CHARS]
+    out.write_text(json.dumps(filtered, ensure_ascii=False, indent=2), encoding="utf-8")
+    return len(filtered)
+
+
+def pipeline(paths, out: Path, workers: int, stats: PipelineStats) -> int:
+    with ChunksFileWriter(out) as writer:
+        for doc in iter_document_chunks([(p.name, p) for p in paths], workers=workers, stats=stats):
+            for chunk in doc.chunks:
+                writer.write(chunk)
+        writer.commit()
+    return writer.count
+
+
+def run_case(src: Path, case: str, workers: int, out: Path):
+    """Child process: one case over the corpus in `src`; prints a JSON result line."""
+    warnings.filterwarnings("ignore")
+    paths = sorted(p for p in src.iterdir() if p.suffix.lower() in DOCUMENT_SUFFIXES)
+    stats = PipelineStats(len(paths))
+    t0 = time.perf_counter()
+    if case == "previous":
+        chunks = previous_path(paths, out)
+    else:
+        chunks = pipeline(paths, out, workers, stats)
+    elapsed = time.perf_counter() - t0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    print(json.dumps({"chunks": chunks, "seconds": elapsed, "peak_rss_mb": peak_mb, "pages": stats.pages}))
+
+
+def measure(src: Path, case: str, workers: int, out: Path) -> dict:
+    proc = subprocess.run(
+        [sys.executable, __file__, "--run", case, "--dir", str(src), "--workers", str(workers), "--out", str(out)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pdfs", type=int, default=8)
+    parser.add_argument("--txt", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--run", choices=["previous", "pipeline"], help=argparse.SUPPRESS)
+    parser.add_argument("--dir", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--out", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run_case(args.dir, args.run, args.workers[0], args.out)
+        return
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench-policy-chunking-"))
+    try:
+        src = tmp / "source"
+        src.mkdir()
+        paths = make_corpus(src, args.pdfs, args.txt)
+        mb = sum(p.stat().st_size for p in paths) / 1e6
+        print(f"corpus: {args.pdfs} PDFs + {args.txt} .txt ({mb:.1f} MB)")
+        print(f"{'path':<30} {'chunks':>8} {'seconds':>8} {'MB/s':>7} {'pages/s':>8} {'peak RSS MB':>12}")
+
+        cases = [("previous (serial, in memory)", "previous", 1, "previous.json")]
+        cases += [(f"pipeline, {w} worker(s)", "pipeline", w, "chunks.jsonl") for w in args.workers]
+        for label, case, workers, out in cases:
+            r = measure(src, case, workers, tmp / out)
+            pages = f"{r['pages'] / r['seconds']:.1f}" if case == "pipeline" else "-"
+            print(
+                f"{label:<30} {r['chunks']:>8} {r['seconds']:>8.2f} {mb / r['seconds']:>7.2f} "
+                f"{pages:>8} {r['peak_rss_mb']:>12.1f}"
+            )
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: updating the policy chunks + index after one document changes,
+incremental (re-chunk that document, append / tombstone its chunks, no
+TF-IDF refit) vs the previous full rebuild (re-read and re-chunk every
+document, refit, write the index), plus how often the two agree on the
+top-5 policies for a set of chat prompts.
+
+    python scripts/bench_policy_ingest.py [--docs 200] [--paragraphs 40]
+
+Runs in a temp directory: --docs synthetic .txt documents built from the
+words of policies/chunked_policies.json plus a copy of every PDF in
+policies/source.
+"""
+
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+from bench_corpus import BASE_DIR, make_chat_prompts
+
+from app.policy.ingest import SOURCE_DIR, PolicyIngestor
+from app.policy.rag_store import PolicyRAGStore
+
+
+def make_document(words, paragraphs: int, rng: random.Random) -> str:
+    paras = []
+    for i in range(paragraphs):
+        start = rng.randrange(len(words) - 120)
+        paras.append(f"{i + 1}.{rng.randint(1, 9)} " + " ".join(words[start : start + rng.randint(40, 120)]))
+    return "\n\n".join(paras)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - t0) * 1000.0
+
+
+def full_rebuild(ingestor: PolicyIngestor, index_dir: Path):
+    """The previous path: every document re-read and chunked, TF-IDF refit."""
+    delta, t_chunk = timed(lambda: ingestor.sync(full=True))
+    store = PolicyRAGStore()
+    _, t_index = timed(lambda: store.index_chunks(delta.added))
+    _, t_save = timed(lambda: store.save_index(index_dir, source_path=ingestor.chunks_path))
+    return store, {"chunk": t_chunk, "index": t_index, "save": t_save}
+
+
+def incremental(ingestor: PolicyIngestor, store: PolicyRAGStore, index_dir: Path):
+    delta, t_chunk = timed(ingestor.sync)
+    fresh, t_index = timed(lambda: store.with_changes(delta.added, delta.removed_ids))
+    _, t_save = timed(lambda: fresh.save_index(index_dir, source_path=ingestor.chunks_path))
+    return fresh, {"chunk": t_chunk, "index": t_index, "save": t_save}
+
+
+def top5(store: PolicyRAGStore, queries):
+    return [[m["id"] for m in res["matches"]] for res in store.find_policies_batch(queries)]
+
+
+def report(name: str, t):
+    total = sum(t.values())
+    print(f"{name:<34} {t['chunk']:>9.1f} {t['index']:>9.1f} {t['save']:>9.1f} {total:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--paragraphs", type=int, default=40)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    rng = random.Random(5)
+    source = json.loads((BASE_DIR / "policies" / "chunked_policies.json").read_text(encoding="utf-8"))
+    words = " ".join(p["text"] for p in source).split()
+    queries = make_chat_prompts(200)
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench-policy-ingest-"))
+    try:
+        src = tmp / "source"
+        src.mkdir()
+        for pdf in SOURCE_DIR.glob("*.pdf"):
+            shutil.copy(pdf, src / pdf.name)
+        for i in range(args.docs):
+            (src / f"doc-{i:04d}.txt").write_text(make_document(words, args.paragraphs, rng), encoding="utf-8")
+        ingestor = PolicyIngestor(src, tmp / "chunks.json", tmp / "manifest.json")
+        index_dir = tmp / "index"
+
+        print(f"{'case (ms)':<34} {'chunk':>9} {'index':>9} {'save':>9} {'total':>9}")
+        store, t = full_rebuild(ingestor, index_dir)
+        report(f"initial build ({len(store.chunks)} chunks)", t)
+
+        edited = src / "doc-0007.txt"
+        edited.write_text(make_document(words, args.paragraphs, rng), encoding="utf-8")
+        store, t = incremental(ingestor, store, index_dir)
+        report("edit 1 doc: incremental", t)
+        (src / "doc-0011.txt").unlink()
+        store, t = incremental(ingestor, store, index_dir)
+        report("delete 1 doc: incremental", t)
+        (src / "doc-new.txt").write_text(make_document(words, args.paragraphs, rng), encoding="utf-8")
+        store, t = incremental(ingestor, store, index_dir)
+        report("add 1 doc: incremental", t)
+
+        refit, t = full_rebuild(ingestor, index_dir)
+        report("same changes: full rebuild", t)
+
+        stats = store.index_stats()
+        agree = sum(a == b for a, b in zip(top5(store, queries), top5(refit, queries)))
+        print(
+            f"incremental index: {stats['chunks']} chunks, {stats['tombstoned']} tombstoned, "
+            f"{stats['appended_since_fit']} appended since fit; "
+            f"top-5 identical to the refit for {agree}/{len(queries)} prompts"
+        )
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
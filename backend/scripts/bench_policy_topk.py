@@ -0,0 +1,110 @@
+"""
+Benchmark: PolicyRAGStore top-k lookup on synthetic handbook corpora of
+growing size, vs the previous path (dense cosine row, Python list of
+(idx, score) for every chunk, full sort, Python filter loop).
+
+    python scripts/bench_policy_topk.py [--sizes 500 5000 50000 200000] [--repeat 10]
+
+Synthetic chunks are built from the words of policies/chunked_policies.json.
+"""
+
+import argparse
+import json
+import random
+
+from bench_corpus import BASE_DIR, time_call
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.policy.rag_store import PolicyRAGStore
+
+
+QUERIES = [
+    "Can I put my company project in my resume?",
+    "Is it okay to post about work on LinkedIn?",
+    "When is salary and bonus paid?",
+    "How many days of maternity leave do I get?",
+    "What should I do after a workplace accident?",
+]
+
+
+def make_chunks(n: int, seed: int = 3):
+    source = json.loads((BASE_DIR / "policies" / "chunked_policies.json").read_text(encoding="utf-8"))
+    words = " ".join(p["text"] for p in source).split()
+    rng = random.Random(seed)
+    chunks = []
+    for i in range(n):
+        base = source[i % len(source)]
+        start = rng.randrange(len(words) - 120)
+        chunks.append(
+            {
+                "id": f"synthetic-{i}",
+                "section": f"{base.get('section')}.{i // 50}",
+                "title": base.get("title"),
+                "category": base.get("category", "UNKNOWN"),
+                "weight": base.get("weight", 1.0),
+                "text": " ".join(words[start : start + rng.randint(40, 120)]),
+            }
+        )
+    return chunks
+
+
+def legacy_find_policies(store: PolicyRAGStore, query: str, top_k: int = 5, min_score: float = 0.05):
+    """The pre-vectorization ranking loop, kept here as the baseline."""
+    sims = cosine_similarity(store._vectorizer.transform([query]), store._matrix)[0]
+    ranked = [
+        (idx, float(sim) * float(store._policies[idx].get("weight", 1.0)))
+        for idx, sim in enumerate(sims)
+    ]
+    ranked.sort(key=lambda x: x[1], reverse=True)
+
+    preferred_cats, required = store._infer_categories_and_keywords(query)
+    required = {w.lower() for w in required}
+    preferred, other, seen = [], [], set()
+    for idx, score in ranked:
+        if score < min_score:
+            continue
+        p = store._policies[idx]
+        text = p["text"].lower()
+        if required and not any(kw in text for kw in required):
+            continue
+        key = "|".join(store._chunk_labels(p))
+        if key in seen:
+            continue
+        seen.add(key)
+        (preferred if p.get("category", "UNKNOWN") in preferred_cats else other).append(idx)
+        if len(preferred) + len(other) >= top_k * 3:
+            break
+    return (preferred + other[: max(top_k - len(preferred), 0)])[:top_k]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5_000, 50_000, 200_000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'chunks':>8} {'legacy ms':>10} {'top-k ms':>9} {'speedup':>8} {'same':>5}")
+    for size in args.sizes:
+        store = PolicyRAGStore()
+        store.index_chunks(make_chunks(size))
+
+        same = all(
+            [m["id"] for m in store.find_policies(q)["matches"]]
+            == [store._policies[i].get("id") for i in legacy_find_policies(store, q)]
+            for q in QUERIES
+        )
+
+        t_legacy = time_call(lambda: [legacy_find_policies(store, q) for q in QUERIES], repeat=args.repeat)
+        t_new = time_call(lambda: [store.find_policies(q) for q in QUERIES], repeat=args.repeat)
+
+        per_q_legacy = t_legacy["min_ms"] / len(QUERIES)
+        per_q_new = t_new["min_ms"] / len(QUERIES)
+        print(
+            f"{size:>8} {per_q_legacy:>10.2f} {per_q_new:>9.3f} "
+            f"{per_q_legacy / per_q_new:>7.1f}x {str(same):>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
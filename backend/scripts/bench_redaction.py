@@ -0,0 +1,80 @@
+"""
+Benchmark: single-pass redact() vs the previous apply_redactions()
+(string rebuilt per span, type looked up with a scan over all detections).
+
+Prompts are pasted logs with thousands of findings, including the usual
+overlaps (a context-key secret that is also a SECRET_TOKEN_LONG). "same"
+compares both on the overlap-free subset of spans, where the old version
+was correct; the old one is skipped above --legacy-max findings.
+
+    python scripts/bench_redaction.py [--sizes 50000 200000 500000 2000000] [--legacy-max 3000]
+"""
+
+import argparse
+
+from bench_corpus import make_log_prompt, time_call
+
+from app.detectors.engine import detector_engine
+from app.sanitize.redact import REDACTION_MAP, redact
+
+
+def legacy_apply_redactions(text, detections):
+    spans = sorted(((d.start, d.end) for d in detections), reverse=True)
+
+    redacted_text = text
+    for start, end in spans:
+        dtype = None
+        for d in detections:
+            if (d.start, d.end) == (start, end):
+                dtype = d.type
+                break
+        replacement = REDACTION_MAP.get(dtype, "[REDACTED]")
+        redacted_text = redacted_text[:start] + replacement + redacted_text[end:]
+    return redacted_text
+
+
+def overlap_free(detections):
+    """Detections whose span overlaps no other one."""
+    kept, group, end = [], [], -1
+    for d in sorted(detections, key=lambda d: d.start):
+        if d.start >= end:
+            if len(group) == 1:
+                kept.extend(group)
+            group = []
+        group.append(d)
+        end = max(end, d.end)
+    if len(group) == 1:
+        kept.extend(group)
+    return kept
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50_000, 200_000, 500_000, 2_000_000])
+    parser.add_argument("--legacy-max", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'chars':>9} {'findings':>9} {'merged':>7} {'legacy ms':>10} {'redact ms':>10} {'speedup':>8} {'same':>5}")
+    for size in args.sizes:
+        text = make_log_prompt(size)
+        detections = detector_engine.detect(text)
+        result = redact(text, detections)
+
+        t_new = time_call(lambda: redact(text, detections), repeat=args.repeat)["min_ms"]
+        if len(detections) <= args.legacy_max:
+            t_old = time_call(lambda: legacy_apply_redactions(text, detections), repeat=1, warmup=0)["min_ms"]
+            clean = overlap_free(detections)
+            same = legacy_apply_redactions(text, clean) == redact(text, clean).text
+            legacy, speedup, same = f"{t_old:.1f}", f"{t_old / t_new:.0f}x", str(same)
+        else:
+            legacy = speedup = same = "-"
+
+        print(
+            f"{len(text):>9} {len(detections):>9} {len(result.offset_map.spans):>7} "
+            f"{legacy:>10} {t_new:>10.2f} {speedup:>8} {same:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
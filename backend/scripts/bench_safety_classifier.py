@@ -0,0 +1,67 @@
+"""
+Benchmark: compiled safety classifier vs the sklearn pipeline: load time,
+per-call latency on chat prompts and pasted logs, batch scoring, and the
+largest probability difference.
+
+Export the artifact first if needed:
+    python app/ml/train_safety_classifier.py --export-only
+    python scripts/bench_safety_classifier.py [--repeat 200]
+"""
+
+import argparse
+import time
+import warnings
+
+import joblib
+import numpy as np
+
+from bench_corpus import make_chat_prompts, make_log_prompt, time_call
+
+from app.ml.compiled_classifier import CompiledClassifier
+from app.ml.safety_classifier import COMPILED_MODEL_PATH, MODEL_PATH
+
+
+def best_load_ms(load, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        load()
+        best = min(best, (time.perf_counter() - t0) * 1000.0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")  # sklearn version mismatch on unpickle
+    pipeline = joblib.load(MODEL_PATH)
+    compiled = CompiledClassifier.load(COMPILED_MODEL_PATH)
+    if compiled is None:
+        raise SystemExit(f"No compiled model at {COMPILED_MODEL_PATH}; run the export first")
+
+    print(
+        f"load: pipeline {best_load_ms(lambda: joblib.load(MODEL_PATH)):.2f} ms, "
+        f"compiled {best_load_ms(lambda: CompiledClassifier.load(COMPILED_MODEL_PATH)):.2f} ms"
+    )
+
+    chat = make_chat_prompts(500)
+    cases = [
+        ("chat prompt", [chat[0]]),
+        ("1k log", [make_log_prompt(1_000)]),
+        ("5k log", [make_log_prompt(5_000)]),
+        ("20k log", [make_log_prompt(20_000)]),
+        ("batch of 500 chat", chat),
+    ]
+    print(f"{'case':<18} {'pipeline ms':>12} {'compiled ms':>12} {'speedup':>8} {'max |dp|':>9}")
+    for name, texts in cases:
+        repeat = max(5, args.repeat // len(texts))
+        t_pipe = time_call(lambda: pipeline.predict_proba(texts), repeat=repeat)["min_ms"]
+        t_comp = time_call(lambda: compiled.predict_proba(texts), repeat=repeat)["min_ms"]
+        diff = float(np.abs(pipeline.predict_proba(texts) - compiled.predict_proba(texts)).max())
+        print(f"{name:<18} {t_pipe:>12.3f} {t_comp:>12.3f} {t_pipe / t_comp:>7.1f}x {diff:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
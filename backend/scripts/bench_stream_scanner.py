@@ -0,0 +1,79 @@
+"""
+Benchmark: StreamScanner (+ StreamRedactor) fed in upload-sized chunks vs
+DetectorEngine.detect() + redact() on the whole text. Reports time, peak
+traced memory and whether the spans agree. Both peaks include the span
+keys collected for the comparison; times include tracemalloc overhead.
+
+    python scripts/bench_stream_scanner.py [--mb 1 8 32] [--chunk-kb 64]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from bench_corpus import make_log_prompt
+
+from app.detectors.engine import detector_engine
+from app.detectors.stream_scanner import StreamScanner
+from app.sanitize.redact import StreamRedactor, redact
+
+
+def _keys(detections):
+    return [(d.type, d.start, d.end) for d in detections]
+
+
+def one_shot(text: str):
+    detections = detector_engine.detect(text)
+    redact(text, detections)
+    return _keys(detections)
+
+
+def streamed(text: str, chunk_chars: int):
+    scanner, redactor = StreamScanner(), StreamRedactor()
+    detections, max_buffered = [], 0
+    for i in range(0, len(text), chunk_chars):
+        update = scanner.feed(text[i:i + chunk_chars])
+        redactor.add(update.detections)
+        redactor.push(update.offset, update.text)
+        detections.extend(_keys(update.detections))
+        max_buffered = max(max_buffered, scanner.buffered_chars)
+    update = scanner.finish()
+    redactor.add(update.detections)
+    redactor.push(update.offset, update.text)
+    detections.extend(_keys(update.detections))
+    return detections, max_buffered
+
+
+def measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    args = parser.parse_args()
+
+    print(
+        f"{'MB':>4} {'findings':>9} {'one-shot s':>11} {'peak MB':>8} "
+        f"{'stream s':>9} {'peak MB':>8} {'buffered':>9} {'same':>5}"
+    )
+    for mb in args.mb:
+        # the source text itself is allocated before tracing starts
+        text = make_log_prompt(mb * 2**20)
+        ref, t_ref, peak_ref = measure(lambda: one_shot(text))
+        (got, buffered), t_stream, peak_stream = measure(lambda: streamed(text, args.chunk_kb * 1024))
+        print(
+            f"{mb:>4} {len(ref):>9} {t_ref:>11.2f} {peak_ref:>8.1f} "
+            f"{t_stream:>9.2f} {peak_stream:>8.1f} {buffered:>9} {str(sorted(ref) == sorted(got)):>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
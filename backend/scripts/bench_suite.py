@@ -0,0 +1,263 @@
+"""
+Gateway benchmark suite: microbenchmarks of the analysis building blocks
+and a load test of POST /api/analyze, written to one JSON file that can be
+compared with a previous run to catch regressions.
+
+  1. corpora   synthetic prompts per kind (bench_corpus.CORPUS_KINDS):
+               clean, pii, secret, long, harmful
+  2. micro     per-call time of each detector, the combined detector
+               engine, PolicyRAGStore.find_policies,
+               SafetyClassifier.classify and apply_redactions on every
+               corpus (best of --repeat passes over the corpus)
+  3. load      --requests POSTs at --concurrency in flight, in-process
+               through the ASGI app (startup / shutdown included) or
+               against a running server with --url; throughput and
+               p50 / p95 / p99 latency overall and per prompt kind.
+               Every prompt is made unique so the decision cache does not
+               answer it.
+  4. report    JSON (default data/bench/<git commit>.json); with --baseline
+               each time is compared with the old file and the exit code is
+               1 if one got slower (or throughput lower) by more than
+               --tolerance
+
+    python scripts/bench_suite.py [--quick] [--baseline data/bench/abc1234.json]
+    python scripts/bench_suite.py --skip-micro --url http://127.0.0.1:8000 --concurrency 32
+
+In-process runs write their audit entries to a temp directory unless
+AUDIT_LOG_DIR / AUDIT_ANALYTICS_DB_PATH are set.
+"""
+
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from bench_corpus import BASE_DIR, CORPUS_KINDS, make_corpus, percentiles, time_call
+
+# must be set before the app settings are imported
+_AUDIT_TMP = tempfile.mkdtemp(prefix="bench-suite-audit-")
+atexit.register(shutil.rmtree, _AUDIT_TMP, True)
+os.environ.setdefault("AUDIT_LOG_DIR", _AUDIT_TMP)
+os.environ.setdefault("AUDIT_ANALYTICS_DB_PATH", str(Path(_AUDIT_TMP) / "analytics.db"))
+
+from app.detectors.engine import detector_engine  # noqa: E402
+from app.detectors.financial_detector import detect_financial  # noqa: E402
+from app.detectors.intent_detector import detect_harmful_intent  # noqa: E402
+from app.detectors.pii_detector import detect_pii  # noqa: E402
+from app.detectors.secret_detector import detect_secrets  # noqa: E402
+from app.ml.safety_classifier import init_safety_classifier, safety_classifier  # noqa: E402
+from app.policy.rag_store import init_policy_rag, policy_rag_store  # noqa: E402
+from app.sanitize.redact import apply_redactions  # noqa: E402
+
+
+RESULTS_FORMAT_VERSION = 1
+
+# name -> fn(text, detections); detections are computed once per corpus
+MICRO_BENCHMARKS = {
+    "detectors.pii": lambda text, _: detect_pii(text),
+    "detectors.secrets": lambda text, _: detect_secrets(text),
+    "detectors.financial": lambda text, _: detect_financial(text),
+    "detectors.harmful_intent": lambda text, _: detect_harmful_intent(text),
+    "detectors.engine": lambda text, _: detector_engine.detect(text),
+    "policy_rag.find_policies": lambda text, _: policy_rag_store.find_policies(text),
+    "safety_classifier.classify": lambda text, _: safety_classifier.classify(text),
+    "redaction.apply_redactions": apply_redactions,
+}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def build_corpora(n: int) -> Dict[str, List[str]]:
+    # long prompts are 20k-50k chars; fewer of them keep the run short
+    return {kind: make_corpus(kind, max(3, n // 5) if kind == "long" else n) for kind in CORPUS_KINDS}
+
+
+def run_micro(corpora: Dict[str, List[str]], repeat: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    init_policy_rag()
+    init_safety_classifier()
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for kind, texts in corpora.items():
+        detections = [detector_engine.detect(t) for t in texts]
+        pairs = list(zip(texts, detections))
+        for name, fn in MICRO_BENCHMARKS.items():
+            t = time_call(lambda: [fn(text, dets) for text, dets in pairs], repeat=repeat, warmup=1)
+            results.setdefault(name, {})[kind] = {
+                "per_call_ms": t["min_ms"] / len(texts),
+                "prompts": len(texts),
+            }
+            print(f"  {name:<28} {kind:<8} {t['min_ms'] / len(texts):>9.3f} ms/call")
+    return results
+
+
+def _load_plan(corpora: Dict[str, List[str]], requests: int) -> List[tuple]:
+    """(kind, unique prompt) per request, kinds interleaved."""
+    plan = []
+    for i in range(requests):
+        kind = CORPUS_KINDS[i % len(CORPUS_KINDS)]
+        texts = corpora[kind]
+        plan.append((kind, f"{texts[(i // len(CORPUS_KINDS)) % len(texts)]} [bench {i}]"))
+    return plan
+
+
+async def _drive(client: httpx.AsyncClient, plan: List[tuple], concurrency: int) -> Dict[str, Any]:
+    latencies: Dict[str, List[float]] = {kind: [] for kind in CORPUS_KINDS}
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < len(plan):
+            kind, prompt = plan[next_index]
+            next_index += 1
+            t0 = time.perf_counter()
+            try:
+                r = await client.post("/api/analyze", json={"user_id": "bench", "prompt": prompt})
+                ok = r.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies[kind].append((time.perf_counter() - t0) * 1000.0)
+            else:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall_s = time.perf_counter() - t0
+
+    every = [ms for samples in latencies.values() for ms in samples]
+    return {
+        "requests": len(plan),
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_s": wall_s,
+        "throughput_rps": len(every) / wall_s if wall_s else 0.0,
+        "latency_ms": percentiles(every),
+        "latency_ms_by_kind": {kind: percentiles(samples) for kind, samples in latencies.items()},
+    }
+
+
+async def run_load(corpora: Dict[str, List[str]], requests: int, concurrency: int, url: Optional[str]) -> Dict[str, Any]:
+    plan = _load_plan(corpora, requests)
+    warmup = [(kind, f"{prompt} [warmup]") for kind, prompt in plan[: 2 * len(CORPUS_KINDS)]]
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=120.0) as client:
+            await _drive(client, warmup, 1)
+            return dict(await _drive(client, plan, concurrency), target=url)
+
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway", timeout=120.0) as client:
+            await _drive(client, warmup, 1)
+            return dict(await _drive(client, plan, concurrency), target="in-process")
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Lines describing every time that regressed by more than `tolerance` (0.2 = 20%)."""
+    regressions = []
+
+    def check(label: str, new: Optional[float], old: Optional[float], higher_is_better: bool = False):
+        if not new or not old:
+            return
+        ratio = old / new if higher_is_better else new / old
+        marker = "REGRESSION" if ratio > 1.0 + tolerance else ""
+        print(f"  {label:<58} {old:>10.3f} -> {new:>10.3f}  {ratio - 1.0:>+7.0%} {marker}")
+        if marker:
+            regressions.append(f"{label}: {old:.3f} -> {new:.3f} ({ratio - 1.0:+.0%})")
+
+    for name, kinds in current.get("micro", {}).items():
+        for kind, res in kinds.items():
+            old = baseline.get("micro", {}).get(name, {}).get(kind, {})
+            check(f"micro {name} [{kind}] ms/call", res["per_call_ms"], old.get("per_call_ms"))
+    load, old_load = current.get("load"), baseline.get("load")
+    if load and old_load:
+        check("load throughput rps", load["throughput_rps"], old_load.get("throughput_rps"), higher_is_better=True)
+        for p, ms in load["latency_ms"].items():
+            check(f"load latency {p} ms", ms, old_load.get("latency_ms", {}).get(p))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prompts", type=int, default=50, help="prompts per corpus kind (long: a fifth)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--quick", action="store_true", help="small corpora and load, e.g. for CI")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-load", action="store_true")
+    parser.add_argument("--out", type=Path)
+    parser.add_argument("--baseline", type=Path, help="previous results file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    if args.quick:
+        args.prompts, args.repeat, args.requests = 10, 3, 100
+
+    warnings.filterwarnings("ignore")  # sklearn version mismatch on unpickle
+    commit = _git_commit()
+    results: Dict[str, Any] = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "meta": {
+            "commit": commit,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        },
+    }
+
+    corpora = build_corpora(args.prompts)
+    results["corpora"] = {
+        kind: {"prompts": len(texts), "mean_chars": sum(map(len, texts)) / len(texts)} for kind, texts in corpora.items()
+    }
+    if not args.skip_micro:
+        print("micro:")
+        results["micro"] = run_micro(corpora, args.repeat)
+    if not args.skip_load:
+        print(f"load: {args.requests} requests, concurrency {args.concurrency}")
+        load = asyncio.run(run_load(corpora, args.requests, args.concurrency, args.url))
+        results["load"] = load
+        lat = load["latency_ms"]
+        print(
+            f"  {load['throughput_rps']:.1f} req/s, p50 {lat['p50']:.1f} ms, p95 {lat['p95']:.1f} ms, "
+            f"p99 {lat['p99']:.1f} ms, errors {load['errors']}"
+        )
+
+    out = args.out or BASE_DIR / "data" / "bench" / f"{commit or 'results'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"wrote {out}")
+
+    if args.baseline:
+        print(f"compared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s)")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,190 +1,133 @@
-import re
-import json
+"""
+Chunk the documents in policies/source into policies/chunked_policies.json
+and update the policy index (settings.POLICY_VECTOR_STORE_PATH) to match.
+
+Incremental by default: only documents whose sha256 changed since the last
+run (policies/ingest_manifest.json) are read and re-chunked, and their
+chunks are appended to / tombstoned in the existing index without a TF-IDF
+refit (see app/policy/ingest.py). Extraction and chunking run on a process
+pool, PDFs split into page ranges (app/policy/chunk_pipeline.py).
+
+    python scripts/build_policy_chunks.py [--full] [--chunks-only] [--workers 8]
+    python scripts/build_policy_chunks.py --out corpus.jsonl [--source-dir /data/pdfs]
+
+--full re-chunks every document (and refits the index); --chunks-only
+leaves the index alone and does not keep the new chunks in memory, e.g. to
+run scripts/build_policy_index.py after. --out streams the chunks of every
+document in --source-dir to a JSON Lines (or JSON) file, without manifest or
+index. Set POLICY_CHUNKS_PATH to a .jsonl file to keep large corpora in
+JSON Lines.
+"""
+
+import argparse
+import sys
+import time
 from pathlib import Path
-from typing import List, Dict
-
-from PyPDF2 import PdfReader  # free PDF library
 
 
 BASE_DIR = Path(__file__).resolve().parents[1]  # .../backend
-POLICIES_DIR = BASE_DIR / "policies"
-SOURCE_DIR = POLICIES_DIR / "source"
-OUTPUT_FILE = POLICIES_DIR / "chunked_policies.json"
-
-
-def read_all_policy_texts() -> List[Dict]:
-    """
-    Read all .txt and .pdf files in policies/source and return list of
-    {source_name, text} dicts.
-    """
-    docs = []
-    if not SOURCE_DIR.exists():
-        print(f"[POLICY BUILD] Source dir not found: {SOURCE_DIR}")
-        return docs
-
-    # .txt files
-    for path in SOURCE_DIR.glob("*.txt"):
-        text = path.read_text(encoding="utf-8", errors="ignore")
-        docs.append({"source_name": path.name, "text": text})
-        print(f"[POLICY BUILD] Loaded TXT {path.name} ({len(text)} chars)")
-
-    # .pdf files
-    for path in SOURCE_DIR.glob("*.pdf"):
-        reader = PdfReader(str(path))
-        pages_text = []
-        for page in reader.pages:
-            try:
-                pages_text.append(page.extract_text() or "")
-            except Exception:
-                continue
-        text = "\n\n".join(pages_text)
-        docs.append({"source_name": path.name, "text": text})
-        print(f"[POLICY BUILD] Loaded PDF {path.name} ({len(text)} chars)")
-
-    return docs
-
-
-# Detect lines like: "5.11 Holidays", "Section 10.2 Workplace Violence", etc.
-SECTION_RE = re.compile(
-    r"^\s*(?:Section\s+)?(\d+(\.\d+)*)[\.\)]?\s+(.*)$",
-    re.IGNORECASE,
-)
-
+sys.path.insert(0, str(BASE_DIR))  # for app.* imports
 
-def guess_category(para: str, section: str) -> str:
-    """Very simple rule-based category classifier."""
-    t = para.lower()
-
-    # Security / confidentiality / social media etc.
-    if any(k in t for k in [
-        "information security",
-        "proprietary information",
-        "confidential information",
-        "social media policy",
-        "use of electronic communication",
-        "email", "internet", "voicemail"
-    ]):
-        return "SECURITY_PRIVACY"
-
-    # PII / harassment / equal opportunity
-    if any(k in t for k in [
-        "harassment", "discrimination", "equal employment",
-        "protected", "sexual harassment"
-    ]):
-        return "FAIR_EMPLOYMENT"
-
-    # Leave / holidays / attendance
-    if any(k in t for k in [
-        "paid time off", "leave", "holidays",
-        "attendance", "maternity", "earned leaves"
-    ]):
-        return "LEAVE_POLICY"
-
-    # Compensation / payroll
-    if any(k in t for k in [
-        "salary", "pay days", "ctc", "reimbursements",
-        "payroll", "bonus"
-    ]):
-        return "COMPENSATION"
-
-    # Behavior / conduct / ethics
-    if any(k in t for k in [
-        "employee behavior", "personal conduct",
-        "ethical business practice", "professional appearance",
-        "corrective action", "complaint resolution"
-    ]):
-        return "CONDUCT_ETHICS"
-
-    # Safety / security / drugs / workplace violence
-    if any(k in t for k in [
-        "safety", "security", "drug and alcohol-free",
-        "workplace violence", "fire evacuation",
-        "accident reporting"
-    ]):
-        return "SAFETY_SECURITY"
-
-    # Default fallback
-    if section.startswith("11."):
-        return "SOCIAL_MEDIA"
-    if section.startswith("10."):
-        return "SAFETY_SECURITY"
-
-    return "GENERAL_HR"
-
-
-def chunk_text_by_paragraphs(text: str, source_name: str) -> List[Dict]:
-    """
-    Chunk by paragraphs (split on double newlines).
-    Try to detect section headers, assign section/title/category/weight.
-    """
-    paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
-    chunks: List[Dict] = []
-
-    current_section = "?"
-    current_title = f"From {source_name}"
-
-    for idx, para in enumerate(paragraphs):
-        first_line = para.splitlines()[0]
-        m = SECTION_RE.match(first_line)
-        if m:
-            section = m.group(1).strip()
-            title = m.group(3).strip() or f"Section {section}"
-            current_section = section
-            current_title = title
-
-        category = guess_category(para, current_section)
-
-        # Category-based weight: important sections get more influence
-        base_weight = 1.0
-        if category in ("SECURITY_PRIVACY", "SAFETY_SECURITY", "CONDUCT_ETHICS", "SOCIAL_MEDIA"):
-            weight = 1.5
-        else:
-            weight = base_weight
-
-        chunk_id = f"{source_name}-chunk-{idx}"
-
-        chunks.append(
-            {
-                "id": chunk_id,
-                "section": current_section,
-                "title": current_title,
-                "text": para,
-                "source": source_name,
-                "category": category,
-                "weight": weight,
-            }
-        )
+from app.policy.chunk_pipeline import (  # noqa: E402
+    DOCUMENT_SUFFIXES,
+    PipelineStats,
+    iter_document_chunks,
+    resolve_workers,
+)
+from app.policy.ingest import SOURCE_DIR, policy_ingestor, sync_policy_sources  # noqa: E402
+from app.policy.policy_loader import ChunksFileWriter  # noqa: E402
 
-    return chunks
 
+class ProgressReport:
+    """Prints pipeline progress at most every `every_s` seconds."""
 
-def build_chunks() -> List[Dict]:
-    docs = read_all_policy_texts()
-    all_chunks: List[Dict] = []
+    def __init__(self, every_s: float):
+        self.every_s = every_s
+        self._last = time.perf_counter()
 
-    for doc in docs:
-        doc_chunks = chunk_text_by_paragraphs(doc["text"], doc["source_name"])
-        all_chunks.extend(doc_chunks)
+    def __call__(self, stats: PipelineStats):
+        now = time.perf_counter()
+        if now - self._last >= self.every_s:
+            self._last = now
+            print_stats(stats)
 
-    print(f"[POLICY BUILD] Built {len(all_chunks)} chunks total.")
-    return all_chunks
 
+def print_stats(stats: PipelineStats):
+    s = stats.as_dict()
+    total = f"/{s['total_documents']}" if s["total_documents"] is not None else ""
+    print(
+        f"[POLICY BUILD] {s['documents']}{total} documents ({s['errors']} failed), {s['pages']} pages, "
+        f"{s['chunks']} chunks in {s['elapsed_s']:.1f}s: {s['documents_per_s']:.1f} docs/s, "
+        f"{s['pages_per_s']:.1f} pages/s, {s['mb_per_s']:.2f} MB/s"
+    )
 
-def main():
-    POLICIES_DIR.mkdir(exist_ok=True)
-    SOURCE_DIR.mkdir(exist_ok=True)
 
-    chunks = build_chunks()
+def export(source_dir: Path, out: Path, workers: int, stats: PipelineStats, progress: ProgressReport):
+    paths = sorted(p for p in source_dir.glob("*") if p.is_file() and p.suffix.lower() in DOCUMENT_SUFFIXES)
+    stats.total_documents = len(paths)
+    with ChunksFileWriter(out) as writer:
+        for doc in iter_document_chunks(
+            [(p.name, p) for p in paths], workers=workers, stats=stats, progress=progress
+        ):
+            if doc.error:
+                print(f"[POLICY BUILD] Skipped {doc.name}: {doc.error}")
+            for chunk in doc.chunks:
+                writer.write(chunk)
+        writer.commit()
+    print(f"[POLICY BUILD] Wrote {writer.count} chunks to {out}")
 
-    # Filter out very tiny paragraphs
-    filtered = [ch for ch in chunks if len(ch["text"]) > 80]
-    print(f"[POLICY BUILD] Filtered to {len(filtered)} chunks (removed very short ones).")
 
-    OUTPUT_FILE.write_text(
-        json.dumps(filtered, ensure_ascii=False, indent=2),
-        encoding="utf-8",
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--full", action="store_true", help="re-chunk every document, not only changed ones")
+    parser.add_argument("--chunks-only", action="store_true", help="do not update the policy index")
+    parser.add_argument("--workers", type=int, default=None, help="extraction processes (default: settings)")
+    parser.add_argument("--out", type=Path, help="stream all chunks to this file instead (no manifest / index)")
+    parser.add_argument("--source-dir", type=Path, default=SOURCE_DIR, help="with --out")
+    parser.add_argument("--progress-every", type=float, default=2.0, help="seconds between progress lines")
+    args = parser.parse_args()
+
+    source_dir = args.source_dir if args.out else SOURCE_DIR
+    if not source_dir.exists():
+        print(f"[POLICY BUILD] Source dir not found: {source_dir}")
+        sys.exit(1)
+
+    workers = resolve_workers(args.workers)
+    print(f"[POLICY BUILD] Extracting with {workers} worker process(es)")
+    stats = PipelineStats()
+    progress = ProgressReport(args.progress_every)
+
+    if args.out:
+        export(source_dir, args.out, workers, stats, progress)
+        print_stats(stats)
+        return
+
+    t0 = time.perf_counter()
+    if args.chunks_only:
+        delta = policy_ingestor.sync(full=args.full, workers=workers, stats=stats, progress=progress, collect=False)
+        result = {**delta.summary(), "index": None, "index_error": None}
+    else:
+        result = sync_policy_sources(full=args.full, workers=workers, stats=stats, progress=progress)
+    elapsed = time.perf_counter() - t0
+
+    print_stats(stats)
+    for name, status in sorted(result["documents"].items()):
+        print(f"[POLICY BUILD] {name}: {status}")
+    print(
+        f"[POLICY BUILD] {result['chunks_added']} chunks added, {result['chunks_removed']} removed "
+        f"in {elapsed:.2f}s"
     )
-    print(f"[POLICY BUILD] Wrote {len(filtered)} chunks to {OUTPUT_FILE}")
+    index = result["index"]
+    if index is not None:
+        if result["index_error"]:
+            print(f"[POLICY BUILD] Index update failed: {result['index_error']}")
+            sys.exit(1)
+        print(
+            f"[POLICY BUILD] Index: {index['chunks']} chunks, {index['tombstoned']} tombstoned, "
+            f"{index['appended_since_fit']} appended since the last fit"
+        )
+        if index["backend_fallback"]:
+            print(f"[POLICY BUILD] Retrieval: {index['backend_fallback']}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+"""
+Build the on-disk policy index read by PolicyRAGStore.load().
+
+Run after scripts/build_policy_chunks.py (from the backend folder):
+    python scripts/build_policy_index.py [--chunks policies/chunked_policies.json] [--out ml_models/policy_index]
+
+Defaults come from settings.POLICY_CHUNKS_PATH / settings.POLICY_VECTOR_STORE_PATH.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).resolve().parents[1]  # .../backend
+sys.path.insert(0, str(BASE_DIR))  # for app.* imports
+
+from app.core.config import settings  # noqa: E402
+from app.policy.policy_loader import read_chunks_file  # noqa: E402
+from app.policy.rag_store import PolicyRAGStore  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", default=settings.POLICY_CHUNKS_PATH)
+    parser.add_argument("--out", default=settings.POLICY_VECTOR_STORE_PATH)
+    args = parser.parse_args()
+
+    chunks_path = BASE_DIR / args.chunks
+    out_dir = BASE_DIR / args.out
+
+    try:
+        chunks = read_chunks_file(chunks_path)
+    except ValueError:
+        print(f"[POLICY INDEX] {chunks_path} is not a list of chunks")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    store = PolicyRAGStore()
+    store.index_chunks(chunks)
+    manifest = store.save_index(out_dir, source_path=chunks_path)
+
+    print(
+        f"[POLICY INDEX] Wrote {manifest['n_chunks']} chunks, {manifest['n_terms']} terms "
+        f"({manifest['nnz']} non-zeros) to {out_dir} in {time.perf_counter() - t0:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
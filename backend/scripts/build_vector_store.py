@@ -0,0 +1,75 @@
+"""
+Build the dense policy index used by the "dense" / "hybrid" retrieval
+backends (settings.POLICY_RETRIEVAL_BACKEND).
+
+Fits the local embedding model on the policy chunks, embeds every chunk and
+writes a FAISS index. Run after scripts/build_policy_index.py, from the
+backend folder:
+    python scripts/build_vector_store.py [--index hnsw|ivf|flat] [--dim 128]
+
+Writes settings.EMBEDDING_MODEL_PATH and settings.POLICY_DENSE_INDEX_PATH.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).resolve().parents[1]  # .../backend
+sys.path.insert(0, str(BASE_DIR))  # for app.* imports
+
+from app.core.config import settings  # noqa: E402
+from app.core.embeddings import EmbeddingModel  # noqa: E402
+from app.policy.rag_store import PolicyRAGStore  # noqa: E402
+from app.policy.retrieval import build_ann_index, write_dense_index  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--index", choices=["hnsw", "ivf", "flat"], default="hnsw")
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--n-features", type=int, default=2**15)
+    parser.add_argument("--m", type=int, default=32, help="HNSW links per node")
+    parser.add_argument("--ef-construction", type=int, default=80)
+    parser.add_argument("--ef-search", type=int, default=64)
+    parser.add_argument("--nlist", type=int, default=None, help="IVF cells (default ~4*sqrt(n))")
+    parser.add_argument("--nprobe", type=int, default=16)
+    args = parser.parse_args()
+
+    store = PolicyRAGStore()
+    store.load()
+    chunks = store.chunks
+    if not chunks:
+        print("[VECTOR STORE] No policy chunks loaded; run scripts/build_policy_chunks.py first")
+        sys.exit(1)
+    texts = [p["text"] for p in chunks]
+
+    t0 = time.perf_counter()
+    embedder = EmbeddingModel.fit(texts, dim=args.dim, n_features=args.n_features)
+    embedder.save(BASE_DIR / settings.EMBEDDING_MODEL_PATH)
+    vectors = embedder.encode(texts)
+    print(f"[VECTOR STORE] Embedded {len(texts)} chunks (dim={embedder.dim}) in {time.perf_counter() - t0:.2f}s")
+
+    t0 = time.perf_counter()
+    index = build_ann_index(
+        vectors, args.index, m=args.m, ef_construction=args.ef_construction, nlist=args.nlist
+    )
+    search_params = {"ef_search": args.ef_search} if args.index == "hnsw" else {}
+    if args.index == "ivf":
+        search_params = {"nprobe": args.nprobe}
+
+    out_dir = BASE_DIR / settings.POLICY_DENSE_INDEX_PATH
+    write_dense_index(
+        out_dir,
+        index,
+        index_type=args.index,
+        chunks=chunks,
+        embedder=embedder,
+        search_params=search_params,
+    )
+    print(f"[VECTOR STORE] Wrote {args.index} index to {out_dir} in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()